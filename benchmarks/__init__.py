@@ -1 +1,61 @@
+"""
+This is the __init__.py file for the `benchmarks` package,
+which is a part of the larger project.
 
+The `benchmarks` package contains the benchmark classes. They are discovered
+by class name through `BENCHMARKS` and only imported when first used, so a
+license plate run never imports Whisper and torch, for example:
+    from benchmarks import load_benchmark_class
+    CallAudioBenchmark = load_benchmark_class("CallAudioBenchmark")
+
+`is_benchmark()` checks a benchmark's class without importing the module
+that defines it: if the module was never imported, no instance can exist.
+"""
+
+# Standard library imports.
+import importlib
+import sys
+
+# Modules defining each benchmark class, by class name.
+BENCHMARKS = {
+    "EvalRateBenchmark": "benchmarks.eval_rate_benchmark",
+    "LicensePlateBenchmark": "benchmarks.license_plate_benchmark",
+    "CallAudioBenchmark": "benchmarks.call_audio_benchmark.call_audio_benchmark",
+    "StreamingLatencyBenchmark": "benchmarks.streaming_latency_benchmark",
+    "ColdStartBenchmark": "benchmarks.cold_start_benchmark",
+    "ImageSweepBenchmark": "benchmarks.image_sweep_benchmark",
+}
+
+
+def load_benchmark_class(class_name: str) -> type:
+    """
+    Import a benchmark class by name.
+
+    Args:
+        class_name (str): One of the names in BENCHMARKS.
+
+    Returns:
+        type: The benchmark class.
+    """
+    try:
+        module_name = BENCHMARKS[class_name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown benchmark {class_name!r}, expected one of {sorted(BENCHMARKS)}") from None
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def is_benchmark(benchmark, class_name: str) -> bool:
+    """
+    Check whether a benchmark is an instance of a benchmark class, without
+    importing the class.
+
+    Args:
+        benchmark: The benchmark instance.
+        class_name (str): One of the names in BENCHMARKS.
+
+    Returns:
+        bool: Whether ``benchmark`` is an instance of the class.
+    """
+    module = sys.modules.get(BENCHMARKS[class_name])
+    return module is not None and isinstance(benchmark, getattr(module, class_name))
@@ -0,0 +1,41 @@
+"""
+This is the __init__.py file for the `call_audio_benchmark` package,
+which is a part of the larger project.
+
+The `call_audio_benchmark` package is located in the `benchmarks` directory.
+It contains the `CallAudioBenchmark` class, which transcribes call audio with
+Whisper before handing the transcripts to a LLaVA model for summarization,
+the `TranscriptCache` class, which stores those transcripts on disk so
+the same audio is only transcribed once, the `AudioCache` class, which
+stores the decoded audio so each file only goes through ffmpeg once, the
+`ChunkedTranscriber` class, which transcribes calls of any length in
+overlapping windows, and the `BatchTranscriber` class, which transcribes
+several calls in one batch.
+
+These classes can be imported directly from the `call_audio_benchmark`
+package, for example:
+    from benchmarks.call_audio_benchmark import CallAudioBenchmark
+
+`CallAudioBenchmark`, `ChunkedTranscriber` and `BatchTranscriber` are
+imported on first access, so importing `TranscriptCache` or `AudioCache`
+does not import the transcription code.
+"""
+
+# Standard library imports.
+import importlib
+
+from .audio_cache import AudioCache
+from .transcript_cache import TranscriptCache
+
+# Submodules of the lazily imported classes, by class name.
+_LAZY_CLASSES = {
+    "CallAudioBenchmark": ".call_audio_benchmark",
+    "ChunkedTranscriber": ".chunked_transcriber",
+    "BatchTranscriber": ".batch_transcriber",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        return getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
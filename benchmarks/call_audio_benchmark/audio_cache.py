@@ -0,0 +1,267 @@
+# Standard library imports.
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+# Third party imports.
+import numpy as np
+
+# Local library imports.
+from modules.hashing import file_hash
+from modules.tracing import tracer
+from .chunked_transcriber import SAMPLE_RATE
+
+# Default location and size bound of the on-disk decoded audio cache.
+DEFAULT_AUDIO_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "llava-benchmark", "audio")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class AudioCache:
+    """
+    A content-addressed on-disk cache of decoded call audio.
+
+    Decoding an MP3 to 16 kHz float32 samples starts an ffmpeg process every
+    time. Each decoded file is stored once as a float32 ``.npy`` entry keyed
+    by the SHA-256 of the audio file contents and the sample rate, and read
+    back with ``np.load(mmap_mode="r")``, so later decodes of the same audio
+    for other models, prompts and runs map the samples without copying them.
+    A small JSON sidecar records how long the decode took. The least recently
+    used entries are evicted once the cache grows beyond ``max_bytes``, and
+    audio too large to fit on its own is not cached.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+        max_bytes (int): Size bound of the cache directory.
+        sample_rate (int): Sample rate of the decoded audio.
+        hits (int): Number of decodes answered from the cache.
+        misses (int): Number of decodes that ran ffmpeg.
+        seconds_saved (float): Decode seconds skipped thanks to hits.
+        bytes_mapped (int): Bytes of samples memory-mapped from the cache.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_AUDIO_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES, sample_rate: int = SAMPLE_RATE):
+        """
+        Initialize AudioCache instance.
+
+        Args:
+            cache_dir (str, optional): Directory for the cache entries.
+            max_bytes (int, optional): Size bound of the cache directory.
+            sample_rate (int, optional): Sample rate of the decoded audio.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.bytes_mapped = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(content_hash: str, sample_rate: int) -> str:
+        """
+        Build the cache key for decoded audio.
+
+        Args:
+            content_hash (str): The audio content hash.
+            sample_rate (int): The decoded sample rate.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{content_hash}-{sample_rate}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".npy")
+
+    def _sidecar_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _map(self, key: str) -> np.ndarray:
+        samples = np.load(self._entry_path(key), mmap_mode="r")
+        self.bytes_mapped += samples.nbytes
+        return samples
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up decoded audio, counting the hit or miss.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            numpy.ndarray: The read-only memory-mapped samples, or None on a miss.
+        """
+        with self._lock:
+            try:
+                samples = self._map(key)
+                with open(self._sidecar_path(key), "r", encoding="utf-8") as sidecar_file:
+                    seconds = json.load(sidecar_file).get("seconds", 0.0)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            # Touch the entry so eviction sees it as recently used.
+            os.utime(self._entry_path(key))
+            self.hits += 1
+            self.seconds_saved += seconds
+            return samples
+
+    def put(self, key: str, samples: np.ndarray, seconds: float) -> np.ndarray:
+        """
+        Store decoded audio and evict old entries beyond the size bound.
+
+        Args:
+            key (str): The cache key.
+            samples (numpy.ndarray): The decoded samples.
+            seconds (float): Seconds it took to decode the audio.
+
+        Returns:
+            numpy.ndarray: The stored samples, memory-mapped from the cache,
+            or the samples themselves if they do not fit in the cache.
+        """
+        entry_path = self._entry_path(key)
+        samples = np.asarray(samples, np.float32)
+        with self._lock:
+            with open(entry_path + ".tmp", "wb") as entry_file:
+                np.save(entry_file, samples)
+            if not self._commit(key, seconds):
+                return samples
+            return self._map(key)
+
+    def _commit(self, key: str, seconds: float) -> bool:
+        """
+        Move a written entry into place next to its sidecar, then evict.
+
+        Returns:
+            bool: False if the entry alone exceeds max_bytes and was dropped.
+        """
+        if os.path.getsize(self._entry_path(key) + ".tmp") > self.max_bytes:
+            os.remove(self._entry_path(key) + ".tmp")
+            return False
+        sidecar_path = self._sidecar_path(key)
+        with open(sidecar_path + ".tmp", "w", encoding="utf-8") as sidecar_file:
+            json.dump({"seconds": seconds}, sidecar_file)
+        os.replace(sidecar_path + ".tmp", sidecar_path)
+        os.replace(self._entry_path(key) + ".tmp", self._entry_path(key))
+        self._evict(keep=self._entry_path(key))
+        return True
+
+    def load(self, audio_file_path: str, decode: Callable[[str], np.ndarray]) -> np.ndarray:
+        """
+        Decode an audio file, answering from the cache when possible.
+
+        Args:
+            audio_file_path (str): The path to the audio file.
+            decode (callable): Decodes the file to float32 samples at
+                ``sample_rate``, e.g. ``whisper.load_audio``.
+
+        Returns:
+            numpy.ndarray: The samples, memory-mapped from the cache.
+        """
+        key = self.key(file_hash(audio_file_path), self.sample_rate)
+        samples = self.get(key)
+        if samples is not None:
+            return samples
+
+        start = time.perf_counter()
+        with tracer.span("audio.ffmpeg", media=os.path.basename(audio_file_path)):
+            decoded = decode(audio_file_path)
+        return self.put(key, decoded, time.perf_counter() - start)
+
+    def stream(self, audio_file_path: str,
+               decode_stream: Callable[[str], Iterator[np.ndarray]],
+               block_seconds: float = 5.0) -> Iterator[np.ndarray]:
+        """
+        Decode an audio file block by block, answering from the cache when possible.
+
+        A hit yields consecutive slices of the memory-mapped entry. A miss
+        yields the blocks of ``decode_stream`` while appending them to the
+        entry on disk, so only one block is held in memory either way. The
+        entry is only stored once the stream has been read to the end.
+
+        Args:
+            audio_file_path (str): The path to the audio file.
+            decode_stream (callable): Yields float32 sample blocks of the file,
+                e.g. ``ChunkedTranscriber.decode_stream``.
+            block_seconds (float, optional): Length of each yielded block.
+
+        Yields:
+            numpy.ndarray: Consecutive float32 sample blocks.
+        """
+        key = self.key(file_hash(audio_file_path), self.sample_rate)
+        samples = self.get(key)
+        block_samples = int(block_seconds * self.sample_rate)
+        if samples is not None:
+            for start in range(0, len(samples), block_samples):
+                yield samples[start:start + block_samples]
+            return
+
+        raw_path = self._entry_path(key) + f".{threading.get_ident()}.raw"
+        blocks = decode_stream(audio_file_path)
+        seconds, length = 0.0, 0
+        try:
+            with open(raw_path, "wb") as raw_file:
+                while True:
+                    # Only the decode is timed, not the consumer of each block.
+                    start = time.perf_counter()
+                    block = next(blocks, None)
+                    seconds += time.perf_counter() - start
+                    if block is None:
+                        break
+                    block = np.asarray(block, np.float32)
+                    raw_file.write(block.tobytes())
+                    length += len(block)
+                    yield block
+            with self._lock:
+                with open(self._entry_path(key) + ".tmp", "wb") as entry_file, \
+                        open(raw_path, "rb") as raw_file:
+                    np.lib.format.write_array_header_1_0(entry_file, {
+                        "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                        "fortran_order": False,
+                        "shape": (length,),
+                    })
+                    shutil.copyfileobj(raw_file, entry_file)
+                self._commit(key, seconds)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep (str, optional): Path of an entry never to delete, such as
+                the one just written.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            sidecar_path = path[:-len(".npy")] + ".json"
+            if os.path.exists(sidecar_path):
+                os.remove(sidecar_path)
+            total_bytes -= size
+
+    def print_stats(self) -> None:
+        """
+        Print the hit/miss counts, the decode time saved and the bytes mapped.
+        """
+        print(f"◽ Audio cache:\t{self.hits} hits, {self.misses} misses, "
+              f"{self.seconds_saved:.2f}s decode saved, "
+              f"{self.bytes_mapped / 1024 ** 2:.1f}MB mapped\t🎵\n")
@@ -0,0 +1,237 @@
+# Standard library imports.
+import gc
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+# Third party imports.
+import numpy as np
+
+# Local library imports.
+from modules.resource_sampler import ResourceSampler
+from modules.scheduler import BenchmarkJob
+from modules.tracing import tracer
+from .chunked_transcriber import SAMPLE_RATE
+
+# Number of samples in Whisper's 30-second input (whisper.audio.N_SAMPLES).
+N_SAMPLES = 30 * SAMPLE_RATE
+
+# Thresholds transcribe() uses to retry a window at a higher temperature.
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+
+
+@dataclass
+class BatchTiming:
+    """
+    Throughput and memory of one way of transcribing a set of clips.
+
+    Attributes:
+        label (str): How the clips were transcribed, e.g. ``batch of 8``.
+        files (int): Number of clips transcribed.
+        seconds (float): Wall time for all clips.
+        rss_increase (int): Peak resident set size while transcribing over
+            the resident set size just before, in bytes, or None where it
+            cannot be sampled.
+        fallbacks (int): Clips re-transcribed one at a time.
+    """
+    label: str
+    files: int
+    seconds: float
+    rss_increase: int = None
+    fallbacks: int = 0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+class BatchTranscriber:
+    """
+    Transcribes 30-second clips in batches with one Whisper forward pass.
+
+    The log-mel spectrograms of up to ``batch_size`` clips are computed as
+    one tensor and decoded together, so the encoder and the greedy decoder
+    run once per batch instead of once per file. Decoding uses the options
+    and the first window of ``model.transcribe()`` at temperature 0, so the
+    transcripts match it. A clip that transcribe() would handle differently,
+    by retrying at a higher temperature, skipping it as silence or seeking
+    into a second window, is transcribed with transcribe() instead.
+
+    Attributes:
+        model (whisper.Whisper): The Whisper ASR model instance.
+        batch_size (int): Number of clips decoded together.
+        fp16 (bool): Whether FP16 mode is enabled.
+        fallbacks (int): Clips re-transcribed with transcribe() so far.
+    """
+
+    def __init__(self, model, batch_size: int = 8, fp16: bool = False):
+        """
+        Initialize BatchTranscriber instance.
+
+        Args:
+            model (whisper.Whisper): The Whisper ASR model instance.
+            batch_size (int, optional): Number of clips decoded together.
+            fp16 (bool, optional): Whether FP16 mode is enabled.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.model = model
+        self.batch_size = batch_size
+        self.fp16 = fp16
+        self.fallbacks = 0
+
+    def log_mel_batch(self, clips: Sequence[np.ndarray]):
+        """
+        Compute the log-mel spectrograms of several clips as one batch.
+
+        Each clip is padded or trimmed to 30 seconds and followed by 30
+        seconds of silence, as transcribe() does, and every spectrogram is
+        clamped relative to its own maximum, so each row equals the
+        spectrogram of that clip computed on its own.
+
+        Args:
+            clips (sequence): Float32 16 kHz sample arrays.
+
+        Returns:
+            torch.Tensor: Spectrograms of shape (clips, n_mels, 3000).
+        """
+        import torch
+        import whisper
+
+        batch = np.zeros((len(clips), 2 * N_SAMPLES), np.float32)
+        for row, clip in enumerate(clips):
+            clip = clip[:N_SAMPLES]
+            batch[row, :len(clip)] = clip
+        audio = torch.from_numpy(batch).to(self.model.device)
+        window = torch.hann_window(whisper.audio.N_FFT).to(audio.device)
+        stft = torch.stft(audio, whisper.audio.N_FFT, whisper.audio.HOP_LENGTH,
+                          window=window, return_complex=True)
+        magnitudes = stft[..., :-1].abs() ** 2
+        filters = whisper.audio.mel_filters(audio.device, self.model.dims.n_mels)
+        log_spec = torch.clamp(filters @ magnitudes, min=1e-10).log10()
+        log_spec = torch.maximum(log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0)
+        log_spec = (log_spec + 4.0) / 4.0
+        return log_spec[..., :whisper.audio.N_FRAMES]
+
+    @staticmethod
+    def _transcribe_would_differ(result, timestamp_begin: int) -> bool:
+        """
+        Whether transcribe() would not keep a temperature-0 decode as the
+        whole transcript.
+        """
+        if result.compression_ratio > COMPRESSION_RATIO_THRESHOLD:
+            return True
+        if result.avg_logprob < LOGPROB_THRESHOLD:
+            # Retried at a higher temperature, or skipped as silence.
+            return True
+        # Two consecutive timestamps without a single timestamp ending make
+        # transcribe() seek to the last timestamp and decode another window.
+        is_timestamp = [token >= timestamp_begin for token in result.tokens]
+        consecutive = any(a and b for a, b in zip(is_timestamp, is_timestamp[1:]))
+        single_timestamp_ending = is_timestamp[-2:] == [False, True]
+        return consecutive and not single_timestamp_ending
+
+    def transcribe(self, clips: Sequence[np.ndarray]) -> List[str]:
+        """
+        Transcribe clips in batches of ``batch_size``.
+
+        Args:
+            clips (sequence): Float32 16 kHz sample arrays, trimmed to 30
+                seconds like CallAudioBenchmark.process_audio() does.
+
+        Returns:
+            list: The transcript of each clip, in order.
+        """
+        import whisper
+
+        options = whisper.DecodingOptions(
+            task="transcribe", temperature=0.0, fp16=self.fp16,
+            language=None if self.model.is_multilingual else "en")
+        transcripts = []
+        for start in range(0, len(clips), self.batch_size):
+            batch = clips[start:start + self.batch_size]
+            with tracer.span("whisper.transcribe_batch", clips=len(batch)):
+                results = whisper.decode(self.model, self.log_mel_batch(batch), options)
+            for clip, result in zip(batch, results):
+                tokenizer = whisper.tokenizer.get_tokenizer(
+                    self.model.is_multilingual, num_languages=self.model.num_languages,
+                    language=result.language, task="transcribe")
+                if self._transcribe_would_differ(result, tokenizer.timestamp_begin):
+                    self.fallbacks += 1
+                    with tracer.span("whisper.transcribe"):
+                        transcripts.append(self.model.transcribe(
+                            whisper.pad_or_trim(clip), fp16=self.fp16)["text"])
+                else:
+                    transcripts.append(tokenizer.decode(result.tokens))
+        return transcripts
+
+
+def compare_to_sequential(model, clips: Sequence[np.ndarray], batch_sizes: Sequence[int],
+                          fp16: bool = False) -> List[BatchTiming]:
+    """
+    Compare batched transcription with one model.transcribe() call per clip.
+
+    Memory is reported as how far each path raised the resident set size
+    of this process above what it was just before the path started, as
+    sampled from /proc, and is None where /proc is not available. The
+    paths run one after another in this process, so its peak resident set
+    size alone would carry the high-water mark of the earlier paths.
+
+    Args:
+        model (whisper.Whisper): The Whisper ASR model instance.
+        clips (sequence): Float32 16 kHz sample arrays.
+        batch_sizes (sequence): Batch sizes to time.
+        fp16 (bool, optional): Whether FP16 mode is enabled.
+
+    Returns:
+        list: BatchTiming of the sequential path, then of each batch size.
+    """
+    import whisper
+
+    def sequential(clips):
+        for clip in clips:
+            model.transcribe(whisper.pad_or_trim(clip), fp16=fp16)
+
+    paths = [("sequential", None, sequential)]
+    for batch_size in batch_sizes:
+        transcriber = BatchTranscriber(model, batch_size, fp16)
+        paths.append((f"batch of {batch_size}", transcriber, transcriber.transcribe))
+
+    sampler = ResourceSampler(pid=os.getpid(), interval=0.05)
+    sampler.start()
+    timings, baselines = [], []
+    for index, (label, transcriber, transcribe_clips) in enumerate(paths):
+        gc.collect()
+        baselines.append(sampler.current_rss() if sampler.is_supported else None)
+        start = time.perf_counter()
+        sampler.wrap(lambda job: transcribe_clips(clips))(BenchmarkJob(index, label, "", ""))
+        timings.append(BatchTiming(label, len(clips), time.perf_counter() - start,
+                                   fallbacks=transcriber.fallbacks if transcriber else 0))
+    sampler.stop()
+
+    for timing, baseline in zip(timings, baselines):
+        resources = sampler.model_resources(timing.label)
+        if resources.samples and baseline is not None:
+            timing.rss_increase = max(0, resources.peak_rss - baseline)
+    return timings
+
+
+def print_batch_comparison(timings: Sequence[BatchTiming]) -> None:
+    """
+    Print files/sec and the memory each way of transcribing added.
+
+    Args:
+        timings (sequence): BatchTiming from compare_to_sequential().
+    """
+    print(f"{'-' * 40}\nBatched transcription 🎧\n{'-' * 40}")
+    print(f"{'path':<14}{'files/s':>9}{'speedup':>9}{'RSS +':>10}{'fallbacks':>11}")
+    baseline = timings[0].files_per_second
+    for timing in timings:
+        increase = (f"{timing.rss_increase / 1024 ** 2:.0f}MB"
+                    if timing.rss_increase is not None else "-")
+        speedup = timing.files_per_second / baseline if baseline else 0.0
+        print(f"{timing.label:<14}{timing.files_per_second:>9.2f}{speedup:>8.2f}x"
+              f"{increase:>10}{timing.fallbacks:>11}")
+    print()
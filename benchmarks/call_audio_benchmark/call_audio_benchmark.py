@@ -0,0 +1,355 @@
+# Standard Library imports.
+import os
+import re
+import textwrap
+import threading
+import time
+from typing import List
+
+'''
+Whisper is an advanced natural language processing (NLP) library
+developed by OpenAI. Class CallAudioBenchmark utilizes whisper
+to transcribe call audio files to text transcripts, before handing
+them off to a LLaVA model for summarization as call notes.
+
+Whisper imports torch, which takes seconds and hundreds of MB, so it is
+imported on first use rather than when this module is imported.
+'''
+
+# Local library imports.
+from modules.hashing import file_hash
+from modules.tracing import tracer
+from .audio_cache import AudioCache
+from .batch_transcriber import BatchTranscriber
+from .chunked_transcriber import SAMPLE_RATE, ChunkedTranscriber
+from .transcript_cache import TranscriptCache
+
+# Number of samples in Whisper's 30-second input (whisper.audio.N_SAMPLES).
+N_SAMPLES = 30 * SAMPLE_RATE
+
+
+class CallAudioBenchmark():
+    """
+    A class for processing call audio and extracting call notes.
+
+    Args:
+        model (str, optional): The name of the Whisper ASR model to use. Defaults to "base".
+        transcript_cache (TranscriptCache, optional): Cache consulted before decoding and
+            transcribing an audio file. Defaults to no caching.
+        chunk_seconds (float, optional): Transcribe whole calls in overlapping windows of
+            this many seconds instead of trimming them to 30 seconds. Defaults to None.
+        overlap_seconds (float, optional): Overlap between chunked windows. Defaults to 5.
+        batch_size (int, optional): Transcribe the run's audio files together in batches
+            of this many clips with transcribe_files(). Defaults to None.
+        audio_cache (AudioCache, optional): Cache of decoded audio consulted before
+            running ffmpeg, in every transcription path. Defaults to no caching.
+
+    Attributes:
+        current_transcript (str): The most recent transcript obtained from audio processing.
+        transcripts (list): A list of all transcripts processed.
+        model_transcripts (dict): A dictionary mapping LLAVA models to their respective transcripts.
+        call_notes (str): Extracted call notes from benchmark results.
+        model_call_notes (dict): A dictionary mapping LLAVA models to their call notes.
+        model (whisper.WhisperModel): The Whisper ASR model instance, loaded on
+            first use.
+        model_name (str): The name of the Whisper ASR model.
+        transcript_cache (TranscriptCache): The transcript cache, or None.
+        audio_cache (AudioCache): The decoded audio cache, or None.
+        chunked_transcriber (ChunkedTranscriber): The chunked transcriber, or None when
+            calls are trimmed to 30 seconds.
+        batch_transcriber (BatchTranscriber): The batch transcriber, or None when files
+            are transcribed one at a time.
+        decode_options (dict): Options that affect the transcript, part of the cache key.
+
+    Methods:
+        media_file_path(media_file: str) -> str:
+            Returns the absolute path to the specified media file.
+
+        process_audio(audio_file: str) -> whisper.Audio:
+            Loads and processes the audio file, returning the padded or trimmed audio.
+
+        transcribe_audio(call_audio: whisper.Audio) -> str:
+            Transcribes the audio using the Whisper model and returns the transcript.
+
+        transcribe_file(media_file: str) -> str:
+            Transcribes an audio file, answering from the transcript cache when possible.
+
+        transcribe_files(media_files: list) -> list:
+            Transcribes several audio files, batching those not in the transcript cache.
+
+        store_transcript(llava_model: str, fp16: bool = False) -> None:
+            Stores the current transcript along with the LLAVA model it corresponds to.
+
+        store_call_notes(llava_model: str, benchmark_result: str) -> None:
+            Extracts and stores call notes from benchmark results.
+
+        print_call_notes() -> None:
+            Prints formatted call notes.
+
+    Note:
+        This class assumes the existence of the Whisper ASR model and audio data.
+    """
+
+    def __init__(self, model: str = "base", transcript_cache: TranscriptCache = None,
+                 chunk_seconds: float = None, overlap_seconds: float = 5.0,
+                 batch_size: int = None, audio_cache: AudioCache = None):
+        if batch_size is not None and chunk_seconds is not None:
+            raise ValueError("batch_size cannot be combined with chunk_seconds")
+        # Transcript instance variables. 
+        self.current_transcript = None
+        self.transcripts = []
+        self.model_transcripts = {}
+
+        # Call notes instance variables.
+        self.call_notes = None
+        self.model_call_notes = {}
+        self.model_name = model
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.transcript_cache = transcript_cache
+        self.audio_cache = audio_cache
+
+        # Chunked transcription of whole calls.
+        self.decode_options = {"fp16": False}
+        if chunk_seconds is None:
+            self.chunked_transcriber = None
+            self.decode_options["pad_or_trim"] = N_SAMPLES
+        else:
+            self.chunked_transcriber = ChunkedTranscriber(
+                None, chunk_seconds, overlap_seconds, fp16=False, audio_cache=audio_cache)
+            self.decode_options["chunk_seconds"] = chunk_seconds
+            self.decode_options["overlap_seconds"] = overlap_seconds
+
+        # Batched transcription of the run's files. Batched transcripts equal
+        # the sequential ones, so they share the transcript cache key.
+        self.batch_transcriber = None if batch_size is None else BatchTranscriber(
+            None, batch_size, fp16=False)
+        self._batched_transcripts = {}
+
+    @property
+    def model(self):
+        """
+        The Whisper ASR model, loaded on first use.
+
+        Runs answered from the transcript cache never load the model.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    import whisper
+                    with tracer.span("whisper.load_model", model=self.model_name):
+                        self._model = whisper.load_model(self.model_name)
+        return self._model
+
+    def media_file_path(self, media_file: str):
+        """
+        Returns the absolute path to the specified call audio file.
+
+        Args:
+            media_file (str): The name of the call audio file.
+
+        Returns:
+            str: The absolute call audio file path.
+        """
+        return os.path.abspath("data\\" + "call_audio\\" + media_file)
+
+    def process_audio(self, audio_file: str):
+        """
+        Loads and processes the audio file, returning the padded or trimmed audio.
+
+        With an audio cache, a file decoded before is memory-mapped from the
+        cache instead of being decoded by ffmpeg again.
+
+        Args:
+            audio_file (str): The name of the audio file.
+
+        Returns:
+            whisper.Audio: Processed audio data.
+        """
+        import whisper
+        audio_file_path = self.media_file_path(audio_file)
+        with tracer.span("audio.decode", media=audio_file):
+            if self.audio_cache is None:
+                call_audio = whisper.load_audio(audio_file_path)
+            else:
+                call_audio = self.audio_cache.load(audio_file_path, whisper.load_audio)
+            return whisper.pad_or_trim(call_audio)
+
+    def transcribe_audio(self, call_audio):
+        """
+        Transcribes the audio using the Whisper model and returns the transcript.
+
+        Args:
+            call_audio (whisper.Audio): Processed audio data.
+
+        Returns:
+            str: The transcribed text.
+        """
+        with tracer.span("whisper.transcribe", model=self.model_name):
+            self.current_transcript = self.model.transcribe(
+                call_audio, fp16=self.decode_options["fp16"])["text"]
+        return self.current_transcript
+
+    def transcribe_file(self, media_file: str) -> str:
+        """
+        Transcribes an audio file, answering from the transcript cache when possible.
+
+        A cache hit skips both the audio decode and the Whisper inference. In
+        chunked mode the whole call is transcribed and the per-chunk timing
+        and real-time factor are printed.
+
+        Args:
+            media_file (str): The name of the call audio file.
+
+        Returns:
+            str: The transcribed text.
+        """
+        if media_file in self._batched_transcripts:
+            self.current_transcript = self._batched_transcripts[media_file]
+            return self.current_transcript
+        if self.transcript_cache is None:
+            return self._transcribe_uncached(media_file)
+
+        key = self._cache_key(media_file)
+        transcript = self.transcript_cache.get(key)
+        if transcript is not None:
+            self.current_transcript = transcript
+            return transcript
+
+        start = time.perf_counter()
+        transcript = self._transcribe_uncached(media_file)
+        self.transcript_cache.put(key, transcript, time.perf_counter() - start)
+        return transcript
+
+    def transcribe_files(self, media_files: List[str]) -> List[str]:
+        """
+        Transcribes several audio files, batching those not in the transcript cache.
+
+        Files missing from the cache are decoded and transcribed together in
+        batches of ``batch_size``, and later transcribe_file() calls for them
+        are answered from memory. Without a batch size each file is
+        transcribed on its own with transcribe_file().
+
+        Args:
+            media_files (list): The names of the call audio files.
+
+        Returns:
+            list: The transcript of each file, in order.
+        """
+        if self.batch_transcriber is None:
+            return [self.transcribe_file(media_file) for media_file in media_files]
+
+        keys, pending = {}, []
+        for media_file in dict.fromkeys(media_files):
+            if media_file in self._batched_transcripts:
+                continue
+            if self.transcript_cache is not None:
+                keys[media_file] = self._cache_key(media_file)
+                transcript = self.transcript_cache.get(keys[media_file])
+                if transcript is not None:
+                    self._batched_transcripts[media_file] = transcript
+                    continue
+            pending.append(media_file)
+
+        if pending:
+            start = time.perf_counter()
+            clips = [self.process_audio(media_file) for media_file in pending]
+            self.batch_transcriber.model = self.model
+            transcripts = self.batch_transcriber.transcribe(clips)
+            seconds_per_file = (time.perf_counter() - start) / len(pending)
+            for media_file, transcript in zip(pending, transcripts):
+                self._batched_transcripts[media_file] = transcript
+                if self.transcript_cache is not None:
+                    self.transcript_cache.put(keys[media_file], transcript, seconds_per_file)
+
+        return [self.transcribe_file(media_file) for media_file in media_files]
+
+    def _cache_key(self, media_file: str) -> str:
+        """
+        Returns the transcript cache key of an audio file.
+        """
+        return TranscriptCache.key(
+            file_hash(self.media_file_path(media_file)),
+            self.model_name, self.decode_options)
+
+    def _transcribe_uncached(self, media_file: str) -> str:
+        """
+        Decodes and transcribes an audio file with Whisper.
+        """
+        if self.chunked_transcriber is None:
+            return self.transcribe_audio(self.process_audio(media_file))
+
+        self.chunked_transcriber.model = self.model
+        self.current_transcript = self.chunked_transcriber.transcribe(
+            self.media_file_path(media_file))
+        self.chunked_transcriber.print_report()
+        return self.current_transcript
+
+    def store_transcript(self, llava_model: str, fp16: bool = False) -> None:
+        """
+        Stores the current transcript along with the LLAVA model it corresponds to.
+
+        Args:
+            llava_model (str): The LLAVA model name.
+            fp16 (bool, optional): Whether FP16 mode is enabled. Defaults to False.
+        """
+        if self.current_transcript is not None:
+            self.transcripts.append(self.current_transcript)
+            self.model_transcripts[llava_model] = self.current_transcript
+
+    def store_call_notes(self, llava_model: str, benchmark_result: str):
+        """
+        Extracts and stores call notes from benchmark results.
+
+        Args:
+            llava_model (str): The LLAVA model name.
+            benchmark_result (OllamaResult): The benchmark result output.
+        """
+        with tracer.span("call_notes.parse"):
+            self._parse_call_notes(llava_model, benchmark_result)
+
+    def _parse_call_notes(self, llava_model: str, benchmark_result) -> None:
+        """
+        Extracts the call notes from an Ollama result.
+        """
+        response = getattr(benchmark_result, "response", None)
+        if isinstance(response, str):
+            self.call_notes = response
+            self.model_call_notes[llava_model] = response.strip() or None
+            return
+
+        pattern = re.compile(
+            r'failed to get console mode for stderr: The handle is invalid\.(.*)', re.DOTALL)
+        match = pattern.search(benchmark_result.stdout)
+
+        if match:
+            self.call_notes = match.group(1)
+            self.model_call_notes[llava_model] = self.call_notes.strip()
+        else:
+            self.model_call_notes[llava_model] = None
+
+    def print_call_notes(self):
+        """
+        Prints formatted call notes.
+
+        Note:
+            The call notes are wrapped to a maximum width of 40 characters using textwrap.
+        """
+        with tracer.span("call_notes.print"):
+            self._print_call_notes()
+
+    def _print_call_notes(self):
+        """
+        Prints the wrapped call notes.
+        """
+        separator = '-' * 40
+        section_title = "\ncall notes:".upper()
+        lines = self.call_notes.strip().splitlines()
+        wrapped_lines = [textwrap.fill(
+            line, width=40, initial_indent="| ", subsequent_indent="| ") for line in lines]
+
+        print(separator)
+        print(section_title)
+        for wrapped_line in wrapped_lines:
+            print(wrapped_line)
+        print("\n")
@@ -0,0 +1,247 @@
+# Standard library imports.
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Iterator, List
+
+# Third party imports.
+import numpy as np
+
+# Local library imports.
+from modules.tracing import tracer
+
+# Sample rate Whisper expects its input at (whisper.audio.SAMPLE_RATE), kept
+# here so decoding and windowing do not import whisper and torch.
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class ChunkTiming:
+    """
+    Timing of one transcribed chunk.
+
+    Attributes:
+        index (int): Position of the chunk in the call.
+        start (float): Offset of the chunk into the call, in seconds.
+        duration (float): Length of the chunk audio, in seconds.
+        seconds (float): Wall time spent transcribing the chunk.
+    """
+    index: int
+    start: float
+    duration: float
+    seconds: float
+
+
+class ChunkedTranscriber:
+    """
+    Transcribes call audio of any length in overlapping windows.
+
+    The audio is decoded by a streaming ffmpeg process and only one window
+    is held in memory at a time, so memory stays flat however long the call
+    is. With an AudioCache, a file decoded before is read from its
+    memory-mapped cache entry instead. Consecutive windows overlap by
+    ``overlap_seconds`` and the words the overlap produces twice are removed
+    when the chunk texts are stitched.
+
+    Attributes:
+        model (whisper.Whisper): The Whisper ASR model instance, set by the
+            owner before the first transcription when loaded lazily.
+        chunk_seconds (float): Length of each window in seconds.
+        overlap_seconds (float): Overlap between consecutive windows in seconds.
+        fp16 (bool): Whether FP16 mode is enabled.
+        chunk_timings (list): ChunkTiming of each chunk of the last call.
+        audio_cache (AudioCache): The decoded audio cache, or None.
+    """
+
+    # Largest and smallest number of overlapping words removed when stitching.
+    MAX_OVERLAP_WORDS = 20
+    MIN_OVERLAP_WORDS = 2
+
+    def __init__(self, model, chunk_seconds: float = 30.0, overlap_seconds: float = 5.0,
+                 fp16: bool = False, audio_cache=None):
+        """
+        Initialize ChunkedTranscriber instance.
+
+        Args:
+            model (whisper.Whisper): The Whisper ASR model instance.
+            chunk_seconds (float, optional): Window length. Defaults to 30s,
+                the input length of Whisper.
+            overlap_seconds (float, optional): Window overlap. Defaults to 5s.
+            fp16 (bool, optional): Whether FP16 mode is enabled.
+            audio_cache (AudioCache, optional): Cache of decoded audio
+                consulted before running ffmpeg. Defaults to no caching.
+        """
+        if not 0 <= overlap_seconds < chunk_seconds:
+            raise ValueError("overlap_seconds must be between 0 and chunk_seconds")
+        self.model = model
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.fp16 = fp16
+        self.chunk_timings: List[ChunkTiming] = []
+        self.audio_cache = audio_cache
+
+    @staticmethod
+    def decode_stream(audio_file_path: str, block_seconds: float = 5.0) -> Iterator[np.ndarray]:
+        """
+        Decode an audio file to 16 kHz mono float32 samples, block by block.
+
+        Args:
+            audio_file_path (str): The path to the audio file.
+            block_seconds (float, optional): Length of each yielded block.
+
+        Yields:
+            numpy.ndarray: Consecutive float32 sample blocks.
+        """
+        command = [
+            "ffmpeg", "-nostdin", "-threads", "0", "-i", audio_file_path,
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE), "-loglevel", "error", "-",
+        ]
+        block_bytes = int(block_seconds * SAMPLE_RATE) * 2
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            while True:
+                block = process.stdout.read(block_bytes)
+                if not block:
+                    break
+                yield np.frombuffer(block, np.int16).astype(np.float32) / 32768.0
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+
+    def windows(self, blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Regroup sample blocks into overlapping fixed-length windows.
+
+        Args:
+            blocks (iterator): Consecutive float32 sample blocks.
+
+        Yields:
+            numpy.ndarray: Windows of ``chunk_seconds`` (the last may be
+            shorter), each starting ``chunk_seconds - overlap_seconds``
+            after the previous one.
+        """
+        chunk_samples = int(self.chunk_seconds * SAMPLE_RATE)
+        overlap_samples = int(self.overlap_seconds * SAMPLE_RATE)
+        buffer = np.zeros(0, np.float32)
+        emitted = False
+
+        for block in blocks:
+            buffer = np.concatenate((buffer, block))
+            while len(buffer) >= chunk_samples:
+                yield buffer[:chunk_samples]
+                emitted = True
+                buffer = buffer[chunk_samples - overlap_samples:]
+
+        # The tail is only new audio if it extends past the last overlap.
+        if len(buffer) > overlap_samples or (not emitted and len(buffer)):
+            yield buffer
+
+    @classmethod
+    def stitch(cls, text: str, chunk_text: str) -> str:
+        """
+        Append a chunk transcript, dropping words repeated from the overlap.
+
+        The longest run of trailing words of ``text`` that reappears at (or
+        within a couple of words of) the start of ``chunk_text`` is removed
+        from the chunk. Words are compared ignoring case and punctuation.
+
+        Args:
+            text (str): The transcript stitched so far.
+            chunk_text (str): The transcript of the next chunk.
+
+        Returns:
+            str: The stitched transcript.
+        """
+        previous_words = text.split()
+        chunk_words = chunk_text.split()
+        if not previous_words:
+            return " ".join(chunk_words)
+
+        def normalize(words):
+            return [re.sub(r"[^\w']", "", word).lower() for word in words]
+
+        tail = normalize(previous_words[-cls.MAX_OVERLAP_WORDS:])
+        head = normalize(chunk_words[:cls.MAX_OVERLAP_WORDS + 2])
+        drop = 0
+        for length in range(min(len(tail), len(head)), cls.MIN_OVERLAP_WORDS - 1, -1):
+            suffix = tail[-length:]
+            for offset in range(0, min(3, len(head) - length + 1)):
+                if head[offset:offset + length] == suffix:
+                    drop = offset + length
+                    break
+            if drop:
+                break
+
+        return " ".join(previous_words + chunk_words[drop:])
+
+    def transcribe_windows(self, windows: Iterator[np.ndarray]) -> str:
+        """
+        Transcribe and stitch a sequence of windows, recording chunk timings.
+
+        Args:
+            windows (iterator): Overlapping float32 sample windows.
+
+        Returns:
+            str: The stitched transcript.
+        """
+        self.chunk_timings = []
+        step_seconds = self.chunk_seconds - self.overlap_seconds
+        text = ""
+        for index, window in enumerate(windows):
+            start = time.perf_counter()
+            with tracer.span("whisper.transcribe", chunk=index):
+                chunk_text = self.model.transcribe(window, fp16=self.fp16)["text"]
+            self.chunk_timings.append(ChunkTiming(
+                index=index,
+                start=index * step_seconds,
+                duration=len(window) / SAMPLE_RATE,
+                seconds=time.perf_counter() - start,
+            ))
+            text = self.stitch(text, chunk_text)
+        return text
+
+    def transcribe(self, audio_file_path: str) -> str:
+        """
+        Transcribe an audio file of any length.
+
+        Args:
+            audio_file_path (str): The path to the audio file.
+
+        Returns:
+            str: The stitched transcript.
+        """
+        if self.audio_cache is None:
+            blocks = self.decode_stream(audio_file_path)
+        else:
+            blocks = self.audio_cache.stream(audio_file_path, self.decode_stream)
+        return self.transcribe_windows(self.windows(blocks))
+
+    @property
+    def audio_seconds(self) -> float:
+        """
+        Length of the last call in seconds, not counting overlaps twice.
+        """
+        if not self.chunk_timings:
+            return 0.0
+        last = self.chunk_timings[-1]
+        return last.start + last.duration
+
+    @property
+    def real_time_factor(self) -> float:
+        """
+        Transcription wall time divided by audio length for the last call.
+        """
+        seconds = sum(timing.seconds for timing in self.chunk_timings)
+        return seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def print_report(self) -> None:
+        """
+        Prints the per-chunk timing and real-time factor of the last call.
+        """
+        for timing in self.chunk_timings:
+            print(f"◽ Chunk {timing.index}:\t{timing.start:.0f}s +{timing.duration:.0f}s "
+                  f"in {timing.seconds:.2f}s\t🎧")
+        print(f"◽ Real-time factor:\t{self.real_time_factor:.3f}\t⏱️\n")
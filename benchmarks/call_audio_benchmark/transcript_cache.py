@@ -0,0 +1,141 @@
+# Standard library imports.
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+# Default location and size bound of the on-disk transcript cache.
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "llava-benchmark", "transcripts")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class TranscriptCache:
+    """
+    A content-addressed on-disk cache of Whisper transcripts.
+
+    Entries are keyed by the SHA-256 of the audio file contents, the Whisper
+    model name and the decode options, so renaming a file still hits and
+    changing any of them misses. Each entry is a small JSON file holding the
+    transcript and the seconds it took to produce. The least recently used
+    entries are evicted once the cache grows beyond ``max_bytes``.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+        max_bytes (int): Size bound of the cache directory.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that required transcription.
+        seconds_saved (float): Transcription seconds skipped thanks to hits.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize TranscriptCache instance.
+
+        Args:
+            cache_dir (str, optional): Directory for the cache entries.
+            max_bytes (int, optional): Size bound of the cache directory.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(content_hash: str, model_name: str, options: Dict) -> str:
+        """
+        Build the cache key for a transcription.
+
+        Args:
+            content_hash (str): The audio content hash.
+            model_name (str): The Whisper model name.
+            options (dict): The decode options used for transcription.
+
+        Returns:
+            str: The hex cache key.
+        """
+        material = json.dumps([content_hash, model_name, options], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a transcript, counting the hit or miss.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The cached transcript, or None on a miss.
+        """
+        entry_path = self._entry_path(key)
+        with self._lock:
+            try:
+                with open(entry_path, "r", encoding="utf-8") as entry_file:
+                    entry = json.load(entry_file)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            # Touch the entry so eviction sees it as recently used.
+            os.utime(entry_path)
+            self.hits += 1
+            self.seconds_saved += entry.get("seconds", 0.0)
+            return entry["text"]
+
+    def put(self, key: str, text: str, seconds: float) -> None:
+        """
+        Store a transcript and evict old entries beyond the size bound.
+
+        A transcript whose entry alone exceeds the size bound is not stored.
+
+        Args:
+            key (str): The cache key.
+            text (str): The transcript.
+            seconds (float): Seconds it took to produce the transcript.
+        """
+        entry_path = self._entry_path(key)
+        temporary_path = entry_path + ".tmp"
+        with self._lock:
+            with open(temporary_path, "w", encoding="utf-8") as entry_file:
+                json.dump({"text": text, "seconds": seconds}, entry_file)
+            if os.path.getsize(temporary_path) > self.max_bytes:
+                os.remove(temporary_path)
+                return
+            os.replace(temporary_path, entry_path)
+            self._evict(keep=entry_path)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep (str, optional): Path of an entry never to delete, such as
+                the one just written.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total_bytes -= size
+
+    def print_stats(self) -> None:
+        """
+        Print the hit/miss counts and the transcription time saved.
+        """
+        print(f"◽ Transcript cache:\t{self.hits} hits, {self.misses} misses, "
+              f"{self.seconds_saved:.2f}s saved\t⚡\n")
@@ -0,0 +1,135 @@
+# Standard library imports.
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Local library imports.
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+
+
+@dataclass
+class LoadTiming:
+    """
+    Model load and end-to-end timing of a single request.
+
+    Attributes:
+        load_duration (float): Seconds Ollama spent loading the model.
+        total_duration (float): Seconds Ollama spent on the whole request.
+        wall_time (float): Seconds from sending the request to the response.
+        eval_rate (float): Generated tokens per second.
+    """
+    load_duration: Optional[float]
+    total_duration: Optional[float]
+    wall_time: Optional[float]
+    eval_rate: Optional[float]
+
+    @classmethod
+    def from_result(cls, benchmark_result) -> "LoadTiming":
+        """
+        Extract the load timing of an Ollama result.
+
+        Args:
+            benchmark_result (OllamaResult): Result of the Ollama request.
+
+        Returns:
+            LoadTiming: The load and end-to-end timing.
+        """
+        metrics = EvalRateProcessor.parse_metrics(benchmark_result)
+        wall_time = getattr(benchmark_result, "wall_time", None)
+        return cls(
+            load_duration=metrics.load_duration,
+            total_duration=metrics.total_duration,
+            wall_time=wall_time if isinstance(wall_time, (int, float)) else None,
+            eval_rate=metrics.eval_rate,
+        )
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return statistics.fmean(values) if values else None
+
+
+class ColdStartBenchmark:
+    """
+    A benchmark class separating cold-start latency from steady-state throughput.
+
+    The cold-start request of each model is sent right after the model was
+    evicted (``keep_alive=0``), so its load duration is the full cost of
+    loading the model. Measured requests after the warmup give the
+    steady-state latency and tokens/s.
+
+    Attributes:
+        current_model (str): The model of the most recently stored result.
+        cold_starts (dict): Mapping of model names to the cold LoadTiming.
+        warm_timings (dict): Mapping of model names to measured LoadTiming lists.
+    """
+
+    def __init__(self):
+        """
+        Initialize ColdStartBenchmark instance.
+        """
+        self.current_model = None
+        self.cold_starts = {}
+        self.warm_timings = {}
+
+    def store_cold_start(self, model: str, benchmark_result) -> None:
+        """
+        Store the timing of a request sent to a freshly evicted model.
+
+        Args:
+            model (str): Model name.
+            benchmark_result (OllamaResult): Result of the cold request.
+        """
+        self.current_model = model
+        self.cold_starts[model] = LoadTiming.from_result(benchmark_result)
+        load_duration = self.cold_starts[model].load_duration
+        if load_duration is not None:
+            print(f"◽ Cold load:\t{load_duration}s\t🧊\n")
+
+    def store_timing(self, model: str, benchmark_result) -> None:
+        """
+        Store the timing of a measured (warm) request.
+
+        Args:
+            model (str): Model name.
+            benchmark_result (OllamaResult): Result of the measured request.
+        """
+        self.current_model = model
+        self.warm_timings.setdefault(model, []).append(
+            LoadTiming.from_result(benchmark_result))
+
+    def cold_vs_warm(self, model: str = None) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Report cold-start latency and steady-state throughput of one model.
+
+        Args:
+            model (str, optional): Model name. Defaults to the model of the
+                most recently stored result.
+
+        Returns:
+            dict: Cold load duration and latency, mean warm load duration
+            and latency in seconds and mean steady-state tokens/s, or None
+            if nothing was stored for the model.
+        """
+        model = model or self.current_model
+        cold = self.cold_starts.get(model)
+        warm = self.warm_timings.get(model, [])
+        if cold is None and not warm:
+            return None
+
+        report = {
+            "cold_load": cold.load_duration if cold else None,
+            "cold_latency": cold.wall_time if cold else None,
+            "warm_load": _mean([timing.load_duration for timing in warm]),
+            "warm_latency": _mean([timing.wall_time for timing in warm]),
+            "steady_eval_rate": _mean([timing.eval_rate for timing in warm]),
+        }
+
+        print(f"{'-' * 40}\nCold vs warm: {model} 🧊\n{'-' * 40}")
+        for name, value in report.items():
+            if value is not None:
+                unit = " tokens/s" if name.endswith("_rate") else "s"
+                print(f"  {name.replace('_', ' ')}:".ljust(24) + f"{value:.3f}{unit}")
+        print()
+
+        return report
@@ -11,6 +11,9 @@ The `EvalRateBenchmark` class is imported here to make it accessible when the
 for a cleaner import statement, as you can directly import the `EvalRateBenchmark`
 class from the `eval_rate_benchmark` package.
 
+The `TimingMetrics` record holding every Ollama timing field of a result is
+exported the same way.
+
 For example, instead of using:
     from benchmarks.eval_rate_benchmark.eval_rate_benchmark import EvalRateBenchmark
 you can use:
@@ -18,3 +21,4 @@ you can use:
 """
 
 from .eval_rate_benchmark import EvalRateBenchmark
+from .timing_metrics import TimingMetrics
@@ -1,6 +1,3 @@
-# Standard library imports.
-import re
-
 # Local library imports.
 from .eval_rate_processor import EvalRateProcessor
 from .eval_rate_plotter import EvalRatePlotter
@@ -12,6 +9,12 @@ class EvalRateBenchmark():
         self.eval_rates = []
         self.image_file_paths = []
 
+        # Every timing field of each stored result, as TimingMetrics, for
+        # the whole run and for the model being benchmarked.
+        self.current_metrics = None
+        self.metrics = []
+        self.model_metrics = []
+
         self.eval_rate_plotter = EvalRatePlotter()
 
     def average_rate(self):
@@ -25,11 +28,28 @@ class EvalRateBenchmark():
         """
         return EvalRateProcessor.average_eval_rates(self.eval_rates)
 
+    def average_metrics(self):
+        """
+        Calculates the average of every timing field stored since the last
+        call, i.e. for the current model, separating model load, prompt
+        evaluation (image encoding/prefill) and decode cost.
+
+        Returns:
+            TimingMetrics: The per-field averages.
+        """
+        average = EvalRateProcessor.average_metrics(self.model_metrics)
+        self.model_metrics = []
+        return average
+
     def process_eval_rate(self, benchmark_result):
+        self.current_metrics = EvalRateProcessor.parse_metrics(benchmark_result)
         self.current_eval_rate = EvalRateProcessor.process_eval_rate(
-            benchmark_result)
+            benchmark_result, self.current_metrics)
 
     def store_eval_rate(self, image_file_path: str):
         if self.current_eval_rate is not None:
             self.eval_rates.extend(self.current_eval_rate)
             self.image_file_paths.append(image_file_path)
+        if self.current_metrics is not None:
+            self.metrics.append(self.current_metrics)
+            self.model_metrics.append(self.current_metrics)
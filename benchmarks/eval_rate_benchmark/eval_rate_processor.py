@@ -1,29 +1,51 @@
 # Standard library imports.
-import re
+from dataclasses import fields
+
+# Local library imports.
+from .timing_metrics import TimingMetrics
 
 
 class EvalRateProcessor:
 
     @staticmethod
-    def process_eval_rate(benchmark_result):
+    def parse_metrics(benchmark_result):
+        """
+        Extract every Ollama timing field from a benchmark result.
+
+        Args:
+            benchmark_result: An OllamaResult or subprocess.CompletedProcess.
+                The fields an OllamaResult parsed once are returned as is.
+                Otherwise API timing fields in ``metrics`` are used when
+                present, or the CLI ``--verbose`` output in ``stderr`` is parsed.
+
+        Returns:
+            TimingMetrics: The extracted timing fields.
+        """
+        timing_metrics = getattr(benchmark_result, "timing_metrics", None)
+        if isinstance(timing_metrics, TimingMetrics):
+            return timing_metrics
+        metrics = getattr(benchmark_result, "metrics", None)
+
+        if isinstance(metrics, dict) and metrics:
+            return TimingMetrics.from_api(metrics)
+        return TimingMetrics.from_verbose(benchmark_result.stderr)
+
+    @staticmethod
+    def process_eval_rate(benchmark_result, timing_metrics=None):
         """
         Extract and process the evaluation rate from a benchmark result.
 
         Args:
-            benchmark_result: Result of the subprocess.run call.
+            benchmark_result: An OllamaResult or subprocess.CompletedProcess.
+            timing_metrics (TimingMetrics, optional): The result's timing
+                fields if already parsed, so the result is not parsed twice.
 
         Returns:
             list: The extracted evaluation rate in a list.
         """
-        eval_rate = []
-        std_err = benchmark_result.stderr
-
-        for line in std_err.split("\n"):
-            if "eval rate" in line and "prompt" not in line:
-                match = re.search(r"eval rate:\s+(\d+\.\d+)", line)
-                if match:
-                    rate = float(match.group(1))
-                    eval_rate.append(rate)
+        if timing_metrics is None:
+            timing_metrics = EvalRateProcessor.parse_metrics(benchmark_result)
+        eval_rate = [] if timing_metrics.eval_rate is None else [timing_metrics.eval_rate]
 
         for rate in eval_rate:
             print(f"◽ Tokens/s:\t{rate}\t📈")
@@ -41,3 +63,36 @@ class EvalRateProcessor:
             print(f"{'-' * 40}\nAverage eval rate: {average} 📊\n{'-' * 40}\n")
 
         return average
+
+    @staticmethod
+    def average_metrics(metrics_list):
+        """
+        Average every timing field over a list of TimingMetrics.
+
+        Fields missing from a result are left out of that field's average.
+
+        Args:
+            metrics_list (list): TimingMetrics objects.
+
+        Returns:
+            TimingMetrics: The per-field averages, or None if the list is empty.
+        """
+        if not metrics_list:
+            return None
+
+        average = TimingMetrics()
+        for field in fields(TimingMetrics):
+            values = [getattr(metrics, field.name) for metrics in metrics_list
+                      if getattr(metrics, field.name) is not None]
+            if values:
+                setattr(average, field.name, round(sum(values) / len(values), 3))
+
+        print("Average timings:")
+        for name, value in average.as_dict().items():
+            if value is not None:
+                unit = "tokens/s" if name.endswith("_rate") else (
+                    "tokens" if name.endswith("_count") else "s")
+                print(f"  {name.replace('_', ' ')}:".ljust(24) + f"{value} {unit}")
+        print()
+
+        return average
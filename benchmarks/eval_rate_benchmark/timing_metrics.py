@@ -0,0 +1,120 @@
+# Standard library imports.
+import re
+from dataclasses import dataclass, fields
+from typing import Dict, Optional
+
+
+# Matches every "<field>: <value>" line of the ollama --verbose timing block
+# in a single pass over the text.
+_VERBOSE_PATTERN = re.compile(
+    r"^\s*(total duration|load duration|prompt eval count|prompt eval duration|"
+    r"prompt eval rate|eval count|eval duration|eval rate):\s+(\S+)",
+    re.MULTILINE,
+)
+
+# Go duration units as printed by the ollama CLI, in seconds.
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 1e-3,
+                   "µs": 1e-6, "us": 1e-6, "ns": 1e-9}
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(h|ms|m|s|µs|us|ns)")
+
+
+def parse_duration(text: str) -> float:
+    """
+    Parse a Go duration string such as ``1m2.5s`` or ``538.5513ms``.
+
+    Args:
+        text (str): The duration string.
+
+    Returns:
+        float: The duration in seconds.
+    """
+    return sum(float(value) * _DURATION_UNITS[unit]
+               for value, unit in _DURATION_PATTERN.findall(text))
+
+
+@dataclass(slots=True)
+class TimingMetrics:
+    """
+    Timing fields Ollama reports for a single request.
+
+    Durations are in seconds and rates in tokens/s. Fields Ollama did not
+    report are None.
+
+    Attributes:
+        total_duration (float): Time spent on the whole request.
+        load_duration (float): Time spent loading the model.
+        prompt_eval_count (int): Number of prompt tokens evaluated.
+        prompt_eval_duration (float): Time spent evaluating the prompt,
+            including image encoding.
+        prompt_eval_rate (float): Prompt tokens evaluated per second.
+        eval_count (int): Number of tokens generated.
+        eval_duration (float): Time spent generating tokens.
+        eval_rate (float): Tokens generated per second.
+    """
+    total_duration: Optional[float] = None
+    load_duration: Optional[float] = None
+    prompt_eval_count: Optional[int] = None
+    prompt_eval_duration: Optional[float] = None
+    prompt_eval_rate: Optional[float] = None
+    eval_count: Optional[int] = None
+    eval_duration: Optional[float] = None
+    eval_rate: Optional[float] = None
+
+    @classmethod
+    def from_verbose(cls, text: str) -> "TimingMetrics":
+        """
+        Parse the timing block printed by ``ollama run --verbose``.
+
+        Args:
+            text (str): The CLI standard error output.
+
+        Returns:
+            TimingMetrics: The parsed timing fields.
+        """
+        metrics = cls()
+        for name, value in _VERBOSE_PATTERN.findall(text):
+            attribute = name.replace(" ", "_")
+            if attribute.endswith("_count"):
+                setattr(metrics, attribute, int(value))
+            elif attribute.endswith("_rate"):
+                setattr(metrics, attribute, float(value))
+            else:
+                setattr(metrics, attribute, parse_duration(value))
+        return metrics
+
+    @classmethod
+    def from_api(cls, body: Dict) -> "TimingMetrics":
+        """
+        Convert the nanosecond timing fields of an Ollama API response.
+
+        Args:
+            body (dict): The API response or its timing fields.
+
+        Returns:
+            TimingMetrics: The timing fields, with rates derived from the
+            counts and durations as the CLI does.
+        """
+        def seconds(key):
+            return body[key] / 1e9 if body.get(key) is not None else None
+
+        def rate(count, duration):
+            return round(count / duration, 2) if count is not None and duration else None
+
+        metrics = cls(
+            total_duration=seconds("total_duration"),
+            load_duration=seconds("load_duration"),
+            prompt_eval_count=body.get("prompt_eval_count"),
+            prompt_eval_duration=seconds("prompt_eval_duration"),
+            eval_count=body.get("eval_count"),
+            eval_duration=seconds("eval_duration"),
+        )
+        metrics.prompt_eval_rate = rate(metrics.prompt_eval_count, metrics.prompt_eval_duration)
+        metrics.eval_rate = rate(metrics.eval_count, metrics.eval_duration)
+        return metrics
+
+    def as_dict(self) -> Dict:
+        """
+        Returns:
+            dict: The timing fields by name.
+        """
+        return {field.name: getattr(self, field.name) for field in fields(self)}
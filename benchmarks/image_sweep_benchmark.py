@@ -0,0 +1,264 @@
+# Standard library imports.
+import os
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Third party imports.
+import asciichartpy
+from PIL import Image
+
+# Local library imports.
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark, normalize_plate
+from modules.image_cache import DEFAULT_IMAGE_CACHE_DIR, ImageCache
+
+# Formats whose size depends on the encoder quality.
+LOSSY_FORMATS = ("jpeg", "webp")
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """
+    One resolution/format/quality setting of the sweep.
+
+    Attributes:
+        max_edge (int): Longest edge in pixels, or None for the original image.
+        image_format (str): Output format, or None for the original image.
+        quality (int): Encoder quality, or None for lossless formats and the
+            original image.
+    """
+    max_edge: Optional[int]
+    image_format: Optional[str]
+    quality: Optional[int]
+
+    @property
+    def label(self) -> str:
+        if self.max_edge is None:
+            return "original"
+        quality = f" q{self.quality}" if self.quality is not None else ""
+        return f"{self.max_edge}px {self.image_format}{quality}"
+
+
+@dataclass
+class SweepResult:
+    """
+    Result of one image variant sent to one model.
+
+    Attributes:
+        variant (ImageVariant): The variant setting.
+        media (str): The media file name the variant was made from.
+        pixels (int): Width times height of the image sent.
+        image_bytes (int): File size of the image sent.
+        prompt_eval_duration (float): Seconds Ollama spent on prompt evaluation.
+        latency (float): Seconds from sending the request to the response.
+        plate (str): The license plate number read by the model.
+        correct (bool): Whether the plate matches the expected plate.
+    """
+    variant: ImageVariant
+    media: str
+    pixels: int
+    image_bytes: int
+    prompt_eval_duration: Optional[float]
+    latency: Optional[float]
+    plate: Optional[str]
+    correct: bool
+
+
+class ImageSweepBenchmark:
+    """
+    A benchmark class for how input resolution and encoding affect prefill.
+
+    Every configured image is sent to each model at its original size and as
+    variants at several longest edges, formats and qualities. Each variant
+    is scored on prompt-eval duration, total latency and whether the plate
+    matches the ground-truth manifest (or, for images missing from it, the
+    plate read from the original image), so the smallest input that keeps
+    accuracy can be picked for the capture resolution.
+
+    Attributes:
+        variants (list): ImageVariant settings, the original image first.
+        ground_truth (dict): Mapping of image file names to their plates.
+        cache_dir (str): Directory of the image cache holding the variants.
+        model_results (dict): Mapping of model names to SweepResult lists.
+    """
+
+    def __init__(self, sizes: Sequence[int] = (1024, 768, 512, 384, 256),
+                 formats: Sequence[str] = ("jpeg",), qualities: Sequence[int] = (90, 60),
+                 cache_dir: str = DEFAULT_IMAGE_CACHE_DIR):
+        """
+        Initialize ImageSweepBenchmark instance.
+
+        Args:
+            sizes (sequence, optional): Longest edges in pixels.
+            formats (sequence, optional): Output formats, see IMAGE_FORMATS.
+            qualities (sequence, optional): Encoder qualities for lossy formats.
+            cache_dir (str, optional): Directory of the image cache.
+        """
+        self.variants = [ImageVariant(None, None, None)]
+        for max_edge in sorted(sizes, reverse=True):
+            for image_format in formats:
+                for quality in (qualities if image_format in LOSSY_FORMATS else (None,)):
+                    self.variants.append(ImageVariant(max_edge, image_format, quality))
+        self.cache_dir = cache_dir
+        self.model_results: Dict[str, List[SweepResult]] = {}
+        self._caches: Dict[ImageVariant, ImageCache] = {}
+        self._plate_reader = LicensePlateBenchmark()
+        self.ground_truth = self._plate_reader.ground_truth
+
+    def variant_path(self, variant: ImageVariant, media_file: str) -> str:
+        """
+        Get the image to send for a variant of a media file.
+
+        Args:
+            variant (ImageVariant): The variant setting.
+            media_file (str): The name of the media file.
+
+        Returns:
+            str: The path to the variant image, created on first use.
+        """
+        image_path = LicensePlateBenchmark.media_file_path(media_file)
+        if variant.max_edge is None:
+            return image_path
+        if variant not in self._caches:
+            self._caches[variant] = ImageCache(
+                self.cache_dir, variant.max_edge, variant.image_format,
+                variant.quality if variant.quality is not None else 90)
+        return self._caches[variant].prepare(image_path)
+
+    def store_sweep_result(self, model: str, variant: ImageVariant, media_file: str,
+                           image_path: str, benchmark_result,
+                           expected_plate: Optional[str] = None) -> SweepResult:
+        """
+        Score and store the result of one variant.
+
+        Args:
+            model (str): Model name.
+            variant (ImageVariant): The variant setting.
+            media_file (str): The name of the media file.
+            image_path (str): The path to the image that was sent.
+            benchmark_result (OllamaResult): Result of the Ollama request.
+            expected_plate (str, optional): The plate to compare against.
+                Defaults to the plate read from the original image.
+
+        Returns:
+            SweepResult: The stored result.
+        """
+        self._plate_reader.process_license_plate_number(benchmark_result)
+        plate = self._plate_reader.current_license_plate_number
+        if expected_plate is None:
+            expected_plate = next(
+                (result.plate for result in self.model_results.get(model, [])
+                 if result.media == media_file and result.variant.max_edge is None), plate)
+
+        with Image.open(image_path) as image:
+            pixels = image.width * image.height
+        metrics = EvalRateProcessor.parse_metrics(benchmark_result)
+        wall_time = getattr(benchmark_result, "wall_time", None)
+        result = SweepResult(
+            variant=variant,
+            media=media_file,
+            pixels=pixels,
+            image_bytes=os.path.getsize(image_path),
+            prompt_eval_duration=metrics.prompt_eval_duration,
+            latency=wall_time if isinstance(wall_time, (int, float)) else metrics.total_duration,
+            plate=plate,
+            correct=bool(plate) and normalize_plate(plate) == normalize_plate(expected_plate),
+        )
+        self.model_results.setdefault(model, []).append(result)
+        return result
+
+    def summarize(self, model: str) -> List[Tuple[ImageVariant, Dict[str, float]]]:
+        """
+        Average the results of every variant over the media files.
+
+        Args:
+            model (str): Model name.
+
+        Returns:
+            list: Tuples of each variant and its mean pixels, bytes,
+            prompt-eval duration and latency and its accuracy, in order of
+            decreasing pixel count.
+        """
+        by_variant: Dict[ImageVariant, List[SweepResult]] = {}
+        for result in self.model_results.get(model, []):
+            by_variant.setdefault(result.variant, []).append(result)
+
+        def mean(values):
+            values = [value for value in values if value is not None]
+            return statistics.fmean(values) if values else None
+
+        summary = []
+        for variant, results in by_variant.items():
+            summary.append((variant, {
+                "pixels": mean([result.pixels for result in results]),
+                "image_bytes": mean([result.image_bytes for result in results]),
+                "prompt_eval_duration": mean([result.prompt_eval_duration for result in results]),
+                "latency": mean([result.latency for result in results]),
+                "accuracy": mean([float(result.correct) for result in results]),
+            }))
+        return sorted(summary, key=lambda item: item[1]["pixels"], reverse=True)
+
+    def smallest_accurate(self, model: str, tolerance: float = 0.0) -> Optional[ImageVariant]:
+        """
+        Find the smallest input that reads plates as well as the original.
+
+        Args:
+            model (str): Model name.
+            tolerance (float, optional): Accuracy that may be lost relative
+                to the original image, e.g. 0.05 for five percentage points.
+
+        Returns:
+            ImageVariant: The variant with the fewest pixels, then bytes,
+            whose accuracy is within tolerance of the original, or None if
+            the model has no results.
+        """
+        summary = self.summarize(model)
+        original = next((stats for variant, stats in summary if variant.max_edge is None), None)
+        if original is None:
+            return None
+        accurate = [(stats["pixels"], stats["image_bytes"], variant) for variant, stats in summary
+                    if stats["accuracy"] >= original["accuracy"] - tolerance]
+        return min(accurate, key=lambda item: item[:2])[2]
+
+    def plot_sweep(self, model: str, tolerance: float = 0.0) -> Optional[ImageVariant]:
+        """
+        Print the sweep table and charts and the smallest accurate input.
+
+        Args:
+            model (str): Model name.
+            tolerance (float, optional): Accuracy that may be lost relative
+                to the original image.
+
+        Returns:
+            ImageVariant: The smallest input that keeps accuracy.
+        """
+        summary = self.summarize(model)
+        if not summary:
+            return None
+
+        print(f"{'-' * 40}\nImage sweep: {model} 🖼️\n{'-' * 40}")
+        print(f"{'variant':<18}{'pixels':>10}{'KB':>8}{'prefill':>9}{'latency':>9}{'acc':>6}")
+        for variant, stats in summary:
+            prefill, latency = stats["prompt_eval_duration"], stats["latency"]
+            print(f"{variant.label:<18}{stats['pixels']:>10.0f}{stats['image_bytes'] / 1024:>8.1f}"
+                  + (f"{prefill:>9.3f}" if prefill is not None else f"{'-':>9}")
+                  + (f"{latency:>9.3f}" if latency is not None else f"{'-':>9}")
+                  + f"{stats['accuracy']:>6.0%}")
+        print()
+
+        # Charts run from the largest input on the left to the smallest.
+        for name, title in (("prompt_eval_duration", "Prompt eval (s)"),
+                            ("latency", "Latency (s)"), ("accuracy", "Accuracy")):
+            series = [stats[name] for _, stats in summary if stats[name] is not None]
+            if len(series) > 1:
+                print(f"\t\tY-axis: {title}")
+                print("\t\tX-axis: Pixel count, decreasing")
+                print(asciichartpy.plot([value for value in series for _ in range(2)],
+                                        {"width": 40, "height": 4, "offset": 2,
+                                         "colors": ["\033[31m"]}))
+                print("\n")
+
+        smallest = self.smallest_accurate(model, tolerance)
+        print(f"◽ Smallest accurate input:\t{smallest.label}\t🎯\n")
+        return smallest
@@ -1,6 +1,57 @@
 # Standard library imports.
 import os
 import re
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Third party imports.
+import yaml
+
+# Local library imports.
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+from modules.stats import batch_edit_distance
+
+# Default location of the ground-truth plates of the images in data/images.
+DEFAULT_GROUND_TRUTH = os.path.join("data", "images", "ground_truth.yml")
+
+
+def normalize_plate(plate: Optional[str]) -> str:
+    """
+    Normalize a license plate for comparison, keeping letters and digits.
+
+    Args:
+        plate (str): The license plate as read or expected.
+
+    Returns:
+        str: The upper case letters and digits of the plate.
+    """
+    return re.sub(r"[^0-9A-Z]", "", (plate or "").upper())
+
+
+@dataclass
+class PlateScore:
+    """
+    Accuracy and speed of one model on the license plate images.
+
+    Attributes:
+        model (str): Model name.
+        images (int): Number of scored images.
+        exact_match (float): Fraction of plates read exactly.
+        cer (float): Mean character error rate of the plates read.
+        eval_rate (float): Mean generated tokens per second.
+        latency (float): Mean seconds from request to response.
+        pareto (bool): Whether no other model is at least as accurate, fast
+            and quick to respond while being better in one of them.
+    """
+    model: str
+    images: int
+    exact_match: float
+    cer: float
+    eval_rate: Optional[float]
+    latency: Optional[float]
+    pareto: bool = False
+
 
 class LicensePlateBenchmark:
     """
@@ -10,15 +61,46 @@ class LicensePlateBenchmark:
         current_license_plate_number (str): The current license plate number being processed.
         license_plate_numbers (list): List of extracted license plate numbers.
         model_license_plate_numbers (dict): Mapping of model names to license plate numbers.
+        image_cache (ImageCache): Cache of downsized images sent instead of
+            the originals, or None to send the originals.
+        ground_truth (dict): Mapping of image file names to their plates.
+        model_predictions (dict): Mapping of model names to lists of
+            (image file name, plate read, eval rate, latency) tuples.
     """
 
-    def __init__(self):
+    def __init__(self, image_cache=None, ground_truth: Optional[Dict[str, str]] = None):
         """
         Initialize LicensePlateBenchmark instance.
+
+        Args:
+            image_cache (ImageCache, optional): Cache of downsized images to
+                send instead of the originals.
+            ground_truth (dict, optional): Mapping of image file names to
+                their plates. Defaults to the DEFAULT_GROUND_TRUTH manifest
+                if it exists.
         """
         self.current_license_plate_number = None
         self.license_plate_numbers = []
         self.model_license_plate_numbers = {}
+        self.image_cache = image_cache
+        if ground_truth is None and os.path.exists(DEFAULT_GROUND_TRUTH):
+            ground_truth = self.load_ground_truth()
+        self.ground_truth = ground_truth or {}
+        self.model_predictions = {}
+
+    @staticmethod
+    def load_ground_truth(manifest_path: str = DEFAULT_GROUND_TRUTH) -> Dict[str, str]:
+        """
+        Read a ground-truth manifest of image file names and plates.
+
+        Args:
+            manifest_path (str, optional): Path to the YAML manifest.
+
+        Returns:
+            dict: Mapping of image file names to their plates.
+        """
+        with open(manifest_path, "r") as manifest_file:
+            return {str(name): str(plate) for name, plate in yaml.safe_load(manifest_file).items()}
 
     @staticmethod
     def media_file_path(media_file: str) -> str:
@@ -33,6 +115,21 @@ class LicensePlateBenchmark:
         """
         return os.path.abspath(os.path.join("data", "images", media_file))
 
+    def prepare_image(self, media_file: str) -> str:
+        """
+        Get the path of the image to send for a media file.
+
+        Args:
+            media_file (str): The name of the media file.
+
+        Returns:
+            str: The preprocessed image from the image cache, or the original
+            image if there is no cache.
+        """
+        if self.image_cache is None:
+            return self.media_file_path(media_file)
+        return self.image_cache.prepare(self.media_file_path(media_file))
+
     def extract_license_plate_number(self, stdout) -> str:
         """
         Extract the license plate number from benchmark result output.
@@ -53,21 +150,31 @@ class LicensePlateBenchmark:
         Process the license plate number from benchmark result.
 
         Args:
-            benchmark_result (str): Result of the benchmark execution.
+            benchmark_result (OllamaResult): Result of the benchmark execution.
         """
-        self.current_license_plate_number = self.extract_license_plate_number(
-            benchmark_result.stdout
-        )
+        response = getattr(benchmark_result, "response", None)
+        if isinstance(response, str):
+            # Structured results carry the model output without CLI noise,
+            # so the plate is the first non-empty line.
+            lines = [line.strip() for line in response.splitlines() if line.strip()]
+            self.current_license_plate_number = lines[0] if lines else None
+        else:
+            self.current_license_plate_number = self.extract_license_plate_number(
+                benchmark_result.stdout
+            )
         print(
             f"◽ Plate:\t{self.current_license_plate_number or 'not found'}\t🚗\n")
 
-    def store_license_plate(self, model: str, benchmark_result: str) -> None:
+    def store_license_plate(self, model: str, benchmark_result: str,
+                            media_file_path: str = None) -> None:
         """
         Store the license plate number for a specific model.
 
         Args:
             model (str): Model name.
-            benchmark_result (str): Result of the benchmark execution.
+            benchmark_result (OllamaResult): Result of the benchmark execution.
+            media_file_path (str, optional): The image the plate was read
+                from, for scoring against the ground truth.
         """
         self.process_license_plate_number(benchmark_result)
         if self.current_license_plate_number is not None:
@@ -75,3 +182,102 @@ class LicensePlateBenchmark:
                 self.current_license_plate_number)
         self.model_license_plate_numbers[model] = self.license_plate_numbers
 
+        media_file = self.media_file_name(media_file_path) if media_file_path else None
+        if media_file in self.ground_truth:
+            metrics = EvalRateProcessor.parse_metrics(benchmark_result)
+            wall_time = getattr(benchmark_result, "wall_time", None)
+            self.model_predictions.setdefault(model, []).append((
+                media_file, self.current_license_plate_number, metrics.eval_rate,
+                wall_time if isinstance(wall_time, (int, float)) else metrics.total_duration))
+
+    def media_file_name(self, media_file_path: str) -> str:
+        """
+        Get the ground-truth file name of an image that was sent.
+
+        Args:
+            media_file_path (str): The path to the original or cached image.
+
+        Returns:
+            str: The image file name, e.g. ``1.jpg``.
+        """
+        name = os.path.basename(media_file_path)
+        if name in self.ground_truth or self.image_cache is None:
+            return name
+        # Cached images are named <stem>-<key><extension>.
+        stem = name.rsplit("-", 1)[0]
+        return next((known for known in self.ground_truth
+                     if os.path.splitext(known)[0] == stem), name)
+
+    def score(self) -> List[PlateScore]:
+        """
+        Score every model against the ground truth and find the Pareto front.
+
+        Exact match and character error rate compare normalized plates. The
+        edit distances of all predictions are computed in one batch.
+
+        Returns:
+            list: A PlateScore per model, in the order the models were run.
+        """
+        predictions = [(model, media_file, plate, eval_rate, latency)
+                       for model, rows in self.model_predictions.items()
+                       for media_file, plate, eval_rate, latency in rows]
+        if not predictions:
+            return []
+
+        read = [normalize_plate(plate) for _, _, plate, _, _ in predictions]
+        truth = [normalize_plate(self.ground_truth[media_file])
+                 for _, media_file, _, _, _ in predictions]
+        distances = batch_edit_distance(read, truth)
+
+        def mean(values):
+            values = [value for value in values if value is not None]
+            return statistics.fmean(values) if values else None
+
+        scores = []
+        for model in self.model_predictions:
+            rows = [i for i, prediction in enumerate(predictions) if prediction[0] == model]
+            scores.append(PlateScore(
+                model=model,
+                images=len(rows),
+                exact_match=mean([float(read[i] == truth[i]) for i in rows]),
+                cer=mean([distances[i] / max(len(truth[i]), 1) for i in rows]),
+                eval_rate=mean([predictions[i][3] for i in rows]),
+                latency=mean([predictions[i][4] for i in rows]),
+            ))
+
+        def dominates(a: PlateScore, b: PlateScore) -> bool:
+            # Missing speed figures count as the worst possible.
+            a_rate, b_rate = a.eval_rate or 0.0, b.eval_rate or 0.0
+            a_latency = a.latency if a.latency is not None else float("inf")
+            b_latency = b.latency if b.latency is not None else float("inf")
+            at_least = (a.exact_match >= b.exact_match and a.cer <= b.cer
+                        and a_rate >= b_rate and a_latency <= b_latency)
+            better = (a.exact_match > b.exact_match or a.cer < b.cer
+                      or a_rate > b_rate or a_latency < b_latency)
+            return at_least and better
+
+        for score in scores:
+            score.pareto = not any(dominates(other, score) for other in scores)
+        return scores
+
+    def print_accuracy_report(self) -> List[PlateScore]:
+        """
+        Print accuracy against speed per model, marking the Pareto-optimal ones.
+
+        Returns:
+            list: The PlateScore of each model.
+        """
+        scores = self.score()
+        if not scores:
+            return scores
+
+        print(f"{'-' * 40}\nPlate accuracy vs speed 🎯\n{'-' * 40}")
+        print(f"{'model':<24}{'exact':>7}{'CER':>7}{'tokens/s':>10}{'latency':>9}")
+        for score in scores:
+            print(f"{score.model:<24}{score.exact_match:>7.0%}{score.cer:>7.1%}"
+                  + (f"{score.eval_rate:>10.2f}" if score.eval_rate is not None else f"{'-':>10}")
+                  + (f"{score.latency:>9.3f}" if score.latency is not None else f"{'-':>9}")
+                  + ("  ⭐" if score.pareto else ""))
+        print("\n⭐ Pareto-optimal: no other model is as accurate and as fast.\n")
+        return scores
+
@@ -0,0 +1,133 @@
+# Standard library imports.
+import statistics
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Local library imports.
+from modules.stats import percentile
+
+
+@dataclass
+class StreamLatency:
+    """
+    Streaming latency of a single request.
+
+    Attributes:
+        ttft (float): Seconds from sending the request to the first token.
+        mean_gap (float): Mean seconds between consecutive tokens.
+        p99_gap (float): 99th percentile seconds between consecutive tokens.
+        jitter (float): Standard deviation of the gaps between tokens.
+        tokens (int): Number of streamed chunks that carried text.
+        gaps (list): Seconds between each pair of consecutive tokens.
+    """
+    ttft: Optional[float]
+    mean_gap: Optional[float]
+    p99_gap: Optional[float]
+    jitter: Optional[float]
+    tokens: int
+    gaps: List[float]
+
+
+class StreamingLatencyBenchmark:
+    """
+    A benchmark class for time-to-first-token and inter-token latency.
+
+    Requires streamed results, i.e. the http backend started with
+    ``--stream``, whose ``token_times`` hold the arrival time of every chunk.
+
+    Attributes:
+        current_model (str): The model of the most recently stored result.
+        current_latency (StreamLatency): Latency of the most recent result.
+        model_latencies (dict): Mapping of model names to StreamLatency lists.
+    """
+
+    def __init__(self):
+        """
+        Initialize StreamingLatencyBenchmark instance.
+        """
+        self.current_model = None
+        self.current_latency = None
+        self.model_latencies = {}
+
+    @staticmethod
+    def measure(token_times: List[float]) -> StreamLatency:
+        """
+        Calculate the streaming latency from chunk arrival times.
+
+        Args:
+            token_times (list): Seconds from sending the request to receiving
+                each chunk that carried text.
+
+        Returns:
+            StreamLatency: TTFT, inter-token gap statistics and token count.
+        """
+        gaps = [later - earlier for earlier, later in zip(token_times, token_times[1:])]
+        return StreamLatency(
+            ttft=token_times[0] if token_times else None,
+            mean_gap=statistics.fmean(gaps) if gaps else None,
+            p99_gap=percentile(gaps, 99),
+            jitter=statistics.pstdev(gaps) if gaps else None,
+            tokens=len(token_times),
+            gaps=gaps,
+        )
+
+    def store_latency(self, model: str, benchmark_result) -> None:
+        """
+        Measure and store the streaming latency of a benchmark result.
+
+        Args:
+            model (str): Model name.
+            benchmark_result (OllamaResult): Result of a streamed request.
+        """
+        token_times = getattr(benchmark_result, "token_times", None) or []
+        self.current_model = model
+        self.current_latency = self.measure(token_times)
+        self.model_latencies.setdefault(model, []).append(self.current_latency)
+
+        if self.current_latency.ttft is None:
+            print("◽ TTFT:\tno streamed tokens\t⏳\n")
+        else:
+            print(f"◽ TTFT:\t{self.current_latency.ttft * 1000:.0f}ms\t⏳")
+            if self.current_latency.mean_gap is not None:
+                print(f"◽ Gap:\t{self.current_latency.mean_gap * 1000:.1f}ms mean, "
+                      f"{self.current_latency.p99_gap * 1000:.1f}ms p99, "
+                      f"{self.current_latency.jitter * 1000:.1f}ms jitter\n")
+
+    def average_latency(self, model: str = None) -> Optional[dict]:
+        """
+        Aggregate the streaming latency of one model.
+
+        Args:
+            model (str, optional): Model name. Defaults to the model of the
+                most recently stored result.
+
+        Returns:
+            dict: Mean and p50/p99 TTFT, mean and p99 inter-token gap over
+            all requests and mean per-request jitter in seconds, or None if
+            the model has no streamed results.
+        """
+        model = model or self.current_model
+        latencies = [latency for latency in self.model_latencies.get(model, [])
+                     if latency.ttft is not None]
+        if not latencies:
+            return None
+
+        ttfts = [latency.ttft for latency in latencies]
+        gaps = [gap for latency in latencies for gap in latency.gaps]
+        jitters = [latency.jitter for latency in latencies if latency.jitter is not None]
+        aggregate = {
+            "ttft_mean": statistics.fmean(ttfts),
+            "ttft_p50": percentile(ttfts, 50),
+            "ttft_p99": percentile(ttfts, 99),
+            "gap_mean": statistics.fmean(gaps) if gaps else None,
+            "gap_p99": percentile(gaps, 99),
+            "jitter_mean": statistics.fmean(jitters) if jitters else None,
+        }
+
+        print(f"{'-' * 40}\nStreaming latency: {model} ⏳\n{'-' * 40}")
+        for name, value in aggregate.items():
+            if value is not None:
+                print(f"  {name.replace('_', ' ')}:".ljust(16) + f"{value * 1000:.1f}ms")
+        print()
+
+        return aggregate
@@ -1,36 +1,100 @@
 # /usr/bin/env/python3
 
 import argparse
+import itertools
 import os
+import sys
+import threading
+import time
 
 """
 --------------------------------------
 ⚠️ Custom benchmark class imports.
 --------------------------------------
 """
+from benchmarks import is_benchmark, load_benchmark_class
 from benchmarks.eval_rate_benchmark import EvalRateBenchmark
 from benchmarks.license_plate_benchmark import LicensePlateBenchmark
-from benchmarks.call_audio_benchmark import CallAudioBenchmark
+from benchmarks.call_audio_benchmark import AudioCache, TranscriptCache
+from benchmarks.call_audio_benchmark.audio_cache import DEFAULT_AUDIO_CACHE_DIR
+from benchmarks.call_audio_benchmark.transcript_cache import DEFAULT_CACHE_DIR
+from benchmarks.cold_start_benchmark import ColdStartBenchmark
+from benchmarks.streaming_latency_benchmark import StreamingLatencyBenchmark
+from modules.adaptive import ADAPTIVE_METRICS, AdaptiveSampler
+from modules.compare import compare_runs, print_comparison
+from modules.host_pool import HostPool
+from modules.image_cache import DEFAULT_IMAGE_CACHE_DIR, IMAGE_FORMATS, ImageCache
 from modules.llava_benchmark import LlavaBenchmark
 from modules.ollama import Ollama
+from modules.load_generator import LoadGenerator
+from modules.option_sweep import OptionSweep, expand_options, format_options
+from modules.pipeline import TwoStagePipeline
+from modules.residency import ResidencyPlanner
+from modules.resource_sampler import ResourceSampler
+from modules.replay import REPLAY_LATENCIES, RecordingBackend, ReplayBackend
+from modules.results_store import DEFAULT_RESULTS_DB, ResultsStore, RunMetadata, config_hash
+from modules.scheduler import COLD, MEASURE, WARMUP, JobScheduler
+from modules.startup import measure_startup, print_startup
+from modules.tracing import tracer
 
+# YAML configuration file of each media type.
+CONFIG_FILES = {
+    "license_plates": "data/config_licence_plates.yml",
+    "call_audio": "data/config_call_audio.yml",
+}
 
-def llava_benchmark(yaml_file_path, benchmarks):
+
+def llava_benchmark(yaml_file_path, benchmarks, scheduler=None, pipeline=None,
+                    results_store=None, cold_start=False, residency=None, sampler=None,
+                    adaptive=None):
     """
     Runs the LLAVA benchmark for different models, prompts, and media
     files. It calculates the average evaluation rates in tokens/s for
     each model and prints license plate or call audio benchmark results.
 
+    The YAML file may set ``warmup``, the number of unmeasured requests sent
+    to each model before its measured ones (default 0), and ``repetitions``,
+    the number of measured runs of every cell (default 1). An ``options``
+    section of Ollama runtime options, each a value or a list of values to
+    try, runs every cell with each combination and reports the best one per
+    model.
+
     Args:
         yaml_file_path (str): Path to the YAML configuration file.
         benchmarks (list): List of benchmark objects.
+        scheduler (JobScheduler, optional): Runs the model × prompt × media
+            jobs. Defaults to one job at a time.
+        pipeline (TwoStagePipeline, optional): Overlaps media processing of
+            the next job with the Ollama request of the current one. Used
+            instead of the scheduler when given.
+        results_store (ResultsStore, optional): Persists every result with
+            the run metadata as soon as its cell completes.
+        cold_start (bool, optional): Evict each model before its first
+            request and report that request's load time separately.
+        residency (ResidencyPlanner, optional): Groups the jobs by model,
+            preloads the next model while the current one drains and
+            reports model swaps and load time.
+        sampler (ResourceSampler, optional): Samples the CPU and memory of
+            the Ollama server during the run and reports them per model.
+        adaptive (AdaptiveSampler, optional): Repeats every cell until its
+            metric converges or its budget runs out, instead of the
+            configured number of repetitions.
     """
-    # Check if ollama binary is present.
-    if not Ollama.is_binary_installed():
-        print(
-            "Error: ollama binary not found on the system."
-            "Please download it from https://ollama.com/"
-        )
+    # Check if Ollama can be reached through the selected backend.
+    if not Ollama.is_available():
+        if Ollama.backend.name == "cli":
+            print(
+                "Error: ollama binary not found on the system."
+                "Please download it from https://ollama.com/"
+            )
+        elif not hasattr(Ollama.backend, "host"):
+            # A host pool, or a backend recording one.
+            print(f"Error: Ollama not reachable through the {Ollama.backend.name} backend.")
+        else:
+            print(
+                f"Error: Ollama server not reachable at {Ollama.backend.host}. "
+                "Start it with 'ollama serve' or use '--backend cli'."
+            )
         return
 
     # Read the YAML model data file.
@@ -40,29 +104,107 @@ def llava_benchmark(yaml_file_path, benchmarks):
     model_names = data["models"]
     media_file_names = data["media"]
     prompts = data["prompts"]
+    warmup = data.get("warmup", 0)
+    repetitions = adaptive.max_samples if adaptive is not None else data.get("repetitions", 1)
+    option_sets = expand_options(data.get("options"))
+    option_sweep = OptionSweep() if data.get("options") else None
 
-    model_license_plate_numbers = {}
-
-    # Model Processing 🦙
+    # Check which models are installed, from one inventory fetch reused for
+    # the rest of the run.
+    Ollama.inventory(refresh=True)
+    installed_models = []
     for model in model_names:
-        # Check if the model is installed.
         if not Ollama.is_model_installed(model):
             print(f"Model {model} not found. Skipping this model")
             continue
+        installed_models.append(model)
+
+    # Record the run metadata for the persistent results store.
+    if results_store is not None:
+        run_id = results_store.start_run(RunMetadata(
+            ollama_version=Ollama.backend.version(),
+            backend=Ollama.backend.name,
+            config_path=yaml_file_path,
+            config_hash=config_hash(yaml_file_path),
+        ))
+        print(f"Recording run {run_id} to {results_store.path} 💾\n")
+
+    llava = LlavaBenchmark(benchmarks)
+    llava.prepare_run(media_file_names)
+    image_cache = next((benchmark.image_cache for benchmark in benchmarks
+                        if is_benchmark(benchmark, "LicensePlateBenchmark")), None)
+    scheduler = scheduler or JobScheduler()
+    jobs = JobScheduler.expand_jobs(installed_models, prompts, media_file_names,
+                                    repetitions, warmup, cold_start, option_sets)
+    if residency is not None:
+        residency.plan(jobs)
+    media_lock = threading.Lock()
+
+    def prepare_job(job):
+        # Media processing updates per-benchmark state (e.g. the current
+        # Whisper transcript), so only the Ollama requests run in parallel.
+        with media_lock:
+            return llava.process_media(job.media)
+
+    def send_job(job, prepared_media):
+        transcript, media_file_path = prepared_media
+        if job.phase == COLD:
+            with tracer.span("ollama.unload", model=job.model):
+                Ollama.unload_model(job.model)
+        benchmark_result = Ollama.run_benchmark(
+            job.model, job.prompt + transcript, media_file_path, dict(job.options) or None)
+        if adaptive is not None and job.phase == MEASURE:
+            # Recorded as soon as the request returns, so the next repetition
+            # of the cell already sees whether it converged.
+            adaptive.record_result(job, benchmark_result)
+        return transcript, media_file_path, benchmark_result
 
+    if sampler is not None:
+        send_job = sampler.wrap(send_job)
+        sampler.start()
+    if adaptive is not None:
+        prepare_job = adaptive.wrap(prepare_job)
+        send_job = adaptive.wrap(send_job)
+    if residency is not None:
+        # Outside the adaptive wrapper, so the next model is still preloaded
+        # when the last repetition of the current one is skipped.
+        send_job = residency.wrap(send_job)
+
+    # Model Processing 🦙
+    # Results come back in model → options → prompt → media order whatever
+    # order the worker pool finishes them in.
+    if pipeline is not None:
+        results = pipeline.run(jobs, prepare_job, send_job)
+    else:
+        results = scheduler.run(jobs, lambda job: send_job(job, prepare_job(job)))
+    if adaptive is not None:
+        # Repetitions of cells that had already converged were skipped.
+        results = ((job, result) for job, result in results if result is not None)
+    for model, model_results in itertools.groupby(results, key=lambda r: r[0].model):
         print(f"{'=' * 40}\n🦙  MODEL: {model} 🦙\n{'=' * 40}")
+        model_info = Ollama.model_info(model)
+        model_eval_rates = []
+        current_options = ()
 
-        # Prompt + Media Processing 🔁
-        for prompt in prompts:
+        # Prompt + Media Processing 🔁, per option combination 🎛️
+        for (options, prompt), prompt_results in itertools.groupby(
+                model_results, key=lambda r: (r[0].options, r[0].prompt)):
+            if options != current_options:
+                print(f"◽ Options:\t{format_options(options)}\t🎛️\n")
+                current_options = options
             Ollama.print_prompt(prompt)
-            for media in media_file_names:
-                transcript, media_file_path = LlavaBenchmark(
-                    benchmarks).process_media(media)
-
+            for job, (transcript, media_file_path, benchmark_result) in prompt_results:
                 print(os.path.relpath(media_file_path).upper(), "\t📁")
+                if residency is not None:
+                    residency.record_result(benchmark_result)
 
-                benchmark_result = Ollama.run_benchmark(
-                    model, prompt + transcript, media_file_path)
+                # Cold-start and warmup requests stay out of the statistics.
+                if job.phase == COLD:
+                    llava.store_cold_start(benchmark_result, model)
+                    continue
+                if job.phase == WARMUP:
+                    print(f"◽ Warmup {job.repetition + 1}/{warmup}\t🔥\n")
+                    continue
                 """
                 ---------------------------------------------------------------
                 ⚠️ MEDIA-LOOP: Call any custom code here that is designed
@@ -71,8 +213,31 @@ def llava_benchmark(yaml_file_path, benchmarks):
                 ---------------------------------------------------------------
                 """
                 # Per-Media Benchmark Result Storage 🗃️
-                LlavaBenchmark(benchmarks).store_results(
-                    benchmark_result, model, media_file_path)
+                llava.store_results(
+                    benchmark_result, model, media_file_path, transcript)
+                eval_rate = benchmark_result.timing_metrics.eval_rate
+                if eval_rate is not None:
+                    model_eval_rates.append(eval_rate)
+                if sampler is not None:
+                    sampler.record_result(model, benchmark_result)
+                if option_sweep is not None:
+                    option_sweep.record_result(model, options, benchmark_result)
+
+                # Persistent Result Storage 💾
+                if results_store is not None:
+                    extra = {"repetition": job.repetition} if repetitions > 1 else {}
+                    if getattr(benchmark_result, "host", ""):
+                        extra["host"] = benchmark_result.host
+                    extra.update(options)
+                    if image_cache is not None:
+                        extra.update(image_cache.params)
+                    if model_info is not None:
+                        extra.update({key: value for key, value in model_info.extra.items()
+                                      if value is not None})
+                    with tracer.span("results_store.record", model=model):
+                        results_store.record_result(
+                            run_id, model, prompt, job.media, benchmark_result,
+                            model_info.digest if model_info else None, extra or None)
 
         """
         -----------------------------------------------------------------
@@ -81,7 +246,156 @@ def llava_benchmark(yaml_file_path, benchmarks):
         -----------------------------------------------------------------
         """
         # Per-Model Benchmark Analysis 🔍
-        LlavaBenchmark(benchmarks).average_and_plot_benchmarks()
+        llava.average_and_plot_benchmarks()
+        if model_info is not None and model_eval_rates:
+            model_info.print_normalized_throughput(
+                sum(model_eval_rates) / len(model_eval_rates))
+        if sampler is not None:
+            sampler.print_report(model)
+
+    # Run Analysis 🏁
+    if sampler is not None:
+        sampler.stop()
+    llava.report_run()
+    if option_sweep is not None:
+        option_sweep.print_report()
+    if adaptive is not None:
+        adaptive.print_report()
+
+    if pipeline is not None:
+        pipeline.print_report()
+    if residency is not None:
+        residency.print_report()
+    if image_cache is not None and results_store is not None:
+        for model, saved in ImageCache.prompt_eval_saved(results_store, run_id).items():
+            print(f"◽ {model} prompt eval:\t{saved * 1000:.0f}ms/request saved vs the "
+                  f"last run of original images\t🖼️")
+
+
+def load_benchmark(yaml_file_path, benchmarks, rates, arrival="constant",
+                   step_duration=30.0, max_in_flight=256):
+    """
+    Runs an open-loop load test for each configured model. Requests built
+    from the configured prompts and media are sent at each target arrival
+    rate in turn, and a saturation curve of latency percentiles, achieved
+    throughput and error/timeout counts is printed per model.
+
+    Args:
+        yaml_file_path (str): Path to the YAML configuration file.
+        benchmarks (list): List of benchmark objects, used to prepare media.
+        rates (list): Target arrival rates in requests/s, in increasing order.
+        arrival (str, optional): ``constant`` or ``poisson`` arrivals.
+        step_duration (float, optional): Seconds to send requests at each rate.
+        max_in_flight (int, optional): Maximum number of concurrent requests.
+    """
+    if not Ollama.is_available():
+        print(f"Error: Ollama not reachable through the {Ollama.backend.name} backend.")
+        return
+
+    data = Ollama.read_yaml(yaml_file_path)
+
+    # Prepare each media file once so the load loop only sends requests.
+    llava = LlavaBenchmark(benchmarks)
+    llava.prepare_run(data["media"])
+    prepared_media = [llava.process_media(media) for media in data["media"]]
+
+    for model in data["models"]:
+        if not Ollama.is_model_installed(model):
+            print(f"Model {model} not found. Skipping this model")
+            continue
+
+        print(f"{'=' * 40}\n🦙  LOAD: {model} 🦙\n{'=' * 40}")
+        requests = [(model, prompt + transcript, media_file_path)
+                    for prompt in data["prompts"]
+                    for transcript, media_file_path in prepared_media]
+        load_generator = LoadGenerator(
+            Ollama.run_benchmark, requests, arrival=arrival,
+            step_duration=step_duration, max_in_flight=max_in_flight)
+        LoadGenerator.plot(load_generator.run(rates))
+
+
+def parse_rates(value):
+    """
+    Parse the comma separated arrival rates of ``--rates``.
+
+    Args:
+        value (str): Rates in requests/s, e.g. ``0.5,1,2``.
+
+    Returns:
+        list: The rates as floats.
+
+    Raises:
+        argparse.ArgumentTypeError: If a rate is not a positive number.
+    """
+    try:
+        rates = [float(rate) for rate in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rates {value!r}")
+    if not all(rate > 0 for rate in rates):
+        raise argparse.ArgumentTypeError(f"rates must be positive, got {value!r}")
+    return rates
+
+
+def sweep_benchmark(yaml_file_path, sweep, results_store=None, tolerance=0.0):
+    """
+    Runs the image resolution/format sweep for each configured model. Every
+    configured image is sent with the first configured prompt at its
+    original size and as each variant of the sweep, and prompt-eval
+    duration, latency and plate-read correctness are charted against pixel
+    count along with the smallest input that keeps accuracy.
+
+    Args:
+        yaml_file_path (str): Path to the YAML configuration file.
+        sweep (ImageSweepBenchmark): The sweep settings and results.
+        results_store (ResultsStore, optional): Persists every result with
+            the variant parameters.
+        tolerance (float, optional): Accuracy that may be lost relative to
+            the original images when picking the smallest input.
+    """
+    if not Ollama.is_available():
+        print(f"Error: Ollama not reachable through the {Ollama.backend.name} backend.")
+        return
+
+    data = Ollama.read_yaml(yaml_file_path)
+    prompt = data["prompts"][0]
+    ground_truth = sweep.ground_truth
+    installed_models = [model for model in data["models"] if Ollama.is_model_installed(model)]
+
+    if results_store is not None:
+        run_id = results_store.start_run(RunMetadata(
+            ollama_version=Ollama.backend.version(),
+            backend=Ollama.backend.name,
+            config_path=yaml_file_path,
+            config_hash=config_hash(yaml_file_path),
+        ))
+        print(f"Recording run {run_id} to {results_store.path} 💾\n")
+
+    for model in installed_models:
+        print(f"{'=' * 40}\n🦙  SWEEP: {model} 🦙\n{'=' * 40}")
+        Ollama.print_prompt(prompt)
+
+        # Unmeasured requests so the first variant does not pay the model load.
+        for _ in range(data.get("warmup", 0)):
+            Ollama.run_benchmark(model, prompt, sweep.variant_path(
+                sweep.variants[0], data["media"][0]))
+
+        for media in data["media"]:
+            for variant in sweep.variants:
+                image_path = sweep.variant_path(variant, media)
+                print(f"{media.upper()} {variant.label}", "\t📁")
+                benchmark_result = Ollama.run_benchmark(model, prompt, image_path)
+                sweep.store_sweep_result(model, variant, media, image_path, benchmark_result,
+                                         ground_truth.get(media))
+
+                if results_store is not None:
+                    results_store.record_result(
+                        run_id, model, prompt, media, benchmark_result, extra={
+                            "image_max_edge": variant.max_edge,
+                            "image_format": variant.image_format,
+                            "image_quality": variant.quality,
+                        })
+
+        sweep.plot_sweep(model, tolerance)
 
 
 if __name__ == "__main__":
@@ -104,18 +418,461 @@ if __name__ == "__main__":
              python llava_benchmark.py --media license_plates
            - For call audio:
              python llava_benchmark.py --media call_audio
+        3. Optionally select how Ollama is reached with '--backend':
+           the REST API ('http', default) or the ollama binary ('cli').
+        4. Set 'warmup' and 'repetitions' in the YAML file to send
+           unmeasured requests first and repeat every cell, and add
+           '--cold-start' to measure model load after eviction.
+        5. Add '--load' to send requests at stepped arrival rates
+           ('--rates 0.5,1,2') and print a saturation curve instead.
+        6. Compare two recorded runs and exit non-zero on a
+           significant regression:
+             python llava_benchmark.py --compare previous latest
     """
     parser = argparse.ArgumentParser(description="LLaVA Benchmark")
     parser.add_argument(
         "--media",
         choices=["license_plates", "call_audio"],
-        required=True,
         help="Specify the media type (license_plates or call_audio)")
+    parser.add_argument(
+        "--backend",
+        choices=["http", "cli"],
+        default="http",
+        help="Reach Ollama through the REST API (http) or the ollama binary (cli)")
+    parser.add_argument(
+        "--host",
+        default=None,
+        help="Ollama server address for the http backend (default: $OLLAMA_HOST "
+             "or http://localhost:11434)")
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="ARCHIVE",
+        help="Record every Ollama response with its timing fields into a JSON Lines "
+             "fixture archive for --replay")
+    parser.add_argument(
+        "--replay",
+        default=None,
+        metavar="ARCHIVE",
+        help="Serve the responses recorded with --record instead of reaching Ollama, "
+             "and report the harness overhead per request")
+    parser.add_argument(
+        "--replay-latency",
+        choices=REPLAY_LATENCIES,
+        default="none",
+        help="How long replayed requests take: not at all (none), their recorded wall "
+             "time (recorded) or their tokens at --replay-tokens-per-second (tokens) "
+             "(default: none)")
+    parser.add_argument(
+        "--replay-tokens-per-second",
+        type=float,
+        default=30.0,
+        help="Simulated generation speed of --replay-latency tokens (default: 30)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of benchmark requests to run in parallel (default: 1)")
+    parser.add_argument(
+        "--per-model-concurrency",
+        type=int,
+        default=None,
+        help="Maximum parallel requests per model, e.g. to match "
+             "OLLAMA_NUM_PARALLEL (default: --workers)")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds to wait for each Ollama request before counting it as "
+             "timed out (default: 600 for http, none for cli)")
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Run an open-loop load test instead of the benchmark matrix")
+    parser.add_argument(
+        "--rates",
+        type=parse_rates,
+        default=[0.25, 0.5, 1, 2, 4],
+        help="Comma separated arrival rates in requests/s for --load "
+             "(default: 0.25,0.5,1,2,4)")
+    parser.add_argument(
+        "--arrival",
+        choices=["constant", "poisson"],
+        default="constant",
+        help="Inter-arrival time distribution for --load (default: constant)")
+    parser.add_argument(
+        "--step-duration",
+        type=float,
+        default=30.0,
+        help="Seconds to send requests at each --load rate (default: 30)")
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=256,
+        help="Maximum number of concurrent --load requests (default: 256)")
+    parser.add_argument(
+        "--transcript-cache",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the Whisper transcript cache for call_audio "
+             f"(default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument(
+        "--transcript-cache-size",
+        type=int,
+        default=64,
+        help="Size bound of the transcript cache in MB (default: 64)")
+    parser.add_argument(
+        "--no-transcript-cache",
+        action="store_true",
+        help="Transcribe every call audio file with Whisper, ignoring the cache")
+    parser.add_argument(
+        "--audio-cache",
+        default=DEFAULT_AUDIO_CACHE_DIR,
+        help="Directory of the decoded audio cache for call_audio "
+             f"(default: {DEFAULT_AUDIO_CACHE_DIR})")
+    parser.add_argument(
+        "--audio-cache-size",
+        type=int,
+        default=1024,
+        help="Size bound of the decoded audio cache in MB (default: 1024)")
+    parser.add_argument(
+        "--no-audio-cache",
+        action="store_true",
+        help="Decode every call audio file with ffmpeg, ignoring the decoded audio cache")
+    parser.add_argument(
+        "--chunked-audio",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Transcribe whole calls in overlapping windows of SECONDS instead "
+             "of trimming them to 30 seconds")
+    parser.add_argument(
+        "--chunk-overlap",
+        type=float,
+        default=5.0,
+        help="Overlap in seconds between --chunked-audio windows (default: 5)")
+    parser.add_argument(
+        "--whisper-batch-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Transcribe the call audio files together in batches of N clips")
+    parser.add_argument(
+        "--batch-benchmark",
+        nargs="+",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Compare files/sec and peak memory of transcribing the call audio "
+             "files in batches of each N against one at a time, then exit")
+    parser.add_argument(
+        "--image-max-edge",
+        type=int,
+        default=None,
+        metavar="PIXELS",
+        help="Downsize license plate images to this longest edge and send cached "
+             "copies instead of the originals")
+    parser.add_argument(
+        "--image-format",
+        choices=sorted(IMAGE_FORMATS),
+        default="jpeg",
+        help="Format of the downsized images for --image-max-edge (default: jpeg)")
+    parser.add_argument(
+        "--image-quality",
+        type=int,
+        default=90,
+        help="Encoder quality of the downsized images for --image-max-edge (default: 90)")
+    parser.add_argument(
+        "--image-cache",
+        default=DEFAULT_IMAGE_CACHE_DIR,
+        help="Directory of the downsized image cache for --image-max-edge "
+             f"(default: {DEFAULT_IMAGE_CACHE_DIR})")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Send every license plate image at several resolutions, formats and "
+             "qualities and report the smallest input that keeps accuracy")
+    parser.add_argument(
+        "--sweep-sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1024, 768, 512, 384, 256],
+        help="Comma separated longest edges in pixels for --sweep "
+             "(default: 1024,768,512,384,256)")
+    parser.add_argument(
+        "--sweep-formats",
+        type=lambda value: value.split(","),
+        default=["jpeg"],
+        help="Comma separated image formats for --sweep, from jpeg, png and webp "
+             "(default: jpeg)")
+    parser.add_argument(
+        "--sweep-qualities",
+        type=lambda value: [int(quality) for quality in value.split(",")],
+        default=[90, 60],
+        help="Comma separated encoder qualities of lossy formats for --sweep "
+             "(default: 90,60)")
+    parser.add_argument(
+        "--sweep-tolerance",
+        type=float,
+        default=0.0,
+        help="Accuracy --sweep may lose relative to the original images when "
+             "picking the smallest input (default: 0)")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Transcribe the next call while Ollama summarizes the current one "
+             "and report per-stage busy/idle time (runs one request at a time)")
+    parser.add_argument(
+        "--pipeline-depth",
+        type=int,
+        default=2,
+        help="Maximum number of transcripts queued ahead of Ollama with "
+             "--pipeline (default: 2)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses (http backend only) and report time-to-first-token "
+             "and inter-token latency")
+    parser.add_argument(
+        "--residency",
+        action="store_true",
+        help="Group jobs by model, preload the next model while the current one "
+             "drains (http backend) and report model swaps and load time")
+    parser.add_argument(
+        "--resident-models",
+        type=int,
+        default=None,
+        help="Maximum number of different models with requests in flight, for "
+             "hosts that cannot hold every model in memory (default: no limit)")
+    parser.add_argument(
+        "--cold-start",
+        action="store_true",
+        help="Evict each model before its first request and report cold-start "
+             "load time separately from steady-state throughput")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Repeat every model/prompt/media cell until the confidence interval of "
+             "--adaptive-metric is narrower than --target-width, instead of the "
+             "configured repetitions, and report the time saved")
+    parser.add_argument(
+        "--adaptive-metric",
+        choices=ADAPTIVE_METRICS,
+        default="eval_rate",
+        help="Timing field that has to converge with --adaptive (default: eval_rate)")
+    parser.add_argument(
+        "--target-width",
+        type=float,
+        default=0.05,
+        help="Width of the 95%% confidence interval relative to the mean at which "
+             "--adaptive stops sampling a cell (default: 0.05)")
+    parser.add_argument(
+        "--min-samples",
+        type=int,
+        default=3,
+        help="Samples of every cell before --adaptive checks convergence (default: 3)")
+    parser.add_argument(
+        "--max-samples",
+        type=int,
+        default=20,
+        help="Sample budget of every cell with --adaptive, and the fixed repetitions "
+             "the time saved is reported against (default: 20)")
+    parser.add_argument(
+        "--cell-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Wall time budget of every cell with --adaptive (default: no limit)")
+    parser.add_argument(
+        "--results-db",
+        default=DEFAULT_RESULTS_DB,
+        help=f"SQLite database every result is appended to (default: {DEFAULT_RESULTS_DB})")
+    parser.add_argument(
+        "--no-results-db",
+        action="store_true",
+        help="Do not record results to the results database")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CANDIDATE"),
+        help="Compare two runs in --results-db by run id (or unique prefix, "
+             "'latest', 'previous') instead of benchmarking")
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.05,
+        help="Relative slowdown counted as a regression by --compare (default: 0.05)")
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level of the --compare permutation test (default: 0.05)")
+    parser.add_argument(
+        "--resources",
+        action="store_true",
+        help="Sample CPU, memory, major faults and load average of the local Ollama "
+             "server from /proc during the run and report them per model")
+    parser.add_argument(
+        "--resource-interval",
+        type=float,
+        default=0.5,
+        help="Seconds between --resources samples (default: 0.5)")
+    parser.add_argument(
+        "--ollama-pid",
+        type=int,
+        default=None,
+        help="Process id of the Ollama server sampled by --resources "
+             "(default: the first process named ollama)")
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        help="Time every stage of the run, print a per-stage breakdown and "
+             "write a Chrome trace (chrome://tracing, Perfetto) to TRACE_FILE")
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Measure the import time and peak memory of this script, and of "
+             "Whisper for comparison, instead of benchmarking")
     args = parser.parse_args()
+    if args.startup:
+        print_startup([measure_startup("import llava_benchmark"),
+                       measure_startup("import whisper")])
+        sys.exit(0)
+    if args.compare:
+        results_store = ResultsStore(args.results_db)
+        try:
+            comparisons = compare_runs(results_store, *args.compare)
+        except ValueError as error:
+            parser.error(str(error))
+        regressions = print_comparison(comparisons, args.regression_threshold, args.alpha)
+        results_store.close()
+        sys.exit(1 if regressions else 0)
+    if args.media is None:
+        parser.error("one of the arguments --media, --compare or --startup is required")
+    if args.sweep and args.media != "license_plates":
+        parser.error("--sweep requires --media license_plates")
+    unknown_formats = set(args.sweep_formats) - set(IMAGE_FORMATS)
+    if unknown_formats:
+        parser.error(f"unknown --sweep-formats {sorted(unknown_formats)}, "
+                     f"expected some of {sorted(IMAGE_FORMATS)}")
+    if args.whisper_batch_size is not None and args.chunked_audio is not None:
+        parser.error("--whisper-batch-size cannot be combined with --chunked-audio")
+    if args.batch_benchmark and args.media != "call_audio":
+        parser.error("--batch-benchmark requires --media call_audio")
+    if args.record and args.replay:
+        parser.error("--record cannot be combined with --replay")
+    if args.adaptive and (args.load or args.sweep):
+        parser.error("--adaptive cannot be combined with --load or --sweep")
+    adaptive = None
+    if args.adaptive:
+        try:
+            adaptive = AdaptiveSampler(args.adaptive_metric, args.target_width,
+                                       min_samples=args.min_samples,
+                                       max_samples=args.max_samples,
+                                       max_seconds=args.cell_budget)
+        except ValueError as error:
+            parser.error(f"--adaptive: {error}")
+    if args.stream and args.backend != "http" and not args.replay:
+        parser.error("--stream requires the http backend")
+    if args.trace:
+        # Enabled before the benchmarks are built so Whisper model load is traced.
+        tracer.enable()
+
+    yaml_file_path = CONFIG_FILES[args.media]
+    config = Ollama.read_yaml(yaml_file_path) or {}
+    hosts = config.get("hosts")
+    if hosts and args.backend != "http" and not args.replay:
+        parser.error(f"the hosts in {yaml_file_path} require the http backend")
+    try:
+        expand_options(config.get("options"))
+    except ValueError as error:
+        parser.error(f"{yaml_file_path}: {error}")
+    if config.get("options") and args.backend != "http" and not args.replay:
+        parser.error(f"the options in {yaml_file_path} require the http backend")
+
+    backend_options = {"timeout": args.timeout} if args.timeout else {}
+    host_pool = None
+    if args.backend == "http":
+        pool_maxsize = 256 if args.load else max(10, args.workers)
+        if hosts and not args.replay:
+            host_pool = HostPool(hosts, pool_maxsize=pool_maxsize, stream=args.stream,
+                                 **backend_options)
+            Ollama.use_backend(host_pool)
+        else:
+            Ollama.use_backend(Ollama.create_backend(
+                "http", host=args.host, pool_maxsize=pool_maxsize, stream=args.stream,
+                **backend_options))
+    else:
+        Ollama.use_backend(Ollama.create_backend("cli", **backend_options))
+    if args.record:
+        Ollama.use_backend(RecordingBackend(Ollama.backend, args.record))
+    elif args.replay:
+        try:
+            Ollama.use_backend(ReplayBackend(
+                args.replay, args.replay_latency, args.replay_tokens_per_second))
+        except OSError as error:
+            parser.error(f"cannot read --replay archive: {error}")
+    start = time.perf_counter()
+    scheduler = JobScheduler(args.workers, args.per_model_concurrency, args.resident_models)
+    pipeline = None
+    if args.pipeline:
+        first_stage = "transcribe" if args.media == "call_audio" else "media"
+        pipeline = TwoStagePipeline(args.pipeline_depth, (first_stage, "ollama"))
 
     if args.media == "license_plates":
-        benchmarks = [EvalRateBenchmark(), LicensePlateBenchmark()]
-        llava_benchmark("data/config_licence_plates.yml", benchmarks)
+        image_cache = None if args.image_max_edge is None else ImageCache(
+            args.image_cache, args.image_max_edge, args.image_format, args.image_quality)
+        benchmarks = [EvalRateBenchmark(), LicensePlateBenchmark(image_cache)]
     elif args.media == "call_audio":
-        benchmarks = [EvalRateBenchmark(), CallAudioBenchmark()]
-        llava_benchmark("data/config_call_audio.yml", benchmarks)
+        transcript_cache = None if args.no_transcript_cache else TranscriptCache(
+            args.transcript_cache, args.transcript_cache_size * 1024 * 1024)
+        audio_cache = None if args.no_audio_cache else AudioCache(
+            args.audio_cache, args.audio_cache_size * 1024 * 1024)
+        # Loaded here so other media never import the Whisper benchmark.
+        CallAudioBenchmark = load_benchmark_class("CallAudioBenchmark")
+        benchmarks = [EvalRateBenchmark(), CallAudioBenchmark(
+            transcript_cache=transcript_cache, chunk_seconds=args.chunked_audio,
+            overlap_seconds=args.chunk_overlap, batch_size=args.whisper_batch_size,
+            audio_cache=audio_cache)]
+        if args.batch_benchmark:
+            from benchmarks.call_audio_benchmark.batch_transcriber import (
+                compare_to_sequential, print_batch_comparison)
+            call_audio = benchmarks[1]
+            clips = [call_audio.process_audio(media_file)
+                     for media_file in Ollama.read_yaml(yaml_file_path)["media"]]
+            print_batch_comparison(compare_to_sequential(
+                call_audio.model, clips, args.batch_benchmark))
+            sys.exit(0)
+
+    if args.stream:
+        benchmarks.append(StreamingLatencyBenchmark())
+    if args.cold_start:
+        benchmarks.append(ColdStartBenchmark())
+
+    if args.sweep:
+        ImageSweepBenchmark = load_benchmark_class("ImageSweepBenchmark")
+        sweep = ImageSweepBenchmark(args.sweep_sizes, args.sweep_formats,
+                                    args.sweep_qualities, args.image_cache)
+        sweep_benchmark(yaml_file_path, sweep,
+                        None if args.no_results_db else ResultsStore(args.results_db),
+                        args.sweep_tolerance)
+    elif args.load:
+        load_benchmark(yaml_file_path, benchmarks, args.rates, args.arrival,
+                       args.step_duration, args.max_in_flight)
+    else:
+        results_store = None if args.no_results_db else ResultsStore(args.results_db)
+        residency = ResidencyPlanner(Ollama.preload_model) if args.residency else None
+        sampler = ResourceSampler(
+            args.ollama_pid, args.resource_interval) if args.resources else None
+        llava_benchmark(yaml_file_path, benchmarks, scheduler, pipeline, results_store,
+                        args.cold_start, residency, sampler, adaptive)
+
+    if host_pool is not None:
+        host_pool.print_report()
+    if args.replay:
+        Ollama.backend.print_overhead(time.perf_counter() - start)
+    if args.record:
+        Ollama.backend.close()
+        print(f"Recorded {Ollama.backend.recorded} responses to {args.record} 📼")
+    if args.trace:
+        tracer.print_summary()
+        tracer.export_chrome_trace(args.trace)
+        print(f"Trace written to {args.trace} ⏱️")
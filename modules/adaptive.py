@@ -0,0 +1,208 @@
+# Standard library imports.
+import dataclasses
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Local library imports.
+from benchmarks.eval_rate_benchmark.timing_metrics import TimingMetrics
+from .ollama import OllamaResult
+from .option_sweep import format_options
+from .scheduler import MEASURE, BenchmarkJob
+from .stats import relative_interval_width
+
+# Metrics a cell can converge on: every field of TimingMetrics.
+ADAPTIVE_METRICS = tuple(metric.name for metric in dataclasses.fields(TimingMetrics))
+
+
+@dataclass
+class CellSamples:
+    """
+    Measured samples of one (model, options, prompt, media) cell.
+
+    Attributes:
+        values (list): The target metric of each sample that reported it.
+        wall_times (list): Wall time of each sample in seconds.
+        converged (bool): Whether the interval reached the target width.
+    """
+    values: List[float] = field(default_factory=list)
+    wall_times: List[float] = field(default_factory=list)
+    converged: bool = False
+
+    @property
+    def samples(self) -> int:
+        """
+        Number of measured requests of the cell.
+        """
+        return len(self.wall_times)
+
+    @property
+    def seconds(self) -> float:
+        """
+        Wall time spent on the cell's measured requests.
+        """
+        return sum(self.wall_times)
+
+
+class AdaptiveSampler:
+    """
+    Repeats each benchmark cell until its target metric converges.
+
+    Each (model, options, prompt, media) cell is sampled at least
+    ``min_samples`` times, then until the t confidence interval of the mean
+    of the metric is narrower than ``relative_width`` of the mean, or until
+    the cell has used its budget of ``max_samples`` requests or
+    ``max_seconds`` of wall time. Jobs are expanded up to the budget and the
+    job function is wrapped so the repetitions of a finished cell are
+    skipped. With several workers, repetitions already in flight when a cell
+    converges still complete and are counted.
+
+    Attributes:
+        metric (str): The TimingMetrics field that has to converge.
+        relative_width (float): Target interval width relative to the mean.
+        confidence (float): Confidence level of the interval.
+        min_samples (int): Samples taken before checking convergence.
+        max_samples (int): Sample budget of each cell.
+        max_seconds (float): Wall time budget of each cell, or None.
+        cells (dict): CellSamples by cell, in matrix order.
+    """
+
+    def __init__(self, metric: str = "eval_rate", relative_width: float = 0.05,
+                 confidence: float = 0.95, min_samples: int = 3, max_samples: int = 20,
+                 max_seconds: Optional[float] = None):
+        """
+        Initialize AdaptiveSampler instance.
+
+        Args:
+            metric (str, optional): One of ADAPTIVE_METRICS. Defaults to eval_rate.
+            relative_width (float, optional): Target interval width relative
+                to the mean. Defaults to 0.05.
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+            min_samples (int, optional): Samples taken before checking
+                convergence, at least 2. Defaults to 3.
+            max_samples (int, optional): Sample budget of each cell, also
+                the N of the fixed-N run the savings are reported against.
+                Defaults to 20.
+            max_seconds (float, optional): Wall time budget of each cell.
+                Defaults to no limit.
+
+        Raises:
+            ValueError: If the metric is unknown or the limits are inconsistent.
+        """
+        if metric not in ADAPTIVE_METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {ADAPTIVE_METRICS}")
+        if relative_width <= 0:
+            raise ValueError("relative_width must be positive")
+        if not 2 <= min_samples <= max_samples:
+            raise ValueError("min_samples must be at least 2 and at most max_samples")
+        self.metric = metric
+        self.relative_width = relative_width
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.max_seconds = max_seconds
+        self.cells: Dict[Tuple, CellSamples] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cell(job: BenchmarkJob) -> Tuple:
+        """
+        The cell a job samples.
+
+        Args:
+            job (BenchmarkJob): The job.
+
+        Returns:
+            tuple: The model, options, prompt and media of the job.
+        """
+        return job.model, job.options, job.prompt, job.media
+
+    def is_done(self, job: BenchmarkJob) -> bool:
+        """
+        Whether the job's cell has converged or used its budget.
+
+        Args:
+            job (BenchmarkJob): The job.
+
+        Returns:
+            bool: True if more repetitions of the cell should be skipped.
+        """
+        with self._lock:
+            cell = self.cells.get(self.cell(job))
+            if cell is None:
+                return False
+            return (cell.converged or cell.samples >= self.max_samples
+                    or (self.max_seconds is not None and cell.seconds >= self.max_seconds))
+
+    def wrap(self, job_function: Callable) -> Callable:
+        """
+        Wrap a job function so repetitions of finished cells are skipped.
+
+        Args:
+            job_function (callable): Called with each job and any further
+                arguments.
+
+        Returns:
+            callable: A job function that returns None instead of calling
+            job_function for measured jobs of a finished cell.
+        """
+        def adaptive_job(job: BenchmarkJob, *args):
+            if job.phase == MEASURE and self.is_done(job):
+                return None
+            return job_function(job, *args)
+        return adaptive_job
+
+    def record_result(self, job: BenchmarkJob, result: OllamaResult) -> None:
+        """
+        Add a measured result to its cell and check whether the cell converged.
+
+        Args:
+            job (BenchmarkJob): The job that produced the result.
+            result (OllamaResult): The result of the request.
+        """
+        value = getattr(result.timing_metrics, self.metric)
+        with self._lock:
+            cell = self.cells.setdefault(self.cell(job), CellSamples())
+            cell.wall_times.append(result.wall_time)
+            if value is not None:
+                cell.values.append(value)
+            if len(cell.values) >= self.min_samples:
+                cell.converged = (relative_interval_width(cell.values, self.confidence)
+                                  <= self.relative_width)
+
+    def print_report(self) -> None:
+        """
+        Print the samples each cell needed and the time saved against
+        running every cell ``max_samples`` times.
+
+        The fixed-N time of a cell is estimated from the mean wall time of
+        its samples.
+        """
+        if not self.cells:
+            return
+        print(f"{'-' * 40}\nAdaptive sampling 🎯\n{'-' * 40}")
+        spent = fixed = 0.0
+        prompts = list(dict.fromkeys(prompt for _, _, prompt, _ in self.cells))
+        for (model, options, prompt, media), cell in self.cells.items():
+            width = relative_interval_width(cell.values, self.confidence)
+            status = "✅" if cell.converged else "⏳"
+            label = f"{model} {media} prompt {prompts.index(prompt) + 1}"
+            if options:
+                label += f" {format_options(options)}"
+            print(f"◽ {label}:\t{cell.samples} samples, ±{self._percent(width / 2)} "
+                  f"{self.metric}\t{status}")
+            spent += cell.seconds
+            fixed += cell.seconds / cell.samples * self.max_samples
+        samples = sum(cell.samples for cell in self.cells.values())
+        converged = sum(cell.converged for cell in self.cells.values())
+        print(f"\n◽ Converged cells:\t{converged}/{len(self.cells)} within "
+              f"±{self._percent(self.relative_width / 2)} at {self.confidence:.0%} "
+              f"confidence\t🎯")
+        print(f"◽ Samples:\t{samples} vs {self.max_samples * len(self.cells)} "
+              f"fixed ({self.max_samples}/cell)\t🔁")
+        print(f"◽ Time saved:\t{fixed - spent:.1f}s of {fixed:.1f}s fixed-N\t⏱️\n")
+
+    @staticmethod
+    def _percent(value: float) -> str:
+        return "-" if math.isinf(value) else f"{value:.1%}"
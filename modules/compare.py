@@ -0,0 +1,178 @@
+# Standard library imports.
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Local library imports.
+from .results_store import ResultsStore
+from .stats import bootstrap_relative_difference, permutation_test
+
+
+# Metrics compared by default, and whether a higher value is better.
+COMPARED_METRICS = {
+    "eval_rate": True,
+    "prompt_eval_rate": True,
+    "total_duration": False,
+    "load_duration": False,
+    "prompt_eval_duration": False,
+    "eval_duration": False,
+    "wall_time": False,
+}
+
+
+@dataclass
+class MetricComparison:
+    """
+    Comparison of one metric of one model between two runs.
+
+    Attributes:
+        model (str): The model name.
+        metric (str): The metric name.
+        baseline_mean (float): Mean of the metric in the baseline run.
+        candidate_mean (float): Mean of the metric in the candidate run.
+        delta (float): Relative change of the mean, candidate vs baseline.
+        ci (tuple): Bootstrap confidence interval of the relative change.
+        p_value (float): Permutation test p-value of the difference in means.
+        samples (tuple): Number of baseline and candidate samples.
+        higher_is_better (bool): Whether an increase is an improvement.
+    """
+    model: str
+    metric: str
+    baseline_mean: float
+    candidate_mean: float
+    delta: float
+    ci: Tuple[float, float]
+    p_value: float
+    samples: Tuple[int, int]
+    higher_is_better: bool
+
+    @property
+    def slowdown(self) -> float:
+        """
+        The relative change in the direction that makes things worse.
+        """
+        return -self.delta if self.higher_is_better else self.delta
+
+    def is_regression(self, threshold: float, alpha: float) -> bool:
+        """
+        Check whether the change is a statistically significant regression.
+
+        Args:
+            threshold (float): Smallest relative slowdown counted, e.g. 0.05.
+            alpha (float): Significance level of the permutation test.
+
+        Returns:
+            bool: True if the metric got worse by more than the threshold
+            and the difference is significant.
+        """
+        return self.slowdown > threshold and self.p_value < alpha
+
+
+def resolve_run_id(store: ResultsStore, run: str) -> str:
+    """
+    Resolve a run reference to a run identifier.
+
+    Args:
+        store (ResultsStore): The results store.
+        run (str): A run identifier, a unique prefix of one, or ``latest``
+            / ``previous`` for the last and second to last recorded runs.
+
+    Returns:
+        str: The run identifier.
+
+    Raises:
+        ValueError: If the reference matches no run or more than one.
+    """
+    run_ids = [row["run_id"] for row in store.runs()]
+    if run in ("latest", "previous"):
+        position = -1 if run == "latest" else -2
+        if len(run_ids) < -position:
+            raise ValueError(f"Not enough recorded runs to resolve {run!r}")
+        return run_ids[position]
+
+    matches = [run_id for run_id in run_ids if run_id.startswith(run)]
+    if len(matches) != 1:
+        raise ValueError(f"Run {run!r} matches {len(matches)} recorded runs")
+    return matches[0]
+
+
+def _samples(store: ResultsStore, run_id: str, metric: str) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {}
+    for row in store.query(run_id=run_id, metric=metric):
+        samples.setdefault(row["model"], []).append(row[metric])
+    return samples
+
+
+def compare_runs(store: ResultsStore, baseline: str, candidate: str,
+                 metrics: Optional[Dict[str, bool]] = None,
+                 confidence: float = 0.95) -> List[MetricComparison]:
+    """
+    Compare every metric of every model present in two runs.
+
+    Args:
+        store (ResultsStore): The results store holding both runs.
+        baseline (str): Reference to the baseline run.
+        candidate (str): Reference to the candidate run.
+        metrics (dict, optional): Metric names mapped to whether higher is
+            better. Defaults to COMPARED_METRICS.
+        confidence (float, optional): Confidence level of the intervals.
+
+    Returns:
+        list: A MetricComparison per model and metric with samples in both runs.
+    """
+    baseline_id = resolve_run_id(store, baseline)
+    candidate_id = resolve_run_id(store, candidate)
+    comparisons = []
+    for metric, higher_is_better in (metrics or COMPARED_METRICS).items():
+        baseline_samples = _samples(store, baseline_id, metric)
+        candidate_samples = _samples(store, candidate_id, metric)
+        for model in sorted(baseline_samples.keys() & candidate_samples.keys()):
+            before, after = baseline_samples[model], candidate_samples[model]
+            baseline_mean = statistics.fmean(before)
+            candidate_mean = statistics.fmean(after)
+            comparisons.append(MetricComparison(
+                model=model,
+                metric=metric,
+                baseline_mean=baseline_mean,
+                candidate_mean=candidate_mean,
+                delta=(candidate_mean - baseline_mean) / baseline_mean if baseline_mean else 0.0,
+                ci=bootstrap_relative_difference(before, after, confidence),
+                p_value=permutation_test(before, after),
+                samples=(len(before), len(after)),
+                higher_is_better=higher_is_better,
+            ))
+    return comparisons
+
+
+def print_comparison(comparisons: List[MetricComparison], threshold: float,
+                     alpha: float) -> List[MetricComparison]:
+    """
+    Print the comparison table and return the regressions.
+
+    Args:
+        comparisons (list): MetricComparison objects from compare_runs().
+        threshold (float): Smallest relative slowdown counted as a regression.
+        alpha (float): Significance level of the permutation test.
+
+    Returns:
+        list: The comparisons that are regressions.
+    """
+    regressions = [c for c in comparisons if c.is_regression(threshold, alpha)]
+    for model in sorted({c.model for c in comparisons}):
+        print(f"{'=' * 40}\n🦙  COMPARE: {model} 🦙\n{'=' * 40}")
+        print(f"{'metric':<21}{'baseline':>10}{'candidate':>11}{'delta':>9}"
+              f"{'95% CI':>19}{'p':>7}")
+        for c in comparisons:
+            if c.model != model:
+                continue
+            flag = "  ❌" if c in regressions else ""
+            print(f"{c.metric:<21}{c.baseline_mean:>10.3f}{c.candidate_mean:>11.3f}"
+                  f"{c.delta:>+9.1%}   [{c.ci[0]:+.1%}, {c.ci[1]:+.1%}]"
+                  f"{c.p_value:>7.3f}{flag}")
+        print()
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {threshold:.0%} at p < {alpha} 📉\n")
+    else:
+        print(f"No regressions above {threshold:.0%} at p < {alpha} ✅\n")
+    return regressions
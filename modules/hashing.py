@@ -0,0 +1,22 @@
+# Standard library imports.
+import hashlib
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Hash the contents of a file, reading it in 1 MB blocks.
+
+    Used to key the on-disk caches by content, so a renamed or moved file
+    still hits and an edited one misses.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hex SHA-256 digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as media_file:
+        for block in iter(lambda: media_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,281 @@
+# Standard library imports.
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# Local library imports.
+from .ollama import (
+    DEFAULT_TIMEOUT, ModelInfo, OllamaBackend, OllamaError, OllamaHTTPBackend, OllamaResult,
+    normalize_host, normalize_model_name)
+
+
+@dataclass
+class HostStats:
+    """
+    Requests served by one host of a pool.
+
+    Attributes:
+        host (str): Address of the Ollama server.
+        healthy (bool): Whether the host is in rotation.
+        requests (int): Requests the host completed.
+        errors (int): Requests that failed on the host.
+        tokens (int): Tokens the host generated.
+        eval_seconds (float): Seconds the host spent generating them.
+        wall_seconds (float): Sum of the wall times of its requests.
+    """
+    host: str
+    healthy: bool = True
+    requests: int = 0
+    errors: int = 0
+    tokens: int = 0
+    eval_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def eval_rate(self) -> Optional[float]:
+        """
+        Generated tokens per second of generation, or None before any.
+        """
+        return self.tokens / self.eval_seconds if self.eval_seconds else None
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """
+        Mean wall time of the host's requests, or None before any.
+        """
+        return self.wall_seconds / self.requests if self.requests else None
+
+
+class HostPool(OllamaBackend):
+    """
+    Backend that spreads requests over several Ollama servers.
+
+    Each request goes to the healthy host with the fewest requests in
+    flight among the hosts that have its model installed. A host that
+    fails a request and then fails a health check is taken out of rotation
+    and the request is retried on another host. Hosts out of rotation are
+    checked again after ``retry_interval`` seconds. Every result is tagged
+    with the host that served it.
+
+    Attributes:
+        backends (dict): OllamaHTTPBackend of each host, by address.
+        retry_interval (float): Seconds before an unhealthy host is checked again.
+        stats (dict): HostStats of each host, by address.
+    """
+    name = "pool"
+
+    def __init__(self, hosts: Sequence[str], timeout: float = DEFAULT_TIMEOUT,
+                 pool_maxsize: int = 10, stream: bool = False, retry_interval: float = 30.0):
+        """
+        Initialize HostPool instance.
+
+        Args:
+            hosts (sequence): Ollama server addresses.
+            timeout (float, optional): Seconds to wait for each request.
+            pool_maxsize (int, optional): Keep-alive connections kept open to
+                each host.
+            stream (bool, optional): Stream generate responses and timestamp
+                every chunk. Defaults to False.
+            retry_interval (float, optional): Seconds before an unhealthy
+                host is checked again.
+
+        Raises:
+            ValueError: If no host is given.
+        """
+        if not hosts:
+            raise ValueError("A host pool needs at least one host")
+        self.backends = {}
+        for host in hosts:
+            host = normalize_host(host)
+            self.backends[host] = OllamaHTTPBackend(host, timeout, pool_maxsize, stream)
+        self.retry_interval = retry_interval
+        self.stats = {host: HostStats(host) for host in self.backends}
+        self._outstanding = {host: 0 for host in self.backends}
+        self._retry_at = {host: 0.0 for host in self.backends}
+        self._inventories: Dict[str, Dict[str, ModelInfo]] = {host: {} for host in self.backends}
+        self._lock = threading.Lock()
+        self._started = None
+        self._finished = None
+
+    def check_health(self, host: str) -> bool:
+        """
+        Check one host and put it in or out of rotation.
+
+        Args:
+            host (str): Address of the host.
+
+        Returns:
+            bool: Whether the host is healthy.
+        """
+        try:
+            inventory = self.backends[host].inventory()
+        except OllamaError as error:
+            self._take_out(host, error)
+            return False
+        with self._lock:
+            if not self.stats[host].healthy:
+                print(f"◽ {host} back in rotation\t✅")
+            self.stats[host].healthy = True
+            self._inventories[host] = inventory
+        return True
+
+    def _take_out(self, host: str, error: Exception) -> None:
+        with self._lock:
+            if self.stats[host].healthy:
+                print(f"◽ {host} out of rotation: {error}\t⚠️")
+            self.stats[host].healthy = False
+            self._retry_at[host] = time.monotonic() + self.retry_interval
+
+    def healthy_hosts(self) -> List[str]:
+        """
+        The hosts in rotation, checking hosts whose retry interval has passed.
+
+        Returns:
+            list: Addresses of the healthy hosts.
+        """
+        now = time.monotonic()
+        for host, stats in self.stats.items():
+            if not stats.healthy and now >= self._retry_at[host]:
+                self.check_health(host)
+        return [host for host, stats in self.stats.items() if stats.healthy]
+
+    def _acquire(self, model: str, tried: set) -> Optional[str]:
+        """
+        Pick the least loaded healthy host with the model and count it in flight.
+        """
+        model = normalize_model_name(model)
+        candidates = [host for host in self.healthy_hosts()
+                      if host not in tried and model in self._inventories[host]]
+        with self._lock:
+            if not candidates:
+                return None
+            # Ties go to the host that has served fewer requests.
+            host = min(candidates, key=lambda host: (
+                self._outstanding[host], self.stats[host].requests))
+            self._outstanding[host] += 1
+            if self._started is None:
+                self._started = time.perf_counter()
+            return host
+
+    def _release(self, host: str, result: Optional[OllamaResult]) -> None:
+        with self._lock:
+            self._outstanding[host] -= 1
+            self._finished = time.perf_counter()
+            stats = self.stats[host]
+            if result is None:
+                stats.errors += 1
+                return
+            metrics = result.timing_metrics
+            stats.requests += 1
+            stats.wall_seconds += result.wall_time
+            if metrics.eval_count and metrics.eval_duration:
+                stats.tokens += metrics.eval_count
+                stats.eval_seconds += metrics.eval_duration
+
+    def is_available(self) -> bool:
+        for host in self.backends:
+            self.check_health(host)
+        return bool(self.healthy_hosts())
+
+    def list_models(self) -> List[str]:
+        return list(self.inventory())
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        models = {}
+        for host in self.healthy_hosts():
+            self.check_health(host)
+            for name, info in self._inventories[host].items():
+                models.setdefault(name, info)
+        return models
+
+    def version(self) -> Optional[str]:
+        versions = set()
+        for host in self.healthy_hosts():
+            versions.add(self.backends[host].version())
+        versions.discard(None)
+        return ", ".join(sorted(versions)) or None
+
+    def model_digest(self, model: str) -> Optional[str]:
+        info = self.inventory().get(normalize_model_name(model))
+        return info.digest if info else None
+
+    def _hosts_with(self, model: str) -> List[str]:
+        model = normalize_model_name(model)
+        return [host for host in self.healthy_hosts() if model in self._inventories[host]]
+
+    def unload(self, model: str) -> None:
+        for host in self._hosts_with(model):
+            self.backends[host].unload(model)
+
+    def preload(self, model: str) -> Optional[OllamaResult]:
+        # The model loads on every host that has it, so the load durations add up.
+        load_duration = 0
+        wall_time = 0.0
+        for host in self._hosts_with(model):
+            result = self.backends[host].preload(model)
+            load_duration += result.metrics.get("load_duration", 0)
+            wall_time += result.wall_time
+        return OllamaResult(model=normalize_model_name(model), response="",
+                            metrics={"load_duration": load_duration},
+                            wall_time=wall_time, backend=self.name)
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        tried = set()
+        while True:
+            host = self._acquire(model, tried)
+            if host is None:
+                raise OllamaError(f"No healthy host in the pool has {model} installed")
+            tried.add(host)
+            try:
+                result = self.backends[host].run(model, prompt, media_file_path, options)
+            except OllamaError as error:
+                self._release(host, None)
+                # A failed request only takes the host out if the host is down;
+                # otherwise the request itself is at fault and is not retried.
+                if self.check_health(host):
+                    raise
+                print(f"◽ Retrying {model} on another host after: {error}\t🔁")
+                continue
+            self._release(host, result)
+            return result
+
+    def close(self) -> None:
+        for backend in self.backends.values():
+            backend.close()
+
+    def print_report(self) -> None:
+        """
+        Print the requests, throughput and latency of each host and of the pool.
+
+        Throughput is tokens generated per second of the whole run, so the
+        hosts' throughputs add up to the pool's. Eval rate is tokens per
+        second of generation, which shows slow hosts whatever their share of
+        the requests.
+        """
+        if self._started is None:
+            return
+        elapsed = max(self._finished - self._started, 1e-9)
+        print(f"{'-' * 40}\nHost pool 🖧\n{'-' * 40}")
+        print(f"{'host':<28}{'requests':>9}{'errors':>8}{'tokens/s':>10}"
+              f"{'eval rate':>11}{'latency':>9}")
+        total = HostStats("all hosts")
+        for stats in self.stats.values():
+            self._print_row(stats, elapsed)
+            total.requests += stats.requests
+            total.errors += stats.errors
+            total.tokens += stats.tokens
+            total.eval_seconds += stats.eval_seconds
+            total.wall_seconds += stats.wall_seconds
+        self._print_row(total, elapsed)
+        print(f"\n◽ Pool throughput:\t{total.requests / elapsed:.2f} requests/s, "
+              f"{total.tokens / elapsed:.2f} tokens/s over {elapsed:.1f}s\t📈\n")
+
+    @staticmethod
+    def _print_row(stats: HostStats, elapsed: float) -> None:
+        eval_rate = f"{stats.eval_rate:.2f}" if stats.eval_rate is not None else "-"
+        latency = f"{stats.mean_latency:.3f}" if stats.mean_latency is not None else "-"
+        marker = "" if stats.healthy else "  ⚠️"
+        print(f"{stats.host:<28}{stats.requests:>9}{stats.errors:>8}"
+              f"{stats.tokens / elapsed:>10.2f}{eval_rate:>11}{latency:>9}{marker}")
@@ -0,0 +1,211 @@
+# Standard library imports.
+import base64
+import hashlib
+import json
+import os
+import statistics
+import threading
+from typing import Dict, Optional
+
+# Third party imports.
+from PIL import Image
+
+# Local library imports.
+from .hashing import file_hash
+from .ollama import register_encoded_image
+
+# Default location of the on-disk preprocessed image cache.
+DEFAULT_IMAGE_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "llava-benchmark", "images")
+
+# Pillow format names and file extensions of the supported output formats.
+IMAGE_FORMATS = {"jpeg": ("JPEG", ".jpg"), "png": ("PNG", ".png"), "webp": ("WEBP", ".webp")}
+
+
+def base64_size(byte_count: int) -> int:
+    """
+    Calculate the length of the base64 encoding of some bytes.
+
+    Args:
+        byte_count (int): Number of raw bytes.
+
+    Returns:
+        int: Number of base64 characters, including padding.
+    """
+    return 4 * ((byte_count + 2) // 3)
+
+
+class ImageCache:
+    """
+    A content-addressed on-disk cache of downsized, re-encoded images.
+
+    Each image is resized so its longest edge is at most ``max_edge`` pixels
+    and re-encoded in ``image_format``. The result is stored next to a
+    ``.b64`` sidecar holding its base64 encoding, which is handed to the
+    http backend so it is read instead of encoding the image on every
+    request.
+    Entries are keyed by the SHA-256 of the original image and the
+    preprocessing parameters, so changing either misses.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+        max_edge (int): Longest edge of the preprocessed images in pixels,
+            or None to keep the original size.
+        image_format (str): Output format, one of IMAGE_FORMATS.
+        quality (int): Encoder quality for lossy formats.
+        hits (int): Number of images served from the cache.
+        misses (int): Number of images that had to be preprocessed.
+        raw_bytes (int): Base64 bytes the original images would have sent.
+        sent_bytes (int): Base64 bytes of the preprocessed images sent.
+        requests (int): Number of images prepared for requests.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_IMAGE_CACHE_DIR, max_edge: Optional[int] = 1024,
+                 image_format: str = "jpeg", quality: int = 90):
+        """
+        Initialize ImageCache instance.
+
+        Args:
+            cache_dir (str, optional): Directory for the cache entries.
+            max_edge (int, optional): Longest edge in pixels. Defaults to 1024.
+            image_format (str, optional): ``jpeg``, ``png`` or ``webp``.
+            quality (int, optional): Encoder quality for lossy formats.
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(
+                f"Unknown image format {image_format!r}, expected one of {sorted(IMAGE_FORMATS)}")
+        self.cache_dir = cache_dir
+        self.max_edge = max_edge
+        self.image_format = image_format
+        self.quality = quality
+        self.hits = 0
+        self.misses = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def params(self) -> Dict:
+        """
+        The preprocessing parameters, as recorded with each result.
+        """
+        return {"image_max_edge": self.max_edge, "image_format": self.image_format,
+                "image_quality": self.quality}
+
+    def key(self, content_hash: str) -> str:
+        """
+        Build the cache key for an image.
+
+        Args:
+            content_hash (str): The original image content hash.
+
+        Returns:
+            str: The hex cache key.
+        """
+        material = json.dumps([content_hash, self.params], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def preprocess(self, image_path: str, output_path: str) -> None:
+        """
+        Downsize and re-encode an image.
+
+        Args:
+            image_path (str): The path to the original image.
+            output_path (str): Where to write the preprocessed image.
+        """
+        pillow_format, _ = IMAGE_FORMATS[self.image_format]
+        with Image.open(image_path) as image:
+            if self.max_edge and max(image.size) > self.max_edge:
+                image.thumbnail((self.max_edge, self.max_edge), Image.Resampling.LANCZOS)
+            if pillow_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(output_path, pillow_format, quality=self.quality)
+
+    def prepare(self, image_path: str) -> str:
+        """
+        Get the preprocessed version of an image, creating it on a miss.
+
+        Args:
+            image_path (str): The path to the original image.
+
+        Returns:
+            str: The path to the preprocessed image. Its base64 encoding is
+            stored alongside it with a ``.b64`` suffix.
+        """
+        _, extension = IMAGE_FORMATS[self.image_format]
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        key = self.key(file_hash(image_path))
+        output_path = os.path.join(self.cache_dir, f"{stem}-{key[:16]}{extension}")
+        sidecar_path = output_path + ".b64"
+
+        with self._lock:
+            hit = os.path.exists(sidecar_path)
+            if not hit:
+                temporary_path = output_path + ".tmp" + extension
+                self.preprocess(image_path, temporary_path)
+                with open(temporary_path, "rb") as image_file:
+                    encoded = base64.b64encode(image_file.read())
+                with open(sidecar_path + ".tmp", "wb") as sidecar_file:
+                    sidecar_file.write(encoded)
+                os.replace(temporary_path, output_path)
+                os.replace(sidecar_path + ".tmp", sidecar_path)
+
+            self.hits += hit
+            self.misses += not hit
+            self.requests += 1
+            self.raw_bytes += base64_size(os.path.getsize(image_path))
+            self.sent_bytes += os.path.getsize(sidecar_path)
+        register_encoded_image(output_path, sidecar_path)
+        return output_path
+
+    def print_stats(self) -> None:
+        """
+        Print the hit/miss counts and the bytes sent per request.
+        """
+        if not self.requests:
+            return
+        raw, sent = self.raw_bytes / self.requests, self.sent_bytes / self.requests
+        print(f"◽ Image cache:\t{self.hits} hits, {self.misses} misses, "
+              f"{sent / 1024:.1f}KB/request sent vs {raw / 1024:.1f}KB raw "
+              f"({1 - sent / raw:.0%} less)\t🖼️\n")
+
+    @staticmethod
+    def prompt_eval_saved(results_store, run_id: str) -> Dict[str, float]:
+        """
+        Compare prompt evaluation time with the latest run of raw images.
+
+        Args:
+            results_store (ResultsStore): The store holding both runs.
+            run_id (str): The run sent with preprocessed images.
+
+        Returns:
+            dict: Mapping of model names to the mean prompt_eval_duration
+            saved per request in seconds, for models with an earlier run
+            that sent the original images.
+        """
+        current: Dict[str, list] = {}
+        media: Dict[str, set] = {}
+        for row in results_store.query(run_id=run_id, metric="prompt_eval_duration"):
+            current.setdefault(row["model"], []).append(row["prompt_eval_duration"])
+            media.setdefault(row["model"], set()).add(row["media"])
+
+        # Earlier runs of the same model and media without preprocessing,
+        # keyed by run in the order they were recorded.
+        raw_runs: Dict[str, Dict[str, list]] = {}
+        for row in results_store.query():
+            if (row["run_id"] == run_id or row["prompt_eval_duration"] is None
+                    or row["media"] not in media.get(row["model"], ())):
+                continue
+            extra = json.loads(row["extra"]) if row["extra"] else {}
+            if "image_max_edge" not in extra:
+                runs = raw_runs.setdefault(row["model"], {})
+                runs.setdefault(row["run_id"], []).append(row["prompt_eval_duration"])
+
+        saved = {}
+        for model, durations in current.items():
+            if raw_runs.get(model):
+                baseline = list(raw_runs[model].values())[-1]
+                saved[model] = statistics.fmean(baseline) - statistics.fmean(durations)
+        return saved
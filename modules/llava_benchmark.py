@@ -2,10 +2,8 @@
 from typing import List
 
 # Local library imports.
-from benchmarks.eval_rate_benchmark import EvalRateBenchmark
-from benchmarks.license_plate_benchmark import LicensePlateBenchmark
-from benchmarks.call_audio_benchmark import CallAudioBenchmark
-
+from benchmarks import is_benchmark
+from .tracing import tracer
 
 
 class LlavaBenchmark:
@@ -25,6 +23,22 @@ class LlavaBenchmark:
         """
         self.benchmarks = benchmarks
 
+    def prepare_run(self, media_files: List[str]) -> None:
+        """
+        Prepare every media file of a run before its jobs are processed.
+
+        Call audio benchmarks with a Whisper batch size transcribe all the
+        files together here, so process_media() answers from memory.
+
+        Args:
+            media_files (list): Media file names of the run.
+        """
+        for benchmark in self.benchmarks:
+            if is_benchmark(benchmark, "CallAudioBenchmark") and \
+                    benchmark.batch_transcriber is not None:
+                with tracer.span("media.transcribe_batch", files=len(media_files)):
+                    benchmark.transcribe_files(media_files)
+
     def process_media(self, media_file: str) -> tuple:
         """
         Process media file and return relevant information.
@@ -36,43 +50,109 @@ class LlavaBenchmark:
             tuple: A tuple containing transcript (str) and media file path (str).
         """
         for benchmark in self.benchmarks:
-            if isinstance(benchmark, EvalRateBenchmark):
+            if is_benchmark(benchmark, "EvalRateBenchmark"):
                 pass  # No media to process for EvalRateBenchmark.
-            elif isinstance(benchmark, LicensePlateBenchmark):
+            elif is_benchmark(benchmark, "LicensePlateBenchmark"):
                 _transcript = ""  # Dummy transcript object.
-                media_file_path = benchmark.media_file_path(media_file)
+                with tracer.span("media.prepare_image", media=media_file):
+                    media_file_path = benchmark.prepare_image(media_file)
                 return _transcript, media_file_path
-            elif isinstance(benchmark, CallAudioBenchmark):
-                processed_audio = benchmark.process_audio(media_file)
-                transcript = benchmark.transcribe_audio(processed_audio)
+            elif is_benchmark(benchmark, "CallAudioBenchmark"):
+                with tracer.span("media.transcribe", media=media_file):
+                    transcript = benchmark.transcribe_file(media_file)
                 media_file_path = benchmark.media_file_path(media_file)
                 return transcript, media_file_path
 
-    def store_results(self, benchmark_result: str, model: str, media_file_path: str) -> None:
+    def store_results(self, benchmark_result, model: str, media_file_path: str,
+                      transcript: str = None) -> None:
         """
         Store the benchmark results.
 
         Args:
-            benchmark_result (subprocess.CompletedProcess): Result of the subprocess.run call.
+            benchmark_result (OllamaResult): Result of the Ollama request.
             model (str): The name of the model to use.
             media_file_path (str): The media file path.
+            transcript (str, optional): The transcript the request was made
+                with. Needed when jobs run concurrently, since the benchmark's
+                current transcript may already belong to another media file.
+        """
+        for benchmark in self.benchmarks:
+            with tracer.span(f"store.{type(benchmark).__name__}", model=model):
+                self._store_result(benchmark, benchmark_result, model, media_file_path,
+                                   transcript)
+
+    @staticmethod
+    def _store_result(benchmark, benchmark_result, model: str, media_file_path: str,
+                      transcript: str = None) -> None:
+        """
+        Store the benchmark results in one benchmark.
+        """
+        if is_benchmark(benchmark, "EvalRateBenchmark"):
+            benchmark.process_eval_rate(benchmark_result)
+            benchmark.store_eval_rate(media_file_path)
+        elif is_benchmark(benchmark, "LicensePlateBenchmark"):
+            benchmark.store_license_plate(model, benchmark_result, media_file_path)
+        elif is_benchmark(benchmark, "CallAudioBenchmark"):
+            if transcript is not None:
+                benchmark.current_transcript = transcript
+            benchmark.store_transcript(model)
+            benchmark.store_call_notes(model, benchmark_result)
+            benchmark.print_call_notes()
+        elif is_benchmark(benchmark, "StreamingLatencyBenchmark"):
+            benchmark.store_latency(model, benchmark_result)
+        elif is_benchmark(benchmark, "ColdStartBenchmark"):
+            benchmark.store_timing(model, benchmark_result)
+
+    def store_cold_start(self, benchmark_result, model: str) -> None:
+        """
+        Store the result of a request sent to a freshly evicted model.
+
+        Cold-start results are kept out of the per-media results, so they
+        are only passed to benchmarks that report model load separately.
+
+        Args:
+            benchmark_result (OllamaResult): Result of the Ollama request.
+            model (str): The name of the model.
         """
         for benchmark in self.benchmarks:
-            if isinstance(benchmark, EvalRateBenchmark):
-                benchmark.process_eval_rate(benchmark_result)
-                benchmark.store_eval_rate(media_file_path)
-            elif isinstance(benchmark, LicensePlateBenchmark):
-                benchmark.store_license_plate(model, benchmark_result)
-            elif isinstance(benchmark, CallAudioBenchmark):
-                benchmark.store_transcript(model)
-                benchmark.store_call_notes(model, benchmark_result)
-                benchmark.print_call_notes()
+            if is_benchmark(benchmark, "ColdStartBenchmark"):
+                benchmark.store_cold_start(model, benchmark_result)
+
+    def report_run(self) -> None:
+        """
+        Report on all models once every result of the run is stored.
+        """
+        for benchmark in self.benchmarks:
+            if is_benchmark(benchmark, "LicensePlateBenchmark"):
+                with tracer.span("report.LicensePlateBenchmark"):
+                    benchmark.print_accuracy_report()
 
     def average_and_plot_benchmarks(self) -> None:
         """
         Calculate the average evaluation rates and plot them.
         """
         for benchmark in self.benchmarks:
-            if isinstance(benchmark, EvalRateBenchmark):
-                benchmark.average_rate()
-                benchmark.eval_rate_plotter.plot(benchmark.eval_rates)
+            with tracer.span(f"average.{type(benchmark).__name__}"):
+                self._average_and_plot(benchmark)
+
+    @staticmethod
+    def _average_and_plot(benchmark) -> None:
+        """
+        Calculate and plot the averages of one benchmark.
+        """
+        if is_benchmark(benchmark, "EvalRateBenchmark"):
+            benchmark.average_rate()
+            benchmark.average_metrics()
+            benchmark.eval_rate_plotter.plot(benchmark.eval_rates)
+        elif is_benchmark(benchmark, "StreamingLatencyBenchmark"):
+            benchmark.average_latency()
+        elif is_benchmark(benchmark, "ColdStartBenchmark"):
+            benchmark.cold_vs_warm()
+        elif is_benchmark(benchmark, "CallAudioBenchmark"):
+            if benchmark.transcript_cache is not None:
+                benchmark.transcript_cache.print_stats()
+            if benchmark.audio_cache is not None:
+                benchmark.audio_cache.print_stats()
+        elif is_benchmark(benchmark, "LicensePlateBenchmark"):
+            if benchmark.image_cache is not None:
+                benchmark.image_cache.print_stats()
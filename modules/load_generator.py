@@ -0,0 +1,257 @@
+# Standard library imports.
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+# Third party imports.
+import asciichartpy
+
+# Local library imports.
+from .ollama import OllamaTimeoutError
+from .stats import percentile
+
+
+# Arrival processes accepted by LoadGenerator.
+ARRIVALS = ("constant", "poisson")
+
+
+@dataclass
+class LoadStepResult:
+    """
+    Outcome of one load step at a fixed target arrival rate.
+
+    Attributes:
+        rate (float): Target arrival rate in requests/s.
+        sent (int): Number of requests sent during the step.
+        errors (int): Number of requests that failed.
+        timeouts (int): Number of requests that timed out.
+        duration (float): Seconds from the first arrival to the last
+            completion, or the step duration if that is longer.
+        latencies (list): End-to-end latency in seconds of each completed
+            request, measured from its scheduled arrival time.
+    """
+    rate: float
+    sent: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    duration: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Achieved throughput in completed requests/s.
+        """
+        return self.completed / self.duration if self.duration else 0.0
+
+    def latency_percentile(self, p: float) -> Optional[float]:
+        return percentile(self.latencies, p)
+
+
+class LoadGenerator:
+    """
+    Open-loop load generator that sends requests at a target arrival rate.
+
+    Unlike the closed-loop benchmark, a request is sent at its scheduled
+    arrival time whether or not earlier requests have finished. Latency is
+    measured from the scheduled arrival, so time spent waiting for a free
+    client thread counts against the server instead of being hidden.
+
+    Attributes:
+        request_function (callable): Sends one request. Called with the
+            items of ``requests`` as positional arguments.
+        requests (list): Argument tuples cycled through for each arrival.
+        arrival (str): ``constant`` or ``poisson`` inter-arrival times.
+        step_duration (float): Seconds to send requests for at each rate.
+        max_in_flight (int): Maximum number of client threads.
+    """
+
+    def __init__(self, request_function: Callable, requests: Sequence[tuple],
+                 arrival: str = "constant", step_duration: float = 30.0,
+                 max_in_flight: int = 256, seed: Optional[int] = None):
+        """
+        Initialize LoadGenerator instance.
+
+        Args:
+            request_function (callable): Sends one request.
+            requests (sequence): Argument tuples for request_function.
+            arrival (str, optional): Arrival process. Defaults to constant.
+            step_duration (float, optional): Seconds per rate step.
+            max_in_flight (int, optional): Maximum number of client threads.
+            seed (int, optional): Seed for Poisson inter-arrival times.
+        """
+        if arrival not in ARRIVALS:
+            raise ValueError(f"arrival must be one of {ARRIVALS}, got {arrival!r}")
+        if not requests:
+            raise ValueError("at least one request is required")
+        self.request_function = request_function
+        self.requests = list(requests)
+        self.arrival = arrival
+        self.step_duration = step_duration
+        self.max_in_flight = max_in_flight
+        self.random = random.Random(seed)
+
+    def arrival_times(self, rate: float) -> List[float]:
+        """
+        Schedule arrivals for one step.
+
+        Args:
+            rate (float): Target arrival rate in requests/s.
+
+        Returns:
+            list: Arrival offsets in seconds from the start of the step.
+
+        Raises:
+            ValueError: If the rate is not positive.
+        """
+        if not rate > 0:
+            raise ValueError(f"arrival rate must be positive, got {rate}")
+        times = []
+        offset = 0.0
+        while True:
+            if self.arrival == "poisson":
+                offset += self.random.expovariate(rate)
+            else:
+                offset = len(times) / rate
+            if offset >= self.step_duration:
+                return times
+            times.append(offset)
+
+    def run_step(self, rate: float) -> LoadStepResult:
+        """
+        Send requests at the given rate for one step and wait for them.
+
+        Args:
+            rate (float): Target arrival rate in requests/s.
+
+        Returns:
+            LoadStepResult: Latency and error counts for the step.
+        """
+        result = LoadStepResult(rate=rate)
+        lock = threading.Lock()
+        requests = itertools.cycle(self.requests)
+        last_completion = [0.0]
+
+        def send(scheduled: float, arguments: tuple) -> None:
+            try:
+                self.request_function(*arguments)
+            except OllamaTimeoutError:
+                with lock:
+                    result.timeouts += 1
+            except Exception:
+                with lock:
+                    result.errors += 1
+            else:
+                finished = time.perf_counter()
+                with lock:
+                    result.latencies.append(finished - scheduled)
+                    last_completion[0] = max(last_completion[0], finished)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for offset in self.arrival_times(rate):
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(send, scheduled, next(requests))
+                result.sent += 1
+        result.duration = max(last_completion[0] - start, self.step_duration)
+        return result
+
+    def run(self, rates: Sequence[float]) -> List[LoadStepResult]:
+        """
+        Run one load step per rate, stepping the arrival rate up.
+
+        Args:
+            rates (sequence): Target arrival rates in requests/s.
+
+        Returns:
+            list: One LoadStepResult per rate.
+        """
+        results = []
+        for rate in rates:
+            step = self.run_step(rate)
+            self.print_step(step)
+            results.append(step)
+        return results
+
+    @staticmethod
+    def print_step(step: LoadStepResult) -> None:
+        """
+        Print the latency percentiles and counts for one step.
+
+        Args:
+            step (LoadStepResult): The step to print.
+        """
+        def ms(p):
+            value = step.latency_percentile(p)
+            return f"{value * 1000:.0f}ms" if value is not None else "-"
+
+        print(f"◽ Rate:\t{step.rate:g} req/s\t⏱️")
+        print(f"  achieved {step.throughput:.2f} req/s, sent {step.sent}, "
+              f"errors {step.errors}, timeouts {step.timeouts}")
+        print(f"  p50 {ms(50)}  p95 {ms(95)}  p99 {ms(99)}\n")
+
+    @staticmethod
+    def saturation_rate(results: List[LoadStepResult], tolerance: float = 0.9) -> Optional[float]:
+        """
+        Find the first rate at which the server stops keeping up.
+
+        A step is saturated when its achieved throughput falls below
+        ``tolerance`` times the target rate, or when any request failed or
+        timed out.
+
+        Args:
+            results (list): LoadStepResult objects in increasing rate order.
+            tolerance (float, optional): Fraction of the target rate that
+                must be achieved.
+
+        Returns:
+            float: The first saturated rate, or None if every step kept up.
+        """
+        for step in results:
+            if step.errors or step.timeouts or step.throughput < tolerance * step.rate:
+                return step.rate
+        return None
+
+    @staticmethod
+    def plot(results: List[LoadStepResult]) -> None:
+        """
+        Print the saturation curve: p99 latency and throughput per rate step.
+
+        Args:
+            results (list): LoadStepResult objects in increasing rate order.
+        """
+        print(f"{'-' * 40}\nSaturation curve 📊\n{'-' * 40}")
+        print(f"{'rate':>8} {'achieved':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>4} {'t/o':>4}")
+        for step in results:
+            p50, p95, p99 = (step.latency_percentile(p) for p in (50, 95, 99))
+            print(f"{step.rate:>8g} {step.throughput:>9.2f} "
+                  + " ".join(f"{v:>8.3f}" if v is not None else f"{'-':>8}"
+                             for v in (p50, p95, p99))
+                  + f" {step.errors:>4} {step.timeouts:>4}")
+
+        saturated = LoadGenerator.saturation_rate(results)
+        if saturated is None:
+            print("\nNo saturation: every step kept up with its target rate.\n")
+        else:
+            print(f"\nQueueing sets in at {saturated:g} req/s.\n")
+
+        p99s = [step.latency_percentile(99) for step in results
+                if step.latency_percentile(99) is not None]
+        if len(p99s) > 1:
+            print("\t\tY-axis: p99 latency (s)")
+            print("\t\tX-axis: Rate step")
+            print(asciichartpy.plot([v for v in p99s for _ in range(2)],
+                                    {"width": 40, "height": 4, "offset": 2,
+                                     "colors": ["\033[31m"]}))
+            print("\n")
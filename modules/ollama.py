@@ -1,13 +1,879 @@
 # Standard library imports.
+import base64
+import json
+import os
 import shutil
 import subprocess
 import textwrap
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional
 
 # Third party imports.
+import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+# Local library imports.
+from benchmarks.eval_rate_benchmark.timing_metrics import TimingMetrics
+from .tracing import tracer
+
+
+# Default Ollama server address, overridable with the OLLAMA_HOST variable.
+DEFAULT_HOST = "http://localhost:11434"
+
+# Default number of seconds to wait for a single Ollama request.
+DEFAULT_TIMEOUT = 600
+
+# Media file extensions that are attached to API requests as images.
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp")
+
+
+class OllamaError(Exception):
+    """
+    Raised when an Ollama backend request fails.
+    """
+
+
+class OllamaTimeoutError(OllamaError):
+    """
+    Raised when an Ollama backend request does not complete in time.
+    """
+
+
+@dataclass
+class OllamaResult:
+    """
+    Structured result of a single Ollama request.
+
+    Attributes:
+        model (str): The name of the model that served the request.
+        response (str): The generated text.
+        metrics (dict): Timing fields reported by the Ollama API, in
+            nanoseconds. Empty for the CLI backend.
+        stdout (str): Raw standard output of the CLI backend.
+        stderr (str): Raw standard error of the CLI backend, including the
+            ``--verbose`` timing block.
+        wall_time (float): Seconds between sending the request and receiving
+            the complete response, measured by the client.
+        backend (str): The name of the backend that produced the result.
+        token_times (list): For streamed requests, seconds between sending the
+            request and receiving each chunk that carried generated text.
+        host (str): Address of the Ollama server that served the request.
+            Empty for the CLI backend.
+    """
+    model: str
+    response: str
+    metrics: Dict = field(default_factory=dict)
+    stdout: str = ""
+    stderr: str = ""
+    wall_time: float = 0.0
+    backend: str = ""
+    token_times: List[float] = field(default_factory=list)
+    host: str = ""
+
+    @cached_property
+    def timing_metrics(self) -> TimingMetrics:
+        """
+        Every Ollama timing field of the result, parsed once on first use.
+
+        The API timing fields in ``metrics`` are used when present, otherwise
+        the CLI ``--verbose`` output in ``stderr`` is parsed.
+        """
+        if self.metrics:
+            return TimingMetrics.from_api(self.metrics)
+        return TimingMetrics.from_verbose(self.stderr)
+
+
+# Multipliers of the size suffixes printed by ``ollama list``, e.g. ``4.7 GB``.
+SIZE_UNITS = {"B": 1, "KB": 1e3, "MB": 1e6, "GB": 1e9, "TB": 1e12}
+
+# Multipliers of the suffixes of parameter counts, e.g. ``7B`` or ``270M``.
+PARAMETER_UNITS = {"": 1, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+
+def _parse_with_units(value: Optional[str], units: Dict[str, float]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip().upper().replace(" ", "")
+    number = value.rstrip("KMGTB")
+    try:
+        return float(number) * units[value[len(number):]]
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_size(size: Optional[str]) -> Optional[float]:
+    """
+    Parse a disk size such as ``4.7 GB``.
+
+    Args:
+        size (str): The size with a unit suffix.
+
+    Returns:
+        float: The size in bytes, or None if it cannot be parsed.
+    """
+    return _parse_with_units(size, SIZE_UNITS)
+
+
+def parse_parameter_count(parameter_size: Optional[str]) -> Optional[float]:
+    """
+    Parse a parameter count such as ``7B`` or ``270M``.
+
+    Args:
+        parameter_size (str): The count with an optional unit suffix.
+
+    Returns:
+        float: The number of parameters, or None if it cannot be parsed.
+    """
+    return _parse_with_units(parameter_size, PARAMETER_UNITS)
+
+
+@dataclass
+class ModelInfo:
+    """
+    Inventory entry of an installed model.
+
+    Attributes:
+        name (str): The fully tagged model name.
+        digest (str): The model digest. The CLI only shows a short prefix.
+        size_bytes (int): Size of the model files on disk.
+        parameter_size (str): Parameter count as reported, e.g. ``7B``.
+            Not reported by the CLI backend.
+        quantization_level (str): Quantisation of the weights, e.g. ``Q4_0``.
+            Not reported by the CLI backend.
+        family (str): Model family, e.g. ``llama``.
+    """
+    name: str
+    digest: Optional[str] = None
+    size_bytes: Optional[int] = None
+    parameter_size: Optional[str] = None
+    quantization_level: Optional[str] = None
+    family: Optional[str] = None
+
+    @property
+    def parameters_billions(self) -> Optional[float]:
+        """
+        Number of parameters in billions, or None if unknown.
+        """
+        parameters = parse_parameter_count(self.parameter_size)
+        return parameters / 1e9 if parameters else None
+
+    @property
+    def size_gb(self) -> Optional[float]:
+        """
+        Size on disk in GB, or None if unknown.
+        """
+        return self.size_bytes / 1e9 if self.size_bytes else None
+
+    @property
+    def extra(self) -> Dict:
+        """
+        The metadata recorded with every result of the model.
+        """
+        return {"parameter_size": self.parameter_size,
+                "quantization_level": self.quantization_level,
+                "model_size_bytes": self.size_bytes}
+
+    def normalized_throughput(self, eval_rate: float) -> Dict[str, float]:
+        """
+        Normalise a throughput by model size.
+
+        Args:
+            eval_rate (float): Generated tokens per second.
+
+        Returns:
+            dict: Tokens/s per billion parameters (``per_b_params``) and per
+            GB on disk (``per_gb``), for the sizes that are known.
+        """
+        normalized = {}
+        if self.parameters_billions:
+            normalized["per_b_params"] = eval_rate / self.parameters_billions
+        if self.size_gb:
+            normalized["per_gb"] = eval_rate / self.size_gb
+        return normalized
+
+    def print_normalized_throughput(self, eval_rate: float) -> None:
+        """
+        Print the model size and the throughput normalised by it.
+
+        Args:
+            eval_rate (float): Mean generated tokens per second.
+        """
+        description = " ".join(part for part in (
+            self.parameter_size, self.quantization_level,
+            f"{self.size_gb:.1f}GB" if self.size_gb else None) if part)
+        if description:
+            print(f"◽ Model size:\t{description}\t🏷️")
+        normalized = self.normalized_throughput(eval_rate)
+        if "per_b_params" in normalized:
+            print(f"◽ Tokens/s per B params:\t{normalized['per_b_params']:.2f}\t⚖️")
+        if "per_gb" in normalized:
+            print(f"◽ Tokens/s per GB:\t{normalized['per_gb']:.2f}\t⚖️")
+        if normalized:
+            print()
+
+
+def normalize_host(host: Optional[str] = None) -> str:
+    """
+    Normalize an Ollama host address into a base URL.
+
+    Args:
+        host (str, optional): Host address, e.g. ``localhost:11434`` or
+            ``http://gpu-01:11434``. Defaults to OLLAMA_HOST or DEFAULT_HOST.
+
+    Returns:
+        str: Base URL without a trailing slash.
+    """
+    host = host or os.environ.get("OLLAMA_HOST") or DEFAULT_HOST
+    if "://" not in host:
+        host = "http://" + host
+    return host.rstrip("/")
+
+
+def normalize_model_name(model: str) -> str:
+    """
+    Append the implicit ``latest`` tag to a model name without a tag.
+
+    Args:
+        model (str): The model name, e.g. ``llava`` or ``llava:13b``.
+
+    Returns:
+        str: The fully tagged model name.
+    """
+    return model if ":" in model else model + ":latest"
+
+
+def is_image_file(media_file_path: str) -> bool:
+    """
+    Check whether a media file should be attached to a request as an image.
+
+    Args:
+        media_file_path (str): The path to the media file.
+
+    Returns:
+        bool: True if the file extension is a supported image type.
+    """
+    return bool(media_file_path) and media_file_path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+# Precomputed base64 encodings of prepared images by absolute image path,
+# with the size and modification time of the image they were made from.
+_ENCODED_IMAGES: Dict[str, tuple] = {}
+
+
+def register_encoded_image(image_path: str, encoded_path: str) -> None:
+    """
+    Hand over the precomputed base64 encoding of an image, so requests
+    attaching the image read it instead of encoding the image again.
+
+    Args:
+        image_path (str): The path to the image file.
+        encoded_path (str): The path to a file holding its base64 encoding.
+    """
+    image_stat = os.stat(image_path)
+    _ENCODED_IMAGES[os.path.abspath(image_path)] = (
+        encoded_path, image_stat.st_size, image_stat.st_mtime_ns)
+
+
+def encode_image(image_path: str) -> str:
+    """
+    Base64 encode an image for the API.
+
+    Only an encoding registered with :func:`register_encoded_image` is
+    used, and only while the image keeps the size and modification time
+    it had when registered, so an image replaced since is encoded afresh.
+
+    Args:
+        image_path (str): The path to the image file.
+
+    Returns:
+        str: The base64 encoded image.
+    """
+    registered = _ENCODED_IMAGES.get(os.path.abspath(image_path))
+    if registered is not None:
+        encoded_path, size, mtime_ns = registered
+        try:
+            image_stat = os.stat(image_path)
+            if (image_stat.st_size, image_stat.st_mtime_ns) == (size, mtime_ns):
+                with open(encoded_path, "rb") as encoded_file:
+                    return encoded_file.read().decode("ascii")
+        except OSError:
+            pass
+    with open(image_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode("ascii")
+
+
+class OllamaBackend:
+    """
+    Base class for the transports used to reach Ollama.
+
+    Subclasses implement :meth:`run`, :meth:`is_available` and
+    :meth:`list_models`. :class:`Ollama` delegates to whichever backend is
+    currently selected with :meth:`Ollama.use_backend`.
+    """
+    name = "base"
+
+    def is_available(self) -> bool:
+        """
+        Checks if the backend can reach Ollama.
+
+        Returns:
+            bool: True if Ollama can be reached, False otherwise.
+        """
+        raise NotImplementedError
+
+    def list_models(self) -> List[str]:
+        """
+        Lists the models installed on the Ollama server.
+
+        Returns:
+            list: Fully tagged model names.
+        """
+        raise NotImplementedError
+
+    def is_model_installed(self, model: str) -> bool:
+        """
+        Checks if a given model is installed.
+
+        Args:
+            model (str): The name of the model to check.
+
+        Returns:
+            bool: True if the model is installed, False otherwise.
+        """
+        return normalize_model_name(model) in self.list_models()
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        """
+        Lists the installed models with their metadata in one request.
+
+        Returns:
+            dict: Mapping of fully tagged model names to ModelInfo.
+        """
+        return {name: ModelInfo(name) for name in self.list_models()}
+
+    def version(self) -> Optional[str]:
+        """
+        Returns the Ollama version.
+
+        Returns:
+            str: The version string, or None if it cannot be determined.
+        """
+        return None
+
+    def model_digest(self, model: str) -> Optional[str]:
+        """
+        Returns the digest of an installed model.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            str: The model digest, or None if the model is not installed.
+        """
+        return None
+
+    def unload(self, model: str) -> None:
+        """
+        Evict a model from memory, so the next request has to load it again.
+
+        Args:
+            model (str): The name of the model to unload.
+        """
+        raise NotImplementedError
+
+    def preload(self, model: str) -> Optional[OllamaResult]:
+        """
+        Load a model into memory without generating anything.
+
+        Args:
+            model (str): The name of the model to load.
+
+        Returns:
+            OllamaResult: The result of the load request, carrying the
+            ``load_duration`` the server reported, or None if unknown.
+        """
+        return None
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        """
+        Run a single benchmark request.
+
+        Args:
+            model (str): The name of the model to use.
+            prompt (str): The prompt for the benchmark.
+            media_file_path (str): The path to the media file.
+            options (dict, optional): Ollama runtime options of the request,
+                e.g. ``num_ctx`` or ``num_thread``.
+
+        Returns:
+            OllamaResult: The structured result of the request.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release any resources held by the backend.
+        """
+
+
+class OllamaCLIBackend(OllamaBackend):
+    """
+    Backend that shells out to ``ollama run ... --verbose`` per request.
+
+    Kept as a fallback for hosts where the REST API is not reachable. Every
+    request pays the cost of starting a new process and CLI client.
+    """
+    name = "cli"
+
+    # Console noise printed by the Windows CLI ahead of the model output.
+    CONSOLE_MODE_NOISE = "failed to get console mode for stderr: The handle is invalid."
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialize OllamaCLIBackend instance.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each request.
+                Defaults to no timeout.
+        """
+        self.timeout = timeout
+
+    def is_available(self) -> bool:
+        return Ollama.is_binary_installed()
+
+    def list_models(self) -> List[str]:
+        list_result = subprocess.run(
+            ["ollama", "list"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        # Skip the NAME/ID/SIZE/MODIFIED header row.
+        return [line.split()[0] for line in list_result.stdout.splitlines()[1:]
+                if line.strip()]
+
+    def version(self) -> Optional[str]:
+        version_result = subprocess.run(
+            ["ollama", "--version"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        # Prints e.g. "ollama version is 0.1.48".
+        words = version_result.stdout.split()
+        return words[-1] if words else None
+
+    def model_digest(self, model: str) -> Optional[str]:
+        info = self.inventory().get(normalize_model_name(model))
+        return info.digest if info else None
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        list_result = subprocess.run(
+            ["ollama", "list"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        # Rows are NAME, ID (the short digest), SIZE (e.g. "4.7 GB") and
+        # MODIFIED. Parameter size and quantisation are not listed.
+        models = {}
+        for line in list_result.stdout.splitlines()[1:]:
+            columns = line.split()
+            if len(columns) < 2:
+                continue
+            size = parse_size("".join(columns[2:4])) if len(columns) > 3 else None
+            models[columns[0]] = ModelInfo(
+                columns[0], digest=columns[1], size_bytes=int(size) if size else None)
+        return models
+
+    def unload(self, model: str) -> None:
+        try:
+            subprocess.run(
+                ["ollama", "stop", model],
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding="utf-8",
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise OllamaTimeoutError(
+                f"ollama stop {model} timed out after {self.timeout}s") from e
+        except subprocess.CalledProcessError as e:
+            raise OllamaError(
+                f"ollama stop {model} failed: {e.stderr.strip()}") from e
+
+    def preload(self, model: str) -> OllamaResult:
+        # An empty prompt loads the model and generates nothing.
+        start = time.perf_counter()
+        try:
+            completed_process = subprocess.run(
+                ["ollama", "run", model, "", "--verbose"],
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding="utf-8",
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise OllamaTimeoutError(
+                f"ollama run {model} timed out after {self.timeout}s") from e
+        except subprocess.CalledProcessError as e:
+            raise OllamaError(
+                f"ollama run {model} failed: {e.stderr.strip()}") from e
+        return OllamaResult(
+            model=model,
+            response="",
+            stdout=completed_process.stdout,
+            stderr=completed_process.stderr,
+            wall_time=time.perf_counter() - start,
+            backend=self.name,
+        )
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        if options:
+            raise OllamaError("The cli backend cannot set runtime options; use the http backend")
+        start = time.perf_counter()
+        try:
+            completed_process = subprocess.run(
+                ["ollama", "run", model, prompt + media_file_path, "--verbose"],
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding="utf-8",
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise OllamaTimeoutError(
+                f"ollama run {model} timed out after {self.timeout}s") from e
+        except subprocess.CalledProcessError as e:
+            raise OllamaError(
+                f"ollama run {model} failed: {e.stderr.strip()}") from e
+        wall_time = time.perf_counter() - start
+
+        response = completed_process.stdout
+        if self.CONSOLE_MODE_NOISE in response:
+            response = response.split(self.CONSOLE_MODE_NOISE, 1)[1]
+
+        return OllamaResult(
+            model=model,
+            response=response.strip(),
+            stdout=completed_process.stdout,
+            stderr=completed_process.stderr,
+            wall_time=wall_time,
+            backend=self.name,
+        )
+
+
+class OllamaHTTPBackend(OllamaBackend):
+    """
+    Backend that talks to the Ollama REST API over a pooled keep-alive session.
+
+    A single :class:`requests.Session` is shared by all requests so TCP
+    connections are reused instead of being opened per benchmark cell.
+
+    Attributes:
+        host (str): Base URL of the Ollama server.
+        timeout (float): Seconds to wait for each request.
+        session (requests.Session): The pooled HTTP session.
+    """
+    name = "http"
+
+    def __init__(self, host: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                 pool_maxsize: int = 10, stream: bool = False):
+        """
+        Initialize OllamaHTTPBackend instance.
+
+        Args:
+            host (str, optional): Ollama server address. Defaults to
+                OLLAMA_HOST or DEFAULT_HOST.
+            timeout (float, optional): Seconds to wait for each request.
+            pool_maxsize (int, optional): Maximum number of keep-alive
+                connections kept open to the server.
+            stream (bool, optional): Stream generate responses and timestamp
+                every chunk. Defaults to False.
+        """
+        self.host = normalize_host(host)
+        self.timeout = timeout
+        self.stream = stream
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        """
+        Send a request to the Ollama API and decode the JSON response.
+
+        Args:
+            method (str): HTTP method.
+            path (str): API path, e.g. ``/api/generate``.
+            payload (dict, optional): JSON request body.
+
+        Returns:
+            dict: Decoded JSON response.
+
+        Raises:
+            OllamaTimeoutError: If the request times out.
+            OllamaError: If the request fails or returns an error status.
+        """
+        url = self.host + path
+        try:
+            response = self.session.request(
+                method, url, json=payload, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise OllamaTimeoutError(
+                f"{method} {url} timed out after {self.timeout}s") from e
+        except requests.RequestException as e:
+            raise OllamaError(f"{method} {url} failed: {e}") from e
+
+        if response.status_code != 200:
+            raise OllamaError(
+                f"{method} {url} returned {response.status_code}: {response.text.strip()}")
+        return response.json()
+
+    def _stream_request(self, path: str, payload: Dict):
+        """
+        Send a streaming request and decode each newline-delimited JSON chunk.
+
+        Args:
+            path (str): API path, e.g. ``/api/generate``.
+            payload (dict): JSON request body.
+
+        Yields:
+            tuple: The perf_counter time each chunk arrived and the decoded chunk.
+
+        Raises:
+            OllamaTimeoutError: If the request times out.
+            OllamaError: If the request fails or returns an error status.
+        """
+        url = self.host + path
+        try:
+            with self.session.post(url, json=payload, timeout=self.timeout,
+                                   stream=True) as response:
+                if response.status_code != 200:
+                    raise OllamaError(
+                        f"POST {url} returned {response.status_code}: {response.text.strip()}")
+                for line in response.iter_lines():
+                    if line:
+                        yield time.perf_counter(), json.loads(line)
+        except requests.Timeout as e:
+            raise OllamaTimeoutError(f"POST {url} timed out after {self.timeout}s") from e
+        except requests.RequestException as e:
+            raise OllamaError(f"POST {url} failed: {e}") from e
+
+    def is_available(self) -> bool:
+        try:
+            self._request("GET", "/api/tags")
+        except OllamaError:
+            return False
+        return True
+
+    def list_models(self) -> List[str]:
+        tags = self._request("GET", "/api/tags")
+        return [model["name"] for model in tags.get("models", [])]
+
+    def version(self) -> Optional[str]:
+        try:
+            return self._request("GET", "/api/version").get("version")
+        except OllamaError:
+            return None
+
+    def model_digest(self, model: str) -> Optional[str]:
+        info = self.inventory().get(normalize_model_name(model))
+        return info.digest if info else None
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        tags = self._request("GET", "/api/tags")
+        models = {}
+        for installed in tags.get("models", []):
+            details = installed.get("details") or {}
+            models[installed["name"]] = ModelInfo(
+                installed["name"],
+                digest=installed.get("digest"),
+                size_bytes=installed.get("size"),
+                parameter_size=details.get("parameter_size"),
+                quantization_level=details.get("quantization_level"),
+                family=details.get("family"),
+            )
+        return models
+
+    def loaded_models(self) -> List[str]:
+        """
+        Lists the models currently loaded in memory, from ``/api/ps``.
+
+        Returns:
+            list: Fully tagged model names.
+        """
+        running = self._request("GET", "/api/ps")
+        return [model["name"] for model in running.get("models", [])]
+
+    def preload(self, model: str) -> OllamaResult:
+        # A request without a prompt loads the model and keeps it resident
+        # for the server's default keep-alive.
+        model = normalize_model_name(model)
+        start = time.perf_counter()
+        body = self._request("POST", "/api/generate", {"model": model})
+        return self._result(model, "", body, time.perf_counter() - start)
+
+    def unload(self, model: str, poll_interval: float = 0.1) -> None:
+        # A request with keep_alive=0 and no prompt unloads the model. The
+        # server frees it asynchronously, so wait until /api/ps drops it.
+        model = normalize_model_name(model)
+        self._request("POST", "/api/generate", {"model": model, "keep_alive": 0})
+        deadline = time.perf_counter() + self.timeout
+        while model in self.loaded_models():
+            if time.perf_counter() > deadline:
+                raise OllamaTimeoutError(
+                    f"{model} still loaded {self.timeout}s after unloading it")
+            time.sleep(poll_interval)
+
+    def generate(self, model: str, prompt: str, images: Optional[List[str]] = None,
+                 options: Optional[Dict] = None, stream: Optional[bool] = None) -> OllamaResult:
+        """
+        Run a completion through ``/api/generate``.
+
+        Args:
+            model (str): The name of the model to use.
+            prompt (str): The prompt text.
+            images (list, optional): Base64 encoded images to attach.
+            options (dict, optional): Ollama runtime options.
+            stream (bool, optional): Stream the response and record the
+                arrival time of every chunk. Defaults to the backend setting.
+
+        Returns:
+            OllamaResult: The structured result of the request.
+        """
+        stream = self.stream if stream is None else stream
+        payload = {"model": model, "prompt": prompt, "stream": stream}
+        if images:
+            payload["images"] = images
+        if options:
+            payload["options"] = options
+
+        start = time.perf_counter()
+        if not stream:
+            body = self._request("POST", "/api/generate", payload)
+            wall_time = time.perf_counter() - start
+            return self._result(model, body.get("response", ""), body, wall_time)
+
+        pieces = []
+        token_times = []
+        body = {}
+        for arrived, chunk in self._stream_request("/api/generate", payload):
+            if chunk.get("response"):
+                pieces.append(chunk["response"])
+                token_times.append(arrived - start)
+            if chunk.get("done"):
+                body = chunk
+        wall_time = time.perf_counter() - start
+
+        result = self._result(model, "".join(pieces), body, wall_time)
+        result.token_times = token_times
+        return result
+
+    def chat(self, model: str, messages: List[Dict],
+             options: Optional[Dict] = None) -> OllamaResult:
+        """
+        Run a chat completion through ``/api/chat``.
+
+        Args:
+            model (str): The name of the model to use.
+            messages (list): Chat messages, each a dict with ``role`` and
+                ``content`` and optionally ``images``.
+            options (dict, optional): Ollama runtime options.
+
+        Returns:
+            OllamaResult: The structured result of the request.
+        """
+        payload = {"model": model, "messages": messages, "stream": False}
+        if options:
+            payload["options"] = options
+
+        start = time.perf_counter()
+        body = self._request("POST", "/api/chat", payload)
+        wall_time = time.perf_counter() - start
+
+        message = body.get("message") or {}
+        return self._result(model, message.get("content", ""), body, wall_time)
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        images = None
+        if is_image_file(media_file_path):
+            with tracer.span("ollama.encode_image"):
+                images = [encode_image(media_file_path)]
+        return self.generate(model, prompt, images=images, options=options)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _result(self, model: str, response: str, body: Dict,
+                wall_time: float) -> OllamaResult:
+        """
+        Build an OllamaResult from a decoded API response body.
+        """
+        metrics = {key: value for key, value in body.items()
+                   if key.endswith(("_duration", "_count"))}
+        return OllamaResult(
+            model=model,
+            response=response.strip(),
+            metrics=metrics,
+            wall_time=wall_time,
+            backend=self.name,
+            host=self.host,
+        )
+
+
+# Backend names accepted by Ollama.create_backend().
+BACKENDS = {
+    OllamaHTTPBackend.name: OllamaHTTPBackend,
+    OllamaCLIBackend.name: OllamaCLIBackend,
+}
 
 
 class Ollama:
+    # The backend used by is_model_installed() and run_benchmark().
+    backend: OllamaBackend = OllamaHTTPBackend()
+
+    # Model inventory of the backend, fetched once per run by inventory().
+    _inventory: Optional[Dict[str, ModelInfo]] = None
+    _inventory_backend: Optional[OllamaBackend] = None
+
+    @staticmethod
+    def create_backend(name: str, **kwargs) -> OllamaBackend:
+        """
+        Create a backend by name.
+
+        Args:
+            name (str): One of the names in BACKENDS (``http`` or ``cli``).
+            **kwargs: Keyword arguments passed to the backend constructor.
+
+        Returns:
+            OllamaBackend: The new backend instance.
+        """
+        try:
+            backend_class = BACKENDS[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown Ollama backend {name!r}, expected one of {sorted(BACKENDS)}") from None
+        return backend_class(**kwargs)
+
+    @classmethod
+    def use_backend(cls, backend: OllamaBackend) -> None:
+        """
+        Select the backend used for all subsequent Ollama requests.
+
+        Args:
+            backend (OllamaBackend): The backend to use.
+        """
+        cls.backend = backend
+
     @staticmethod
     def is_binary_installed():
         """
@@ -18,10 +884,20 @@ class Ollama:
         """
         return shutil.which("ollama") is not None
 
-    @staticmethod
-    def is_model_installed(model: str):
+    @classmethod
+    def is_available(cls) -> bool:
         """
-        Checks if a given model is installed.
+        Checks if the selected backend can reach Ollama.
+
+        Returns:
+            bool: True if Ollama can be reached, False otherwise.
+        """
+        return cls.backend.is_available()
+
+    @classmethod
+    def is_model_installed(cls, model: str):
+        """
+        Checks if a given model is installed, from the cached inventory.
 
         Args:
             model (str): The name of the model to check.
@@ -29,15 +905,53 @@ class Ollama:
         Returns:
             bool: True if the model is installed, False otherwise.
         """
-        model_check_result = subprocess.run(
-            ["ollama", "show", model],
-            capture_output=True,
-            shell=True,
-            text=True,
-            encoding="utf-8",
-        )
+        return cls.model_info(model) is not None
+
+    @classmethod
+    def inventory(cls, refresh: bool = False) -> Dict[str, ModelInfo]:
+        """
+        Get the installed models, fetching them once per backend.
+
+        Args:
+            refresh (bool, optional): Fetch the inventory again.
+
+        Returns:
+            dict: Mapping of fully tagged model names to ModelInfo.
+        """
+        if refresh or cls._inventory is None or cls._inventory_backend is not cls.backend:
+            cls._inventory = cls.backend.inventory()
+            cls._inventory_backend = cls.backend
+        return cls._inventory
+
+    @classmethod
+    def model_info(cls, model: str) -> Optional[ModelInfo]:
+        """
+        Look up an installed model in the cached inventory.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            ModelInfo: The model metadata, or None if it is not installed.
+        """
+        return cls.inventory().get(normalize_model_name(model))
+
+    @classmethod
+    def changed_models(cls) -> List[str]:
+        """
+        Fetch the inventory again and find models whose digest changed.
 
-        return "Error: model" not in model_check_result.stderr
+        Anything keyed by a model digest (e.g. recorded results compared
+        across runs) is stale for these models.
+
+        Returns:
+            list: Names of models that were re-pulled, replaced or removed
+            since the cached inventory was fetched.
+        """
+        previous = cls.inventory()
+        current = cls.inventory(refresh=True)
+        return [name for name, info in previous.items()
+                if name not in current or current[name].digest != info.digest]
 
     @staticmethod
     def read_yaml(yaml_file_path: str):
@@ -58,8 +972,9 @@ class Ollama:
             print(e)
             return None
 
-    @staticmethod
-    def run_benchmark(model: str, prompt: str, media_file_path: str) -> subprocess.CompletedProcess:
+    @classmethod
+    def run_benchmark(cls, model: str, prompt: str, media_file_path: str,
+                      options: Optional[Dict] = None) -> OllamaResult:
         """
         Run a benchmark using the specified model, prompt, and media file path.
 
@@ -67,20 +982,36 @@ class Ollama:
             model (str): The name of the model to use.
             prompt (str): The prompt for the benchmark.
             media_file_path (str): The path to the media file.
+            options (dict, optional): Ollama runtime options of the request.
 
         Returns:
-            subprocess.CompletedProcess: The result of the benchmark execution.
+            OllamaResult: The result of the benchmark execution.
         """
-        benchmark_result = subprocess.run(
-            ["ollama", "run", model, prompt + media_file_path, "--verbose"],
-            capture_output=True,
-            shell=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-        )
+        with tracer.span("ollama.run", model=model, backend=cls.backend.name):
+            return cls.backend.run(model, prompt, media_file_path, options)
+
+    @classmethod
+    def unload_model(cls, model: str) -> None:
+        """
+        Evict a model from memory through the selected backend.
 
-        return benchmark_result
+        Args:
+            model (str): The name of the model to unload.
+        """
+        cls.backend.unload(model)
+
+    @classmethod
+    def preload_model(cls, model: str) -> Optional[OllamaResult]:
+        """
+        Load a model into memory through the selected backend.
+
+        Args:
+            model (str): The name of the model to load.
+
+        Returns:
+            OllamaResult: The result of the load request, or None if unknown.
+        """
+        return cls.backend.preload(model)
 
     @staticmethod
     def print_prompt(prompt: str) -> None:
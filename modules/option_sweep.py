@@ -0,0 +1,172 @@
+# Standard library imports.
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Local library imports.
+from .ollama import OllamaResult
+
+# A combination of Ollama runtime options as sorted (name, value) pairs, so
+# it can key dictionaries and sit in a frozen BenchmarkJob.
+OptionSet = Tuple[Tuple[str, object], ...]
+
+
+def expand_options(grid: Optional[Dict]) -> List[OptionSet]:
+    """
+    Expand an ``options`` grid from the YAML configuration into combinations.
+
+    Each option maps to one value or a list of values to try, e.g.
+    ``{"num_thread": [4, 8], "num_ctx": 2048}`` expands to two combinations.
+    Combinations are in the order of the grid, the last option varying fastest.
+
+    Args:
+        grid (dict): Ollama runtime option names mapped to values or value lists.
+
+    Returns:
+        list: OptionSet of each combination, or a single empty OptionSet
+        when there is no grid so every request uses the model's defaults.
+
+    Raises:
+        ValueError: If the grid is not a mapping or an option has no values.
+    """
+    if not grid:
+        return [()]
+    if not isinstance(grid, dict):
+        raise ValueError("options must map Ollama option names to values or lists of values")
+    values = []
+    for name, value in grid.items():
+        value = value if isinstance(value, list) else [value]
+        if not value:
+            raise ValueError(f"option {name} has no values to try")
+        values.append([(name, option) for option in value])
+    return [tuple(sorted(combination)) for combination in itertools.product(*values)]
+
+
+def format_options(options: OptionSet) -> str:
+    """
+    Format an option combination for reports, e.g. ``num_ctx=2048 num_thread=8``.
+
+    Args:
+        options (OptionSet): The option combination.
+
+    Returns:
+        str: The formatted combination, or ``defaults`` when empty.
+    """
+    return " ".join(f"{name}={value}" for name, value in options) or "defaults"
+
+
+@dataclass
+class OptionStats:
+    """
+    Measured requests of one model with one option combination.
+
+    Attributes:
+        prompt_eval_rates (list): Prompt evaluation rates in tokens/s.
+        eval_rates (list): Evaluation rates in tokens/s.
+        latencies (list): Wall times of the requests in seconds.
+    """
+    prompt_eval_rates: List[float] = field(default_factory=list)
+    eval_rates: List[float] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+
+    @staticmethod
+    def _mean(values: List[float]) -> Optional[float]:
+        return sum(values) / len(values) if values else None
+
+    @property
+    def prompt_eval_rate(self) -> Optional[float]:
+        """
+        Mean prompt evaluation rate, or None without timing fields.
+        """
+        return self._mean(self.prompt_eval_rates)
+
+    @property
+    def eval_rate(self) -> Optional[float]:
+        """
+        Mean evaluation rate, or None without timing fields.
+        """
+        return self._mean(self.eval_rates)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Mean wall time of the requests, or None before any.
+        """
+        return self._mean(self.latencies)
+
+
+class OptionSweep:
+    """
+    Collects results per model and option combination and reports which
+    combination gets the most throughput out of each model.
+
+    Attributes:
+        stats (dict): OptionStats by model, then by OptionSet, in the order
+            the combinations were first recorded.
+    """
+
+    def __init__(self):
+        """
+        Initialize OptionSweep instance.
+        """
+        self.stats: Dict[str, Dict[OptionSet, OptionStats]] = {}
+
+    def record_result(self, model: str, options: OptionSet, result: OllamaResult) -> None:
+        """
+        Record a measured result of a model run with an option combination.
+
+        Args:
+            model (str): The name of the model.
+            options (OptionSet): The options the request was sent with.
+            result (OllamaResult): The result of the request.
+        """
+        stats = self.stats.setdefault(model, {}).setdefault(options, OptionStats())
+        metrics = result.timing_metrics
+        if metrics.prompt_eval_rate is not None:
+            stats.prompt_eval_rates.append(metrics.prompt_eval_rate)
+        if metrics.eval_rate is not None:
+            stats.eval_rates.append(metrics.eval_rate)
+        stats.latencies.append(result.wall_time)
+
+    def best(self, model: str) -> Optional[OptionSet]:
+        """
+        The option combination with the highest mean eval rate for a model.
+
+        Ties, and combinations without timing fields, go to the lowest latency.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            OptionSet: The best combination, or None if the model has no results.
+        """
+        stats = self.stats.get(model)
+        if not stats:
+            return None
+        return max(stats, key=lambda options: (
+            stats[options].eval_rate or 0.0, -(stats[options].latency or 0.0)))
+
+    def print_report(self) -> None:
+        """
+        Print a table of prompt-eval rate, eval rate and latency per option
+        combination of each model, starring the best combination.
+        """
+        if not self.stats:
+            return
+        print(f"{'-' * 40}\nOption sweep 🎛️\n{'-' * 40}")
+        for model, stats in self.stats.items():
+            best = self.best(model)
+            width = max(len(format_options(options)) for options in stats) + 2
+            print(f"🦙 {model}")
+            print(f"{'options':<{width}}{'prompt eval':>12}{'eval rate':>11}{'latency':>9}")
+            for options, option_stats in stats.items():
+                marker = "  ⭐" if options == best else ""
+                print(f"{format_options(options):<{width}}"
+                      f"{self._format(option_stats.prompt_eval_rate, 2):>12}"
+                      f"{self._format(option_stats.eval_rate, 2):>11}"
+                      f"{self._format(option_stats.latency, 3):>9}{marker}")
+            print(f"◽ Best options:\t{format_options(best)}\t⭐\n")
+
+    @staticmethod
+    def _format(value: Optional[float], digits: int) -> str:
+        return "-" if value is None else f"{value:.{digits}f}"
@@ -0,0 +1,163 @@
+# Standard library imports.
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Tuple
+
+
+@dataclass
+class StageStats:
+    """
+    Busy and idle time of one pipeline stage.
+
+    Attributes:
+        name (str): The stage name.
+        items (int): Number of items the stage processed.
+        busy (float): Seconds spent doing work.
+        idle (float): Seconds spent waiting for input or for room downstream.
+    """
+    name: str
+    items: int = 0
+    busy: float = 0.0
+    idle: float = 0.0
+
+    @property
+    def utilisation(self) -> float:
+        total = self.busy + self.idle
+        return self.busy / total if total else 0.0
+
+
+class TwoStagePipeline:
+    """
+    Overlaps a media preparation stage with an Ollama request stage.
+
+    The first stage (e.g. Whisper transcription) prepares job N+1 on its own
+    thread while the second stage (e.g. the Ollama summarization request)
+    handles job N. A bounded queue between them provides backpressure so the
+    first stage never runs more than ``maxsize`` jobs ahead. Results are
+    yielded in job order, in the same shape as JobScheduler.run().
+
+    Attributes:
+        maxsize (int): Capacity of the queue between the stages.
+        stages (list): StageStats of the two stages from the last run.
+    """
+
+    # Marks the end of the job stream on the queues.
+    _DONE = object()
+
+    def __init__(self, maxsize: int = 2, names: Tuple[str, str] = ("media", "ollama")):
+        """
+        Initialize TwoStagePipeline instance.
+
+        Args:
+            maxsize (int, optional): Capacity of the queue between the stages.
+            names (tuple, optional): Names of the two stages for the report.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.names = names
+        self.stages: List[StageStats] = []
+
+    def run(self, jobs: List, prepare: Callable, send: Callable) -> Iterator[Tuple[object, object]]:
+        """
+        Run every job through both stages and yield the results in job order.
+
+        Args:
+            jobs (list): The jobs to run.
+            prepare (callable): First stage, called with each job.
+            send (callable): Second stage, called with each job and the value
+                prepare returned for it.
+
+        Yields:
+            tuple: The job and the value returned by send.
+
+        Raises:
+            Exception: The first exception raised by either stage.
+        """
+        first, second = StageStats(self.names[0]), StageStats(self.names[1])
+        self.stages = [first, second]
+        handoff = queue.Queue(maxsize=self.maxsize)
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def put(target: queue.Queue, item, stats: StageStats) -> bool:
+            # Blocks while the next stage is behind, counted as idle time.
+            start = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            stats.idle += time.perf_counter() - start
+            return not stop.is_set()
+
+        def prepare_stage():
+            try:
+                for job in jobs:
+                    start = time.perf_counter()
+                    prepared = prepare(job)
+                    first.busy += time.perf_counter() - start
+                    first.items += 1
+                    if not put(handoff, (job, prepared), first):
+                        return
+            except Exception as e:
+                put(handoff, e, first)
+                return
+            put(handoff, self._DONE, first)
+
+        def send_stage():
+            while True:
+                start = time.perf_counter()
+                item = handoff.get()
+                second.idle += time.perf_counter() - start
+                if item is self._DONE or isinstance(item, Exception):
+                    results.put(item)
+                    return
+                job, prepared = item
+                start = time.perf_counter()
+                try:
+                    result = send(job, prepared)
+                except Exception as e:
+                    results.put(e)
+                    return
+                second.busy += time.perf_counter() - start
+                second.items += 1
+                results.put((job, result))
+
+        threads = [threading.Thread(target=prepare_stage, daemon=True),
+                   threading.Thread(target=send_stage, daemon=True)]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is self._DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock the second stage if it is still waiting for input.
+            try:
+                handoff.put_nowait(self._DONE)
+            except queue.Full:
+                pass
+            for thread in threads:
+                thread.join(timeout=1)
+
+    def print_report(self) -> None:
+        """
+        Prints the busy/idle time of each stage and the bottleneck stage.
+        """
+        if not self.stages:
+            return
+        print(f"{'-' * 40}\nPipeline stages ⚙️\n{'-' * 40}")
+        for stage in self.stages:
+            print(f"◽ {stage.name}:\t{stage.items} items, busy {stage.busy:.2f}s, "
+                  f"idle {stage.idle:.2f}s ({stage.utilisation:.0%} busy)")
+        bottleneck = max(self.stages, key=lambda stage: stage.busy)
+        print(f"Bottleneck: {bottleneck.name}\n")
@@ -0,0 +1,269 @@
+# Standard library imports.
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Local library imports.
+from .ollama import (
+    ModelInfo, OllamaBackend, OllamaError, OllamaResult, normalize_model_name)
+
+# Latency models of ReplayBackend.
+REPLAY_LATENCIES = ("none", "recorded", "tokens")
+
+
+def recording_key(model: str, prompt: str, media_file_path: str,
+                  options: Optional[Dict] = None) -> Tuple[str, str, str]:
+    """
+    Build the key a request is recorded and replayed under.
+
+    The media file is identified by its name only, so an archive recorded
+    on one machine replays on another with the data checked out elsewhere.
+    Runtime options are hashed with the prompt, so requests without options
+    keep the keys of archives recorded before options could be set.
+
+    Args:
+        model (str): The name of the model.
+        prompt (str): The prompt sent to the model.
+        media_file_path (str): The path to the media file.
+        options (dict, optional): Ollama runtime options of the request.
+
+    Returns:
+        tuple: The tagged model name, the SHA-256 of the prompt (and
+        options) and the media file name.
+    """
+    if options:
+        prompt += json.dumps(options, sort_keys=True)
+    return (normalize_model_name(model),
+            hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            os.path.basename(media_file_path or ""))
+
+
+class RecordingBackend(OllamaBackend):
+    """
+    Backend that passes every request to another backend and records the
+    responses into a fixture archive for :class:`ReplayBackend`.
+
+    The archive is a JSON Lines file with one record per line: every
+    result with its output text, CLI streams, timing fields, wall time and
+    token arrival times, and the version and model inventory of the server.
+    Records are appended and flushed as they arrive, so an interrupted run
+    still leaves a usable archive.
+
+    Attributes:
+        backend (OllamaBackend): The backend requests are passed to.
+        path (str): Path of the fixture archive.
+        recorded (int): Number of results recorded.
+    """
+
+    def __init__(self, backend: OllamaBackend, path: str):
+        """
+        Initialize RecordingBackend instance.
+
+        Args:
+            backend (OllamaBackend): The backend requests are passed to.
+            path (str): Path of the fixture archive, overwritten if it exists.
+        """
+        self.backend = backend
+        self.path = path
+        # Recorded runs keep the name of the real backend they ran on.
+        self.name = backend.name
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._archive = open(path, "w", encoding="utf-8")
+
+    def _record(self, record: Dict) -> None:
+        with self._lock:
+            self._archive.write(json.dumps(record, sort_keys=True) + "\n")
+            self._archive.flush()
+
+    def is_available(self) -> bool:
+        return self.backend.is_available()
+
+    def list_models(self) -> List[str]:
+        return list(self.inventory())
+
+    def is_model_installed(self, model: str) -> bool:
+        return self.backend.is_model_installed(model)
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        models = self.backend.inventory()
+        self._record({"type": "inventory",
+                      "models": [dataclasses.asdict(info) for info in models.values()]})
+        return models
+
+    def version(self) -> Optional[str]:
+        version = self.backend.version()
+        self._record({"type": "version", "version": version})
+        return version
+
+    def model_digest(self, model: str) -> Optional[str]:
+        return self.backend.model_digest(model)
+
+    def unload(self, model: str) -> None:
+        self.backend.unload(model)
+
+    def preload(self, model: str) -> Optional[OllamaResult]:
+        return self.backend.preload(model)
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        result = self.backend.run(model, prompt, media_file_path, options)
+        self._record({"type": "result",
+                      "key": recording_key(model, prompt, media_file_path, options),
+                      "result": dataclasses.asdict(result)})
+        with self._lock:
+            self.recorded += 1
+        return result
+
+    def close(self) -> None:
+        self.backend.close()
+        with self._lock:
+            self._archive.close()
+
+
+class ReplayBackend(OllamaBackend):
+    """
+    Backend that serves the responses of a fixture archive recorded with
+    :class:`RecordingBackend`, with no Ollama server, GPU or network.
+
+    Requests are matched on model, prompt, runtime options and media file
+    name. A request recorded several times is answered with its recordings
+    in order, starting over when they run out. Replayed results are returned
+    exactly as recorded, so a replayed run stores and reports the same
+    numbers as the recorded one. The latency model only sets how long each
+    request takes:
+
+    - ``none``: answer immediately, so the run measures the harness alone.
+    - ``recorded``: wait the recorded wall time of the response.
+    - ``tokens``: wait the recorded output tokens at ``tokens_per_second``.
+
+    Attributes:
+        path (str): Path of the fixture archive.
+        latency (str): One of REPLAY_LATENCIES.
+        tokens_per_second (float): Simulated generation speed of ``tokens``.
+        requests (int): Number of requests served.
+        latency_seconds (float): Seconds spent waiting on simulated latency.
+    """
+    name = "replay"
+
+    def __init__(self, path: str, latency: str = "none", tokens_per_second: float = 30.0):
+        """
+        Initialize ReplayBackend instance.
+
+        Args:
+            path (str): Path of the fixture archive.
+            latency (str, optional): One of REPLAY_LATENCIES. Defaults to none.
+            tokens_per_second (float, optional): Simulated generation speed
+                of the ``tokens`` latency model.
+
+        Raises:
+            ValueError: If the latency model is unknown.
+        """
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(
+                f"Unknown replay latency {latency!r}, expected one of {REPLAY_LATENCIES}")
+        self.path = path
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.requests = 0
+        self.latency_seconds = 0.0
+        self._version = None
+        self._inventory: Dict[str, ModelInfo] = {}
+        self._recordings: Dict[Tuple[str, str, str], List[Dict]] = collections.defaultdict(list)
+        self._cursors: Dict[Tuple[str, str, str], int] = collections.Counter()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Read the fixture archive. The last inventory and version recorded win.
+        """
+        with open(self.path, "r", encoding="utf-8") as archive:
+            for line in archive:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["type"] == "result":
+                    self._recordings[tuple(record["key"])].append(record["result"])
+                elif record["type"] == "inventory":
+                    self._inventory = {model["name"]: ModelInfo(**model)
+                                       for model in record["models"]}
+                elif record["type"] == "version":
+                    self._version = record["version"]
+
+    def is_available(self) -> bool:
+        return True
+
+    def list_models(self) -> List[str]:
+        return list(self._inventory)
+
+    def inventory(self) -> Dict[str, ModelInfo]:
+        return dict(self._inventory)
+
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def model_digest(self, model: str) -> Optional[str]:
+        info = self._inventory.get(normalize_model_name(model))
+        return info.digest if info else None
+
+    def unload(self, model: str) -> None:
+        pass
+
+    def preload(self, model: str) -> Optional[OllamaResult]:
+        return None
+
+    def _delay(self, result: OllamaResult) -> float:
+        """
+        Seconds the latency model holds a replayed result back.
+        """
+        if self.latency == "recorded":
+            return result.wall_time
+        if self.latency == "tokens":
+            eval_count = result.timing_metrics.eval_count or 0
+            return eval_count / self.tokens_per_second
+        return 0.0
+
+    def run(self, model: str, prompt: str, media_file_path: str,
+            options: Optional[Dict] = None) -> OllamaResult:
+        key = recording_key(model, prompt, media_file_path, options)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise OllamaError(
+                    f"No recorded response of {key[0]} for {key[2] or 'no media'} "
+                    f"in {self.path}")
+            recorded = recordings[self._cursors[key] % len(recordings)]
+            self._cursors[key] += 1
+            self.requests += 1
+
+        result = OllamaResult(**recorded)
+        delay = self._delay(result)
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self.latency_seconds += delay
+        return result
+
+    def print_overhead(self, elapsed: float) -> None:
+        """
+        Print the time the harness itself spent per replayed request.
+
+        The simulated latency is subtracted as if the requests ran one at a
+        time, so with several workers use the ``none`` latency model.
+
+        Args:
+            elapsed (float): Wall time of the whole replayed run, in seconds.
+        """
+        if not self.requests:
+            return
+        overhead = max(0.0, elapsed - self.latency_seconds) / self.requests
+        print(f"{'-' * 40}\nHarness overhead 🧰\n{'-' * 40}")
+        print(f"◽ Requests replayed:\t{self.requests}\t📼")
+        print(f"◽ Simulated latency:\t{self.latency_seconds:.2f}s ({self.latency})\t⏳")
+        print(f"◽ Overhead/request:\t{overhead * 1000:.2f}ms\t🧰\n")
@@ -0,0 +1,133 @@
+# Standard library imports.
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Local library imports.
+from .ollama import OllamaResult
+from .scheduler import COLD, BenchmarkJob
+
+
+class ResidencyPlanner:
+    """
+    Preloads the next model ahead of its jobs and counts model swaps.
+
+    The jobs are not reordered: JobScheduler.expand_jobs already runs every
+    job of a model before the next model, so each model is loaded once.
+    When the last job of a model starts the next model is preloaded in the
+    background, so its weights load while the current model drains rather
+    than on the first request of the next model. Model swaps and load time
+    are counted for sizing servers by the number of resident models.
+
+    Attributes:
+        preload (callable): Loads a model without generating, e.g.
+            Ollama.preload_model. Preloading is skipped when None.
+        swaps (int): Number of times a job started on a different model than
+            the job started before it.
+        loads (int): Number of models started, i.e. swaps plus the first model.
+        load_time (float): Sum of the load durations Ollama reported for
+            requests and preloads, in seconds.
+        preload_time (float): Seconds spent waiting on preload requests,
+            including any time the server queued them behind running requests.
+    """
+
+    def __init__(self, preload: Optional[Callable[[str], Optional[OllamaResult]]] = None):
+        """
+        Initialize ResidencyPlanner instance.
+
+        Args:
+            preload (callable, optional): Called with a model name to load
+                it ahead of its first job. The load duration of the result
+                it returns, if any, is added to the load time.
+        """
+        self.preload = preload
+        self.swaps = 0
+        self.loads = 0
+        self.load_time = 0.0
+        self.preload_time = 0.0
+        self._lock = threading.Lock()
+        self._current_model = None
+        self._next_model: Dict[int, str] = {}
+        self._preloads: List[threading.Thread] = []
+
+    def plan(self, jobs: List[BenchmarkJob]) -> None:
+        """
+        Note where to preload the next model.
+
+        Args:
+            jobs (list): BenchmarkJob objects in the order they run, as
+                expanded by JobScheduler.expand_jobs.
+        """
+        self._next_model = {}
+        for job, following in zip(jobs, jobs[1:]):
+            # A cold-start job measures loading an evicted model, so the
+            # model must not be preloaded ahead of it.
+            if following.model != job.model and following.phase != COLD:
+                self._next_model[job.index] = following.model
+
+    def wrap(self, job_function: Callable) -> Callable:
+        """
+        Wrap a job function to count swaps and preload the next model.
+
+        Args:
+            job_function (callable): Called with a job and any further
+                arguments, e.g. JobScheduler or TwoStagePipeline stages.
+
+        Returns:
+            callable: The wrapped job function.
+        """
+        def residency_job(job: BenchmarkJob, *args):
+            self._start(job)
+            return job_function(job, *args)
+        return residency_job
+
+    def _start(self, job: BenchmarkJob) -> None:
+        with self._lock:
+            if job.model != self._current_model:
+                self.loads += 1
+                self.swaps += self._current_model is not None
+                self._current_model = job.model
+        next_model = self._next_model.get(job.index)
+        if next_model is not None and self.preload is not None:
+            thread = threading.Thread(target=self._preload, args=(next_model,), daemon=True)
+            thread.start()
+            self._preloads.append(thread)
+
+    def _preload(self, model: str) -> None:
+        start = time.perf_counter()
+        try:
+            result = self.preload(model)
+        except Exception as e:
+            print(f"Preloading {model} failed: {e}")
+            return
+        with self._lock:
+            self.preload_time += time.perf_counter() - start
+        # The preloaded model's first request then reports next to no load.
+        if result is not None:
+            self.record_result(result)
+
+    def record_result(self, benchmark_result) -> None:
+        """
+        Add the load duration Ollama reported for a result to the load time.
+
+        Args:
+            benchmark_result (OllamaResult): Result of the Ollama request.
+        """
+        load_duration = benchmark_result.timing_metrics.load_duration
+        if load_duration is not None:
+            with self._lock:
+                self.load_time += load_duration
+
+    def print_report(self) -> None:
+        """
+        Print the swap count and the time spent loading models.
+        """
+        for thread in self._preloads:
+            thread.join()
+        print(f"{'-' * 40}\nModel residency 🧠\n{'-' * 40}")
+        print("  models loaded:".ljust(24) + f"{self.loads}")
+        print("  model swaps:".ljust(24) + f"{self.swaps}")
+        print("  load time:".ljust(24) + f"{self.load_time:.3f}s")
+        if self._preloads:
+            print("  preload wait:".ljust(24) + f"{self.preload_time:.3f}s")
+        print()
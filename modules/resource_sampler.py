@@ -0,0 +1,358 @@
+# Standard library imports.
+import os
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Local library imports.
+from .scheduler import MEASURE
+
+
+@dataclass
+class ResourceSample:
+    """
+    Resource use of the Ollama processes and the host over one interval.
+
+    Attributes:
+        time (float): time.monotonic() when the sample was taken.
+        jobs (tuple): (model, prompt, media) of every job in flight.
+        process_cpu (float): CPU time of the Ollama processes per second
+            of the interval, e.g. 2.0 for two busy cores.
+        process_cpu_seconds (float): CPU seconds the Ollama processes used
+            during the interval.
+        process_rss (int): Resident set size of the Ollama processes in bytes.
+        major_faults (int): Major page faults of the Ollama processes during
+            the interval. Sustained faults mean the weights are being paged.
+        host_cpu (float): Fraction of all host CPU time that was busy.
+        load_average (float): One-minute host load average.
+    """
+    time: float
+    jobs: Tuple[Tuple[str, str, str], ...]
+    process_cpu: float
+    process_cpu_seconds: float
+    process_rss: int
+    major_faults: int
+    host_cpu: float
+    load_average: float
+
+
+@dataclass
+class ModelResources:
+    """
+    Resource use of the Ollama processes while one model had jobs in flight.
+
+    Attributes:
+        model (str): Model name.
+        samples (int): Number of samples taken with the model in flight.
+        peak_rss (int): Largest resident set size in bytes.
+        mean_cpu (float): Mean process CPU, in cores.
+        cpu_seconds (float): CPU seconds attributed to the model. Samples
+            with several jobs in flight are split evenly between them.
+        major_faults (int): Major page faults while the model was in flight.
+        mean_host_cpu (float): Mean fraction of host CPU that was busy.
+        peak_load_average (float): Highest one-minute load average.
+        tokens (int): Tokens generated by the model's recorded results.
+    """
+    model: str
+    samples: int = 0
+    peak_rss: int = 0
+    mean_cpu: float = 0.0
+    cpu_seconds: float = 0.0
+    major_faults: int = 0
+    mean_host_cpu: float = 0.0
+    peak_load_average: float = 0.0
+    tokens: int = 0
+
+    @property
+    def tokens_per_cpu_second(self) -> Optional[float]:
+        return self.tokens / self.cpu_seconds if self.cpu_seconds else None
+
+
+class ResourceSampler:
+    """
+    Samples the CPU and memory of the Ollama server from ``/proc`` in the
+    background and ties every sample to the jobs in flight.
+
+    The Ollama server runs each loaded model in a runner child process, so
+    the server and all its descendants are sampled together. Jobs are
+    marked in flight by the job function returned by :meth:`wrap`, and
+    results are recorded with :meth:`record_result` to count tokens.
+
+    Attributes:
+        pid (int): Process id of the Ollama server, or None when no local
+            server was found.
+        interval (float): Seconds between samples.
+        samples (list): ResourceSample of every interval sampled.
+    """
+
+    def __init__(self, pid: Optional[int] = None, interval: float = 0.5,
+                 proc_root: str = "/proc"):
+        """
+        Initialize ResourceSampler instance.
+
+        Args:
+            pid (int, optional): Process id of the Ollama server. Defaults
+                to the first local process named ``ollama``.
+            interval (float, optional): Seconds between samples.
+            proc_root (str, optional): Mount point of the proc filesystem.
+        """
+        self.proc_root = proc_root
+        self.pid = pid if pid is not None else self.find_ollama_pid(proc_root)
+        self.interval = interval
+        self.samples: List[ResourceSample] = []
+        self._tokens: Dict[str, int] = {}
+        self._in_flight: Dict[int, Tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    @staticmethod
+    def find_ollama_pid(proc_root: str = "/proc") -> Optional[int]:
+        """
+        Find the local Ollama server process.
+
+        Args:
+            proc_root (str, optional): Mount point of the proc filesystem.
+
+        Returns:
+            int: The lowest process id named ``ollama``, or None if there is
+            none or /proc is not available.
+        """
+        try:
+            pids = sorted(int(entry) for entry in os.listdir(proc_root) if entry.isdigit())
+        except OSError:
+            return None
+        for pid in pids:
+            try:
+                with open(os.path.join(proc_root, str(pid), "comm")) as comm_file:
+                    if comm_file.read().strip() == "ollama":
+                        return pid
+            except OSError:
+                continue
+        return None
+
+    @property
+    def is_supported(self) -> bool:
+        """
+        Whether the Ollama server process can be sampled.
+        """
+        return self.pid is not None and os.path.exists(
+            os.path.join(self.proc_root, str(self.pid), "stat"))
+
+    def _read(self, *path: str) -> str:
+        with open(os.path.join(self.proc_root, *path)) as proc_file:
+            return proc_file.read()
+
+    def _process_stat(self, pid: int) -> Tuple[int, List[str]]:
+        # The command name may contain spaces, so split after its ")".
+        stat = self._read(str(pid), "stat")
+        fields = stat[stat.rindex(")") + 2:].split()
+        return int(fields[1]), fields
+
+    def _process_tree(self) -> Dict[int, List[str]]:
+        """
+        Read the stat fields of the server process and all its descendants.
+        """
+        stats, parents = {}, {}
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            try:
+                parent, fields = self._process_stat(int(entry))
+            except (OSError, ValueError):
+                continue
+            stats[int(entry)], parents[int(entry)] = fields, parent
+        tree, frontier = {}, [self.pid]
+        while frontier:
+            pid = frontier.pop()
+            if pid in stats and pid not in tree:
+                tree[pid] = stats[pid]
+                frontier.extend(child for child, parent in parents.items() if parent == pid)
+        return tree
+
+    def current_rss(self) -> int:
+        """
+        Resident set size of the server process and its descendants now.
+
+        Returns:
+            int: The resident set size in bytes.
+        """
+        return sum(int(fields[21]) for fields in self._process_tree().values()) * self._page_size
+
+    def _counters(self) -> Dict[str, float]:
+        # majflt, utime, stime and rss are fields 12, 14, 15 and 24 of
+        # proc(5), i.e. 9, 11, 12 and 21 after the command name.
+        tree = self._process_tree()
+        cpu_ticks = sum(int(fields[11]) + int(fields[12]) for fields in tree.values())
+        host = [int(value) for value in self._read("stat").splitlines()[0].split()[1:]]
+        return {
+            "time": time.monotonic(),
+            "cpu_seconds": cpu_ticks / self._clock_ticks,
+            "rss": sum(int(fields[21]) for fields in tree.values()) * self._page_size,
+            "major_faults": sum(int(fields[9]) for fields in tree.values()),
+            # idle and iowait are the 4th and 5th host counters.
+            "host_busy": sum(host) - host[3] - (host[4] if len(host) > 4 else 0),
+            "host_total": sum(host),
+            "load_average": float(self._read("loadavg").split()[0]),
+        }
+
+    def sample(self) -> Optional[ResourceSample]:
+        """
+        Take one sample, covering the time since the previous one.
+
+        Returns:
+            ResourceSample: The new sample, or None for the first call,
+            which only sets the starting counters.
+        """
+        counters = self._counters()
+        previous, self._previous = self._previous, counters
+        if previous is None:
+            return None
+        elapsed = counters["time"] - previous["time"]
+        cpu_seconds = max(0.0, counters["cpu_seconds"] - previous["cpu_seconds"])
+        host_total = counters["host_total"] - previous["host_total"]
+        with self._lock:
+            jobs = tuple(self._in_flight.values())
+        sample = ResourceSample(
+            time=counters["time"],
+            jobs=jobs,
+            process_cpu=cpu_seconds / elapsed if elapsed > 0 else 0.0,
+            process_cpu_seconds=cpu_seconds,
+            process_rss=counters["rss"],
+            major_faults=max(0, counters["major_faults"] - previous["major_faults"]),
+            host_cpu=(counters["host_busy"] - previous["host_busy"]) / host_total
+            if host_total > 0 else 0.0,
+            load_average=counters["load_average"],
+        )
+        self.samples.append(sample)
+        return sample
+
+    def start(self) -> None:
+        """
+        Start sampling on a background thread.
+        """
+        if not self.is_supported:
+            print("Resource sampling needs a local Ollama server and /proc. Skipping it.")
+            return
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample_quietly()
+
+    def _sample_quietly(self) -> None:
+        try:
+            self.sample()
+        except (OSError, ValueError, IndexError):
+            # The server (or a runner) exited between listing and reading.
+            pass
+
+    def stop(self) -> None:
+        """
+        Stop sampling, taking a last sample of the final interval.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._sample_quietly()
+
+    def wrap(self, job_function: Callable) -> Callable:
+        """
+        Wrap a job function to mark its job in flight while it runs.
+
+        Only measured jobs are marked: cold-start and warmup requests load
+        and unload models without their tokens being recorded, so counting
+        their CPU would bias tokens per CPU second low.
+
+        Args:
+            job_function (callable): Called with a BenchmarkJob and any
+                further arguments.
+
+        Returns:
+            callable: The wrapped job function.
+        """
+        def sampled_job(job, *args):
+            if job.phase != MEASURE:
+                return job_function(job, *args)
+            with self._lock:
+                self._in_flight[job.index] = (job.model, job.prompt, job.media)
+            try:
+                return job_function(job, *args)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(job.index, None)
+        return sampled_job
+
+    def record_result(self, model: str, benchmark_result) -> None:
+        """
+        Count the tokens a model generated for a result.
+
+        Args:
+            model (str): Model name.
+            benchmark_result (OllamaResult): Result of the Ollama request.
+        """
+        eval_count = benchmark_result.timing_metrics.eval_count
+        if eval_count:
+            self._tokens[model] = self._tokens.get(model, 0) + eval_count
+
+    def model_resources(self, model: str) -> ModelResources:
+        """
+        Summarize the samples taken while a model had jobs in flight.
+
+        Args:
+            model (str): Model name.
+
+        Returns:
+            ModelResources: The model's peak memory, CPU and tokens per CPU-second.
+        """
+        resources = ModelResources(model, tokens=self._tokens.get(model, 0))
+        cpu, host_cpu = [], []
+        for sample in self.samples:
+            models = [job[0] for job in sample.jobs]
+            if model not in models:
+                continue
+            resources.samples += 1
+            resources.peak_rss = max(resources.peak_rss, sample.process_rss)
+            resources.cpu_seconds += sample.process_cpu_seconds * models.count(model) / len(models)
+            resources.major_faults += sample.major_faults
+            resources.peak_load_average = max(resources.peak_load_average, sample.load_average)
+            cpu.append(sample.process_cpu)
+            host_cpu.append(sample.host_cpu)
+        if resources.samples:
+            resources.mean_cpu = statistics.fmean(cpu)
+            resources.mean_host_cpu = statistics.fmean(host_cpu)
+        return resources
+
+    def print_report(self, model: str) -> Optional[ModelResources]:
+        """
+        Print the resource use of one model.
+
+        Args:
+            model (str): Model name.
+
+        Returns:
+            ModelResources: The summary, or None if no sample had the model
+            in flight.
+        """
+        resources = self.model_resources(model)
+        if not resources.samples:
+            return None
+        print(f"◽ Peak RSS:\t{resources.peak_rss / 1024 ** 3:.2f}GB\t🧠")
+        print(f"◽ Avg CPU:\t{resources.mean_cpu:.2f} cores "
+              f"({resources.mean_host_cpu:.0%} of host)\t🔥")
+        print(f"◽ Major faults:\t{resources.major_faults}\t💾")
+        print(f"◽ Peak load:\t{resources.peak_load_average:.2f}\t⚖️")
+        if resources.tokens_per_cpu_second is not None:
+            print(f"◽ Tokens/CPU-s:\t{resources.tokens_per_cpu_second:.2f}\t📈")
+        print()
+        return resources
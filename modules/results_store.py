@@ -0,0 +1,268 @@
+# Standard library imports.
+import datetime
+import hashlib
+import json
+import platform
+import socket
+import sqlite3
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, Optional
+
+# Default location of the results database.
+DEFAULT_RESULTS_DB = "results.db"
+
+# Per-result metric columns, in addition to the identifying columns.
+METRIC_COLUMNS = (
+    "total_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration",
+    "prompt_eval_rate", "eval_count", "eval_duration", "eval_rate", "wall_time",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    host TEXT,
+    cpu TEXT,
+    ollama_version TEXT,
+    backend TEXT,
+    config_path TEXT,
+    config_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    recorded_at TEXT NOT NULL,
+    model TEXT NOT NULL,
+    model_digest TEXT,
+    prompt TEXT NOT NULL,
+    media TEXT NOT NULL,
+    {metric_columns},
+    response TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS results_series ON results (model, prompt, media, recorded_at);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+""".format(metric_columns=",\n    ".join(f"{column} REAL" for column in METRIC_COLUMNS))
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds")
+
+
+def cpu_model() -> str:
+    """
+    Describe the host CPU.
+
+    Returns:
+        str: The CPU model name from /proc/cpuinfo where available,
+        otherwise what the platform module reports.
+    """
+    try:
+        with open("/proc/cpuinfo", "r") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def config_hash(yaml_file_path: str) -> str:
+    """
+    Hash a benchmark configuration file.
+
+    Args:
+        yaml_file_path (str): Path to the YAML configuration file.
+
+    Returns:
+        str: The hex SHA-256 digest of the file contents.
+    """
+    with open(yaml_file_path, "rb") as yaml_file:
+        return hashlib.sha256(yaml_file.read()).hexdigest()
+
+
+@dataclass
+class RunMetadata:
+    """
+    Metadata describing one benchmark run.
+
+    Attributes:
+        run_id (str): Unique identifier of the run.
+        started_at (str): UTC ISO 8601 timestamp of the start of the run.
+        host (str): Host name of the machine running the benchmark.
+        cpu (str): CPU model of the machine running the benchmark.
+        ollama_version (str): Version reported by the Ollama server or CLI.
+        backend (str): The Ollama backend name.
+        config_path (str): Path of the YAML configuration file.
+        config_hash (str): SHA-256 of the YAML configuration file.
+    """
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: str = field(default_factory=_now)
+    host: str = field(default_factory=socket.gethostname)
+    cpu: str = field(default_factory=cpu_model)
+    ollama_version: Optional[str] = None
+    backend: Optional[str] = None
+    config_path: Optional[str] = None
+    config_hash: Optional[str] = None
+
+
+class ResultsStore:
+    """
+    Append-only SQLite store of benchmark results across runs.
+
+    Each run gets a row of RunMetadata and each completed benchmark cell a
+    row of timing metrics, written and committed as soon as the cell
+    completes. Queries stream rows from the database rather than loading the
+    whole history into memory.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULTS_DB):
+        """
+        Initialize ResultsStore instance, creating the database if needed.
+
+        Args:
+            path (str, optional): Path of the SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(_SCHEMA)
+
+    def start_run(self, metadata: RunMetadata) -> str:
+        """
+        Record the metadata of a new run.
+
+        Args:
+            metadata (RunMetadata): The run metadata.
+
+        Returns:
+            str: The run identifier.
+        """
+        row = asdict(metadata)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values()))
+        return metadata.run_id
+
+    def record(self, run_id: str, model: str, prompt: str, media: str,
+               metrics: Dict, model_digest: Optional[str] = None,
+               response: Optional[str] = None, extra: Optional[Dict] = None) -> None:
+        """
+        Append the result of one benchmark cell.
+
+        Args:
+            run_id (str): The run identifier from start_run().
+            model (str): The model name.
+            prompt (str): The prompt.
+            media (str): The media file name.
+            metrics (dict): Metric values keyed by METRIC_COLUMNS names.
+                Unknown keys are ignored.
+            model_digest (str, optional): The digest of the model.
+            response (str, optional): The model output.
+            extra (dict, optional): Any other JSON serializable values.
+        """
+        values = [metrics.get(column) for column in METRIC_COLUMNS]
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO results (run_id, recorded_at, model, model_digest, prompt, media, "
+                f"{', '.join(METRIC_COLUMNS)}, response, extra) "
+                f"VALUES ({', '.join('?' * (8 + len(METRIC_COLUMNS)))})",
+                (run_id, _now(), model, model_digest, prompt, media, *values, response,
+                 json.dumps(extra) if extra else None))
+
+    def record_result(self, run_id: str, model: str, prompt: str, media: str,
+                      benchmark_result, model_digest: Optional[str] = None,
+                      extra: Optional[Dict] = None) -> None:
+        """
+        Append the result of one benchmark cell from its Ollama result.
+
+        Args:
+            run_id (str): The run identifier from start_run().
+            model (str): The model name.
+            prompt (str): The prompt.
+            media (str): The media file name.
+            benchmark_result (OllamaResult): Result of the Ollama request.
+            model_digest (str, optional): The digest of the model.
+            extra (dict, optional): Any other JSON serializable values.
+        """
+        metrics = benchmark_result.timing_metrics.as_dict()
+        metrics["wall_time"] = getattr(benchmark_result, "wall_time", None)
+        self.record(run_id, model, prompt, media, metrics, model_digest,
+                    getattr(benchmark_result, "response", None), extra)
+
+    def runs(self) -> Iterator[Dict]:
+        """
+        Iterate over the recorded runs, oldest first.
+
+        Yields:
+            dict: RunMetadata fields of each run.
+        """
+        yield from self._iterate("SELECT * FROM runs ORDER BY started_at", ())
+
+    def query(self, model: Optional[str] = None, prompt: Optional[str] = None,
+              media: Optional[str] = None, run_id: Optional[str] = None,
+              metric: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterate over stored results matching the given filters, oldest first.
+
+        Args:
+            model (str, optional): Only results for this model.
+            prompt (str, optional): Only results for this prompt.
+            media (str, optional): Only results for this media file.
+            run_id (str, optional): Only results from this run.
+            metric (str, optional): Only return this metric column alongside
+                the identifying columns and run metadata, skipping results
+                where it is missing.
+
+        Yields:
+            dict: One row per result, joined with its run metadata.
+        """
+        if metric is not None and metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRIC_COLUMNS}")
+
+        if metric is None:
+            columns = "results.*"
+        else:
+            columns = (f"results.run_id, results.recorded_at, results.model, results.model_digest, "
+                       f"results.prompt, results.media, results.{metric}")
+        conditions, parameters = [], []
+        for column, value in (("model", model), ("prompt", prompt),
+                              ("media", media), ("run_id", run_id)):
+            if value is not None:
+                conditions.append(f"results.{column} = ?")
+                parameters.append(value)
+        if metric is not None:
+            conditions.append(f"results.{metric} IS NOT NULL")
+
+        sql = (f"SELECT {columns}, runs.host, runs.cpu, runs.ollama_version, runs.config_hash "
+               f"FROM results JOIN runs USING (run_id)")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY results.recorded_at, results.id"
+        yield from self._iterate(sql, parameters)
+
+    def _iterate(self, sql: str, parameters) -> Iterator[Dict]:
+        """
+        Stream query rows in batches instead of fetching them all at once.
+        """
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+            rows = cursor.fetchmany(256)
+        while rows:
+            for row in rows:
+                yield dict(row)
+            with self._lock:
+                rows = cursor.fetchmany(256)
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._connection.close()
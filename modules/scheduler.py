@@ -0,0 +1,208 @@
+# Standard library imports.
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Job phases. Cold-start and warmup jobs run before a model's measured jobs
+# and are kept out of its statistics.
+COLD = "cold"
+WARMUP = "warmup"
+MEASURE = "measure"
+
+
+@dataclass(frozen=True)
+class BenchmarkJob:
+    """
+    A single (model, options, prompt, media) cell of the benchmark matrix.
+
+    Attributes:
+        index (int): Position of the job in the expanded matrix.
+        model (str): The name of the model to use.
+        prompt (str): The prompt for the benchmark.
+        media (str): The media file name from the YAML configuration.
+        phase (str): COLD, WARMUP or MEASURE.
+        repetition (int): Which repetition of the cell this job is.
+        options (tuple): Ollama runtime options of the request as sorted
+            (name, value) pairs, empty for the model's defaults.
+    """
+    index: int
+    model: str
+    prompt: str
+    media: str
+    phase: str = MEASURE
+    repetition: int = 0
+    options: Tuple[Tuple[str, object], ...] = ()
+
+
+class JobScheduler:
+    """
+    Runs benchmark jobs on a thread pool with a per-model concurrency limit.
+
+    Jobs are dispatched in matrix order whenever a worker and a slot for the
+    job's model are free, and results are yielded back in matrix order no
+    matter which job finishes first. With the defaults every job runs strictly
+    one after another, matching the original nested loops.
+
+    Cold-start and warmup jobs run alone: they wait for the model's other
+    jobs in flight to finish, and nothing else for that model is dispatched
+    until they complete. Jobs of a model with different runtime options
+    never run together, and a model's jobs start in matrix order.
+
+    Attributes:
+        workers (int): Maximum number of jobs in flight overall.
+        per_model_concurrency (int): Maximum number of jobs in flight per model.
+        max_models_in_flight (int): Maximum number of different models with
+            jobs in flight, or None for no limit.
+    """
+
+    def __init__(self, workers: int = 1, per_model_concurrency: Optional[int] = None,
+                 max_models_in_flight: Optional[int] = None):
+        """
+        Initialize JobScheduler instance.
+
+        Args:
+            workers (int, optional): Size of the worker pool. Defaults to 1.
+            per_model_concurrency (int, optional): Maximum number of jobs in
+                flight per model. Defaults to the number of workers.
+            max_models_in_flight (int, optional): Maximum number of different
+                models with jobs in flight, so memory-constrained hosts do
+                not have to hold more models than fit. Defaults to no limit.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if per_model_concurrency is not None and per_model_concurrency < 1:
+            raise ValueError("per_model_concurrency must be at least 1")
+        if max_models_in_flight is not None and max_models_in_flight < 1:
+            raise ValueError("max_models_in_flight must be at least 1")
+        self.workers = workers
+        self.per_model_concurrency = per_model_concurrency or workers
+        self.max_models_in_flight = max_models_in_flight
+
+    @staticmethod
+    def expand_jobs(models: List[str], prompts: List[str], media: List[str],
+                    repetitions: int = 1, warmup: int = 0, cold_start: bool = False,
+                    option_sets: Optional[List[Tuple]] = None) -> List[BenchmarkJob]:
+        """
+        Expand the configured models, options, prompts and media into a job list.
+
+        Args:
+            models (list): Model names.
+            prompts (list): Prompts.
+            media (list): Media file names.
+            repetitions (int, optional): Number of measured runs of each cell.
+            warmup (int, optional): Number of unmeasured runs of the first
+                cell ahead of each model's measured runs.
+            cold_start (bool, optional): Add a COLD job ahead of each model's
+                warmup, for measuring the load of an evicted model.
+            option_sets (list, optional): Option combinations to run every
+                cell with, from ``expand_options``. Ollama reloads a model
+                whose runtime options change, so the warmup is repeated
+                ahead of each combination. Defaults to the model's defaults.
+
+        Returns:
+            list: BenchmarkJob objects in model → options → prompt → media →
+            repetition order, each model's COLD job and each combination's
+            WARMUP jobs first.
+        """
+        if repetitions < 1:
+            raise ValueError("repetitions must be at least 1")
+        if warmup < 0:
+            raise ValueError("warmup must not be negative")
+
+        jobs = []
+        for model in models:
+            for option_index, options in enumerate(option_sets or [()]):
+                phases = [COLD] * (cold_start and not option_index) + [WARMUP] * warmup
+                for repetition, phase in enumerate(phases):
+                    jobs.append(BenchmarkJob(len(jobs), model, prompts[0], media[0],
+                                             phase, repetition, options))
+                for prompt in prompts:
+                    for media_file in media:
+                        for repetition in range(repetitions):
+                            jobs.append(BenchmarkJob(len(jobs), model, prompt, media_file,
+                                                     MEASURE, repetition, options))
+        return jobs
+
+    def run(self, jobs: List[BenchmarkJob],
+            job_function: Callable[[BenchmarkJob], object]) -> Iterator[Tuple[BenchmarkJob, object]]:
+        """
+        Run every job and yield the results in job order.
+
+        Each result is yielded as soon as it and all jobs before it have
+        finished, so sequential runs still report progress per job.
+
+        Args:
+            jobs (list): The BenchmarkJob objects to run.
+            job_function (callable): Called with each job on a worker thread.
+
+        Yields:
+            tuple: The job and the value returned by job_function.
+
+        Raises:
+            Exception: The first exception raised by job_function, re-raised
+                in job order. Jobs that have not started yet are cancelled.
+        """
+        pending = deque(jobs)
+        in_flight: Dict = {}
+        model_in_flight: Dict[str, int] = {}
+        # Runtime options of each model's jobs in flight.
+        model_options: Dict[str, Tuple] = {}
+        exclusive_models: Set[str] = set()
+        finished: Dict[int, object] = {}
+        order = [job.index for job in jobs]
+        jobs_by_index = {job.index: job for job in jobs}
+        next_position = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while next_position < len(order):
+                self._dispatch(executor, pending, in_flight, model_in_flight,
+                               model_options, exclusive_models, job_function)
+
+                next_index = order[next_position]
+                if next_index in finished:
+                    next_position += 1
+                    yield jobs_by_index[next_index], finished.pop(next_index).result()
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    model_in_flight[job.model] -= 1
+                    if job.phase != MEASURE:
+                        exclusive_models.discard(job.model)
+                    finished[job.index] = future
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _dispatch(self, executor, pending, in_flight, model_in_flight, model_options,
+                  exclusive_models, job_function) -> None:
+        """
+        Submit pending jobs while workers and per-model slots are free.
+        """
+        skipped = []
+        held_models = set()
+        while pending and len(in_flight) < self.workers:
+            job = pending.popleft()
+            running = model_in_flight.get(job.model, 0)
+            exclusive = job.phase != MEASURE
+            models_running = sum(1 for count in model_in_flight.values() if count)
+            # Once a job is held back, the model's later jobs wait behind it,
+            # so no measured job overtakes its warmup. Jobs with other
+            # runtime options wait too: Ollama would reload the model.
+            if (job.model in held_models
+                    or running >= self.per_model_concurrency or job.model in exclusive_models
+                    or (running and (exclusive or model_options[job.model] != job.options))
+                    or (not running and self.max_models_in_flight is not None
+                        and models_running >= self.max_models_in_flight)):
+                skipped.append(job)
+                held_models.add(job.model)
+                continue
+            if exclusive:
+                exclusive_models.add(job.model)
+            model_in_flight[job.model] = running + 1
+            model_options[job.model] = job.options
+            in_flight[executor.submit(job_function, job)] = job
+        # Jobs held back by their model's limit keep their place in line.
+        pending.extendleft(reversed(skipped))
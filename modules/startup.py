@@ -0,0 +1,107 @@
+# Standard library imports.
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# Directory holding llava_benchmark.py, where the statements are run.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that take seconds and hundreds of MB to import. Only call audio
+# runs should load them.
+HEAVY_MODULES = ("whisper", "torch", "numba")
+
+# Run in a fresh interpreter to time one import and report peak RSS.
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+peak_rss_mb = None
+try:
+    # VmHWM starts over at exec, unlike ru_maxrss on Linux, which keeps the
+    # peak of the process that started this interpreter.
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                peak_rss_mb = int(line.split()[1]) / 1024
+except OSError:
+    try:
+        import resource
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (
+            1024 * 1024 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        pass
+print(json.dumps({{"seconds": seconds, "peak_rss_mb": peak_rss_mb,
+                  "heavy_modules": [name for name in {heavy_modules!r} if name in sys.modules]}}))
+"""
+
+
+@dataclass
+class StartupTiming:
+    """
+    Import cost of a statement in a fresh interpreter.
+
+    Attributes:
+        statement (str): The measured import statement.
+        seconds (float): Median seconds the statement took.
+        peak_rss_mb (float): Median peak resident set size of the
+            interpreter in MB, or None where it cannot be measured.
+        heavy_modules (list): HEAVY_MODULES the statement imported.
+    """
+    statement: str
+    seconds: float
+    peak_rss_mb: Optional[float]
+    heavy_modules: List[str]
+
+
+def measure_startup(statement: str = "import llava_benchmark",
+                    repetitions: int = 3) -> StartupTiming:
+    """
+    Measure the time and memory an import statement costs at startup.
+
+    Each repetition runs in a new interpreter, so nothing is already
+    imported; the operating system file cache stays warm after the first.
+
+    Args:
+        statement (str, optional): The import statement to measure.
+            Defaults to importing the command line entry point.
+        repetitions (int, optional): Number of interpreters to start.
+
+    Returns:
+        StartupTiming: The median import time and peak RSS.
+    """
+    probes = []
+    for _ in range(repetitions):
+        completed_process = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement,
+                                                 heavy_modules=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=REPO_ROOT)
+        probes.append(json.loads(completed_process.stdout.strip().splitlines()[-1]))
+    rss = [probe["peak_rss_mb"] for probe in probes if probe["peak_rss_mb"] is not None]
+    return StartupTiming(
+        statement=statement,
+        seconds=statistics.median(probe["seconds"] for probe in probes),
+        peak_rss_mb=statistics.median(rss) if rss else None,
+        heavy_modules=probes[-1]["heavy_modules"],
+    )
+
+
+def print_startup(timings: Sequence[StartupTiming]) -> None:
+    """
+    Print the startup time and memory of each measured statement.
+
+    Args:
+        timings (sequence): StartupTiming of each statement.
+    """
+    print(f"{'-' * 40}\nStartup cost 🚀\n{'-' * 40}")
+    for timing in timings:
+        rss = f"{timing.peak_rss_mb:.0f}MB" if timing.peak_rss_mb is not None else "-"
+        heavy = ", ".join(timing.heavy_modules) or "none"
+        print(f"  {timing.statement}")
+        print(f"    {timing.seconds:.3f}s, peak RSS {rss}, heavy modules: {heavy}")
+    print()
@@ -0,0 +1,196 @@
+# Standard library imports.
+import math
+from typing import Optional, Sequence, Tuple
+
+# Third party imports.
+import numpy as np
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """
+    Calculate a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values (sequence): The sample values. Need not be sorted.
+        p (float): The percentile to calculate, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def student_t_quantile(confidence: float, df: int) -> float:
+    """
+    Two-sided critical value of Student's t distribution.
+
+    The central probability ``P(|T| < t)`` has a closed form for integer
+    degrees of freedom (Abramowitz and Stegun 26.7.3), which is inverted
+    by bisection.
+
+    Args:
+        confidence (float): Central probability, e.g. 0.95.
+        df (int): Degrees of freedom, at least 1.
+
+    Returns:
+        float: The t such that ``P(|T| < t) = confidence``.
+    """
+    if df < 1:
+        raise ValueError("df must be at least 1")
+
+    def central(t):
+        theta = math.atan(t / math.sqrt(df))
+        cos2 = math.cos(theta) ** 2
+        if df % 2:
+            total, term = 0.0, math.cos(theta)
+            for k in range(1, (df - 1) // 2 + 1):
+                total += term
+                term *= cos2 * 2 * k / (2 * k + 1)
+            return 2 / math.pi * (theta + math.sin(theta) * total)
+        total, term = 0.0, 1.0
+        for k in range(1, df // 2 + 1):
+            total += term
+            term *= cos2 * (2 * k - 1) / (2 * k)
+        return math.sin(theta) * total
+
+    lower, upper = 0.0, 1.0
+    while central(upper) < confidence:
+        upper *= 2
+    for _ in range(100):
+        middle = (lower + upper) / 2
+        if central(middle) < confidence:
+            lower = middle
+        else:
+            upper = middle
+    return (lower + upper) / 2
+
+
+def relative_interval_width(values: Sequence[float], confidence: float = 0.95) -> float:
+    """
+    Width of the t confidence interval of the mean, relative to the mean.
+
+    Args:
+        values (sequence): The sample values.
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+
+    Returns:
+        float: The full interval width divided by the absolute mean, or
+        infinity with fewer than two values or a zero mean.
+    """
+    if len(values) < 2:
+        return math.inf
+    sample = np.asarray(values, dtype=float)
+    mean = abs(sample.mean())
+    if not mean:
+        return math.inf
+    half_width = (student_t_quantile(confidence, len(sample) - 1)
+                  * sample.std(ddof=1) / math.sqrt(len(sample)))
+    return float(2 * half_width / mean)
+
+
+def bootstrap_relative_difference(baseline: Sequence[float], candidate: Sequence[float],
+                                  confidence: float = 0.95, resamples: int = 2000,
+                                  seed: Optional[int] = 0) -> Tuple[float, float]:
+    """
+    Bootstrap a confidence interval for the relative difference of two means.
+
+    Both samples are resampled with replacement and the relative difference
+    ``(mean(candidate) - mean(baseline)) / mean(baseline)`` is computed for
+    each resample.
+
+    Args:
+        baseline (sequence): The baseline sample.
+        candidate (sequence): The candidate sample.
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+        resamples (int, optional): Number of bootstrap resamples.
+        seed (int, optional): Random seed, for reproducible intervals.
+
+    Returns:
+        tuple: Lower and upper bounds of the interval.
+    """
+    rng = np.random.default_rng(seed)
+    baseline = np.asarray(baseline, dtype=float)
+    candidate = np.asarray(candidate, dtype=float)
+    baseline_means = rng.choice(baseline, (resamples, len(baseline))).mean(axis=1)
+    candidate_means = rng.choice(candidate, (resamples, len(candidate))).mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        differences = (candidate_means - baseline_means) / baseline_means
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(differences, [alpha, 1 - alpha])
+    return float(lower), float(upper)
+
+
+def permutation_test(baseline: Sequence[float], candidate: Sequence[float],
+                     permutations: int = 2000, seed: Optional[int] = 0) -> float:
+    """
+    Two-sided permutation test for a difference in means.
+
+    Args:
+        baseline (sequence): The baseline sample.
+        candidate (sequence): The candidate sample.
+        permutations (int, optional): Number of random relabellings.
+        seed (int, optional): Random seed, for reproducible p-values.
+
+    Returns:
+        float: The p-value of the observed difference in means.
+    """
+    rng = np.random.default_rng(seed)
+    pooled = np.concatenate((np.asarray(baseline, dtype=float),
+                             np.asarray(candidate, dtype=float)))
+    split = len(baseline)
+    observed = abs(pooled[split:].mean() - pooled[:split].mean())
+
+    shuffled = np.tile(pooled, (permutations, 1))
+    rng.permuted(shuffled, axis=1, out=shuffled)
+    differences = np.abs(shuffled[:, split:].mean(axis=1) - shuffled[:, :split].mean(axis=1))
+    # Count the observed labelling itself so the p-value is never zero.
+    return float((np.sum(differences >= observed - 1e-12) + 1) / (permutations + 1))
+
+
+def batch_edit_distance(predictions: Sequence[str], references: Sequence[str]) -> np.ndarray:
+    """
+    Levenshtein distance of many string pairs at once.
+
+    The dynamic programming table is filled for every pair in parallel, one
+    numpy operation per cell position, instead of one Python loop per pair.
+
+    Args:
+        predictions (sequence): The predicted strings.
+        references (sequence): The reference strings, paired by position.
+
+    Returns:
+        numpy.ndarray: The edit distance of each pair.
+    """
+    count = len(predictions)
+    if count != len(references):
+        raise ValueError("predictions and references must have the same length")
+    if not count:
+        return np.zeros(0, dtype=int)
+
+    def encode(strings, pad):
+        width = max(1, max(len(string) for string in strings))
+        codes = np.full((len(strings), width), pad, dtype=np.int64)
+        for row, string in enumerate(strings):
+            codes[row, :len(string)] = [ord(character) for character in string]
+        return codes, np.array([len(string) for string in strings])
+
+    # Different pads so padding never matches padding.
+    left, left_lengths = encode(predictions, -1)
+    right, right_lengths = encode(references, -2)
+    rows, columns = left.shape[1], right.shape[1]
+
+    table = np.zeros((count, rows + 1, columns + 1), dtype=np.int64)
+    table[:, :, 0] = np.arange(rows + 1)
+    table[:, 0, :] = np.arange(columns + 1)
+    for i in range(1, rows + 1):
+        for j in range(1, columns + 1):
+            substitution = table[:, i - 1, j - 1] + (left[:, i - 1] != right[:, j - 1])
+            table[:, i, j] = np.minimum(
+                np.minimum(table[:, i - 1, j], table[:, i, j - 1]) + 1, substitution)
+    return table[np.arange(count), left_lengths, right_lengths]
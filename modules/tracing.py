@@ -0,0 +1,194 @@
+# Standard library imports.
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple
+
+# Local library imports.
+from .stats import percentile
+
+# Shared context manager returned by disabled tracers, so a disabled span
+# costs one attribute check and no allocation.
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class SpanRecord(NamedTuple):
+    """
+    One finished span.
+
+    Attributes:
+        name (str): The stage name.
+        thread_id (int): Identifier of the thread the span ran on.
+        start_ns (int): perf_counter_ns() when the span started.
+        duration_ns (int): Nanoseconds the span lasted.
+        args (dict): Extra details shown with the span in trace viewers.
+    """
+    name: str
+    thread_id: int
+    start_ns: int
+    duration_ns: int
+    args: Dict
+
+
+class _Span:
+    """
+    Context manager timing one stage of an enabled tracer.
+    """
+    __slots__ = ("tracer", "name", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end_ns = time.perf_counter_ns()
+        # list.append is atomic, so spans from worker threads need no lock.
+        self.tracer.spans.append(SpanRecord(
+            self.name, threading.get_ident(), self.start_ns, end_ns - self.start_ns, self.args))
+        return False
+
+
+class Tracer:
+    """
+    Records nested timing spans around the stages of a benchmark run.
+
+    Stages are wrapped in ``with tracer.span("name"):`` blocks. A disabled
+    tracer hands out a shared no-op context manager, so the instrumentation
+    can stay in the hot path of every run. An enabled tracer keeps every
+    span for a per-stage summary and a Chrome trace that opens in
+    chrome://tracing, Perfetto or speedscope.
+
+    Attributes:
+        enabled (bool): Whether spans are recorded.
+        spans (list): SpanRecord of every finished span.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize Tracer instance.
+
+        Args:
+            enabled (bool, optional): Record spans. Defaults to False.
+        """
+        self.enabled = enabled
+        self.spans: List[SpanRecord] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._thread_names: Dict[int, str] = {}
+
+    def enable(self) -> None:
+        """
+        Start recording spans, discarding any recorded so far.
+        """
+        self.spans = []
+        self._origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop recording spans. Recorded spans are kept.
+        """
+        self.enabled = False
+
+    def span(self, name: str, **args):
+        """
+        Time a stage.
+
+        Args:
+            name (str): The stage name, e.g. ``ollama.run``.
+            **args: Extra details recorded with the span, e.g. the model.
+
+        Returns:
+            A context manager timing the ``with`` block.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        return _Span(self, name, args)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded spans by stage.
+
+        Returns:
+            dict: Mapping of stage names to their count and their total,
+            mean and 95th percentile duration in seconds, in order of
+            decreasing total.
+        """
+        durations: Dict[str, List[float]] = {}
+        for record in self.spans:
+            durations.setdefault(record.name, []).append(record.duration_ns / 1e9)
+        summary = {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "p95": percentile(values, 95),
+            }
+            for name, values in durations.items()
+        }
+        return dict(sorted(summary.items(), key=lambda item: item[1]["total"], reverse=True))
+
+    def print_summary(self) -> None:
+        """
+        Print the per-stage timing breakdown.
+        """
+        summary = self.summary()
+        if not summary:
+            return
+        width = max(24, max(len(name) for name in summary) + 2)
+        print(f"{'-' * 40}\nStage timing ⏱️\n{'-' * 40}")
+        print(f"{'stage':<{width}}{'count':>7}{'total':>10}{'mean':>10}{'p95':>10}")
+        for name, stats in summary.items():
+            print(f"{name:<{width}}{stats['count']:>7}{stats['total']:>9.3f}s"
+                  f"{stats['mean']:>9.3f}s{stats['p95']:>9.3f}s")
+        print()
+
+    def chrome_trace(self) -> Dict:
+        """
+        Build a Chrome trace of the recorded spans.
+
+        Returns:
+            dict: A trace in the Chrome Trace Event format, with one
+            complete ("X") event per span and timestamps in microseconds
+            from when the tracer was enabled.
+        """
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+             "args": {"name": thread_name}}
+            for thread_id, thread_name in self._thread_names.items()
+        ]
+        for record in sorted(self.spans, key=lambda record: record.start_ns):
+            events.append({
+                "name": record.name,
+                "cat": record.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (record.start_ns - self._origin_ns) / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": {key: str(value) for key, value in record.args.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, trace_file_path: str) -> None:
+        """
+        Write the Chrome trace of the recorded spans to a JSON file.
+
+        Args:
+            trace_file_path (str): Where to write the trace.
+        """
+        with open(trace_file_path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+
+# The tracer the benchmark stages report to. Disabled unless --trace is given.
+tracer = Tracer()
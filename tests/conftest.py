@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+# Timing fields returned by the stub server, in nanoseconds like the real
+# Ollama API. eval_count / eval_duration works out to 61.62 tokens/s.
+STUB_METRICS = {
+    "total_duration": 538551300,
+    "load_duration": 11508000,
+    "prompt_eval_count": 1,
+    "prompt_eval_duration": 459674000,
+    "eval_count": 4,
+    "eval_duration": 64913000,
+}
+# Load duration the stub reports for a request that only loads a model.
+STUB_LOAD_DURATION = 2500000000
+
+
+class OllamaStubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the Ollama REST API.
+
+    Answers /api/tags, /api/version, /api/ps, /api/generate and /api/chat with canned
+    JSON (or a word-per-chunk stream when the request asks for one) and
+    records every request body and client port, and counts inventory
+    requests, on the server object. Setting ``down`` on the server makes it
+    drop every request.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, body, status=200):
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def _send_stream(self, payload):
+        # Stream one word per chunk with chunked transfer encoding, like the
+        # real API, pausing server.stream_delay seconds between chunks.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = self.server.response_text.split(" ")
+        chunks = [{"model": payload["model"], "response": word if i == 0 else " " + word,
+                   "done": False} for i, word in enumerate(words)]
+        chunks.append(dict(STUB_METRICS, model=payload["model"], response="", done=True))
+        for chunk in chunks:
+            time.sleep(self.server.stream_delay)
+            encoded = json.dumps(chunk).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(encoded):X}\r\n".encode("ascii") + encoded + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _drop_if_down(self):
+        # A host that is down closes the connection without answering.
+        if self.server.down:
+            self.close_connection = True
+        return self.server.down
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        if self._drop_if_down():
+            return
+        if self.path == "/api/tags":
+            self.server.tag_requests += 1
+            self._send_json({"models": [
+                {"name": name, "digest": f"sha256:{i:064x}", "size": 4733363377,
+                 "details": {"family": "llama", "parameter_size": "7B",
+                             "quantization_level": "Q4_0"}}
+                for i, name in enumerate(self.server.models)]})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-stub"})
+        elif self.path == "/api/ps":
+            self._send_json({"models": [{"name": name} for name in sorted(self.server.loaded)]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        self.server.client_ports.add(self.client_address[1])
+        if self._drop_if_down():
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests.append((self.path, payload))
+
+        if self.path == "/api/generate" and "prompt" not in payload:
+            # Load, or with keep_alive=0 unload, the model without generating.
+            body = {"model": payload["model"], "response": "", "done": True}
+            if payload.get("keep_alive") == 0:
+                self.server.loaded.discard(payload["model"])
+            else:
+                self.server.loaded.add(payload["model"])
+                body["load_duration"] = STUB_LOAD_DURATION
+            self._send_json(body)
+            return
+        if payload.get("model"):
+            self.server.loaded.add(payload["model"])
+
+        if self.path == "/api/generate" and payload.get("stream"):
+            self._send_stream(payload)
+        elif self.path == "/api/generate":
+            time.sleep(self.server.response_delay)
+            self._send_json(dict(STUB_METRICS, model=payload["model"],
+                                 response=self.server.response_text, done=True))
+        elif self.path == "/api/chat":
+            self._send_json(dict(STUB_METRICS, model=payload["model"], done=True,
+                                 message={"role": "assistant",
+                                          "content": self.server.response_text}))
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+
+def start_ollama_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStubHandler)
+    server.models = ["llava:latest"]
+    server.response_text = "CRAIG"
+    server.stream_delay = 0
+    server.response_delay = 0
+    server.down = False
+    server.requests = []
+    server.loaded = set()
+    server.tag_requests = 0
+    server.client_ports = set()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_ollama_stub(server):
+    server.shutdown()
+    server.server_close()
+
+
+# This fixture starts a stub Ollama server on a free local port for the
+# duration of a test and yields it. Tests can change the installed models
+# and response text, and inspect the recorded requests and client ports.
+@pytest.fixture
+def ollama_stub():
+    server = start_ollama_stub()
+    yield server
+    stop_ollama_stub(server)
+
+
+# This fixture starts three stub Ollama servers on different ports, for
+# tests of a pool of hosts.
+@pytest.fixture
+def ollama_stubs():
+    servers = [start_ollama_stub() for _ in range(3)]
+    yield servers
+    for server in servers:
+        stop_ollama_stub(server)
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from llava_benchmark import llava_benchmark
+from modules.adaptive import AdaptiveSampler
+from modules.ollama import Ollama, OllamaHTTPBackend, OllamaResult
+from modules.residency import ResidencyPlanner
+from modules.scheduler import BenchmarkJob
+from modules.stats import relative_interval_width, student_t_quantile
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def result(eval_duration, wall_time=1.0):
+    return OllamaResult(model="llava:latest", response="ABC", wall_time=wall_time,
+                        metrics={"eval_count": 100, "eval_duration": eval_duration})
+
+
+@pytest.mark.parametrize("confidence,df,expected", [
+    (0.95, 1, 12.706), (0.95, 2, 4.303), (0.95, 9, 2.262), (0.99, 4, 4.604)])
+def test_student_t_quantile(confidence, df, expected):
+    assert student_t_quantile(confidence, df) == pytest.approx(expected, abs=1e-3)
+
+
+def test_relative_interval_width():
+    # Mean 10, standard error 0.5: width 2 * 12.706 * 0.5 / 10.
+    assert relative_interval_width([9.5, 10.5]) == pytest.approx(1.2706, abs=1e-4)
+    assert relative_interval_width([10.0]) == float("inf")
+
+
+def test_cells_stop_on_convergence_or_budget(capsys):
+    adaptive = AdaptiveSampler(min_samples=3, max_samples=6)
+    stable = BenchmarkJob(0, "llava:latest", "Read the plate:", "1.jpg")
+    noisy = BenchmarkJob(1, "llava:latest", "Read the plate:", "2.jpg")
+    send = adaptive.wrap(lambda job: job.media)
+
+    for repetition in range(6):
+        if send(stable):
+            adaptive.record_result(stable, result(1000000000))
+        if send(noisy):
+            adaptive.record_result(noisy, result((1 + repetition % 2) * 1000000000))
+
+    stable_cell, noisy_cell = adaptive.cells.values()
+    assert (stable_cell.samples, stable_cell.converged) == (3, True)
+    assert (noisy_cell.samples, noisy_cell.converged) == (6, False)
+    assert send(stable) is None
+
+    adaptive.print_report()
+    output = capsys.readouterr().out
+    assert "Converged cells:\t1/2" in output
+    assert "Samples:\t9 vs 12 fixed (6/cell)" in output
+    assert "Time saved:\t3.0s of 12.0s fixed-N" in output
+
+
+def test_adaptive_run_skips_converged_repetitions(ollama_stub, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    config = tmp_path / "config.yml"
+    config.write_text("warmup: 1\nrepetitions: 2\nmodels:\n  - llava:latest\n"
+                      "prompts:\n  - 'Read the plate:'\nmedia:\n  - 1.jpg\n  - 2.jpg\n")
+    eval_rate = EvalRateBenchmark()
+
+    llava_benchmark(str(config), [eval_rate, LicensePlateBenchmark()],
+                    adaptive=AdaptiveSampler(min_samples=3, max_samples=10))
+
+    # The stub's timing fields never vary, so each cell converges at three
+    # samples: one warmup and 2 × 3 measured requests.
+    generated = [path for path, _ in ollama_stub.requests if path == "/api/generate"]
+    assert len(generated) == 7
+    assert len(eval_rate.metrics) == 6
+    assert "Samples:\t6 vs 20 fixed (10/cell)" in capsys.readouterr().out
+
+
+def test_next_model_preloaded_when_last_repetition_is_skipped(ollama_stub, tmp_path,
+                                                               monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    ollama_stub.models = ["llava:latest", "bakllava:latest"]
+    config = tmp_path / "config.yml"
+    config.write_text("models:\n  - llava:latest\n  - bakllava:latest\n"
+                      "prompts:\n  - 'Read the plate:'\nmedia:\n  - 1.jpg\n")
+    preloaded = []
+
+    def preload(model):
+        preloaded.append(model)
+        return Ollama.preload_model(model)
+
+    llava_benchmark(str(config), [EvalRateBenchmark(), LicensePlateBenchmark()],
+                    residency=ResidencyPlanner(preload),
+                    adaptive=AdaptiveSampler(min_samples=3, max_samples=10))
+
+    # llava converges at three of its ten repetitions; the skipped tenth
+    # still preloads bakllava.
+    assert preloaded == ["bakllava:latest"]
@@ -0,0 +1,274 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import whisper
+from benchmarks.call_audio_benchmark import (
+    AudioCache, BatchTranscriber, CallAudioBenchmark, ChunkedTranscriber, TranscriptCache)
+from benchmarks.call_audio_benchmark.batch_transcriber import compare_to_sequential
+from modules.hashing import file_hash
+
+CALL_AUDIO_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "call_audio")
+
+
+class FakeWhisperModel:
+    """
+    Stand-in for a Whisper model that counts transcribe() calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, fp16=False):
+        self.calls += 1
+        return {"text": f"transcript {self.calls}"}
+
+
+# This fixture creates a CallAudioBenchmark whose Whisper model and audio
+# decode are faked, so no model download or ffmpeg is needed.
+@pytest.fixture
+def benchmark(tmp_path, monkeypatch):
+    monkeypatch.setattr(whisper, "load_model", lambda name: FakeWhisperModel())
+    benchmark = CallAudioBenchmark(transcript_cache=TranscriptCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(benchmark, "media_file_path",
+                        lambda media_file: os.path.join(CALL_AUDIO_DIR, media_file))
+    monkeypatch.setattr(benchmark, "process_audio", lambda media_file: media_file)
+    return benchmark
+
+
+def test_transcribe_file_hits_cache(benchmark):
+    first = benchmark.transcribe_file("1.mp3")
+    second = benchmark.transcribe_file("1.mp3")
+
+    # The second lookup is answered from disk without running Whisper.
+    assert first == second == "transcript 1"
+    assert benchmark.model.calls == 1
+    assert (benchmark.transcript_cache.hits, benchmark.transcript_cache.misses) == (1, 1)
+    assert benchmark.current_transcript == "transcript 1"
+
+
+def test_cache_key_depends_on_model_and_options():
+    content_hash = file_hash(os.path.join(CALL_AUDIO_DIR, "1.mp3"))
+    key = TranscriptCache.key(content_hash, "base", {"fp16": False})
+
+    assert key == TranscriptCache.key(content_hash, "base", {"fp16": False})
+    assert key != TranscriptCache.key(content_hash, "small", {"fp16": False})
+    assert key != TranscriptCache.key(content_hash, "base", {"fp16": True})
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=150)
+    cache.put("a", "x" * 40, 1.0)
+    os.utime(tmp_path / "a.json", (1, 1))
+    cache.put("b", "x" * 40, 1.0)
+    os.utime(tmp_path / "b.json", (2, 2))
+    assert cache.get("a") is not None  # Touching "a" makes "b" the oldest.
+    cache.put("c", "x" * 40, 1.0)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+    assert cache.seconds_saved == 1.0
+
+
+def test_cache_keeps_the_transcript_just_stored(tmp_path):
+    cache = TranscriptCache(str(tmp_path), max_bytes=100)
+    cache.put("a", "x" * 40, 1.0)
+    # "a" looks newer than anything written now, e.g. after a clock change.
+    os.utime(tmp_path / "a.json", (4102444800, 4102444800))
+    cache.put("b", "x" * 40, 1.0)
+    cache.put("c", "x" * 200, 1.0)
+
+    # "b" is the oldest entry but was just stored; "c" never fits.
+    assert os.listdir(tmp_path) == ["b.json"]
+    assert cache.get("b") == "x" * 40
+
+
+@pytest.mark.parametrize("text,chunk_text,expected", [
+    ("", "hello there", "hello there"),
+    ("please pay the bill today.", "The bill today, or else.", "please pay the bill today. or else."),
+    ("please pay the bill", "uh the bill before Friday", "please pay the bill before Friday"),
+    ("we need the", "the network is down", "we need the the network is down"),
+])
+def test_stitch_removes_overlap_words(text, chunk_text, expected):
+    assert ChunkedTranscriber.stitch(text, chunk_text) == expected
+
+
+def test_windows_overlap_and_cover_the_call():
+    transcriber = ChunkedTranscriber(FakeWhisperModel(), chunk_seconds=2, overlap_seconds=0.5)
+    rate = whisper.audio.SAMPLE_RATE
+    samples = np.arange(5 * rate, dtype=np.float32)
+    blocks = np.array_split(samples, 7)
+
+    windows = list(transcriber.windows(iter(blocks)))
+
+    # 5s of audio in 2s windows stepping 1.5s: 0-2, 1.5-3.5, 3-5.
+    assert [len(window) / rate for window in windows] == [2, 2, 2]
+    assert windows[1][0] == 1.5 * rate
+    assert windows[-1][-1] == samples[-1]
+
+
+def test_transcribe_windows_reports_real_time_factor():
+    transcriber = ChunkedTranscriber(FakeWhisperModel(), chunk_seconds=2, overlap_seconds=0.5)
+    rate = whisper.audio.SAMPLE_RATE
+    text = transcriber.transcribe_windows(iter([np.zeros(2 * rate), np.zeros(rate)]))
+
+    assert text == "transcript 1 transcript 2"
+    assert [timing.start for timing in transcriber.chunk_timings] == [0, 1.5]
+    assert transcriber.audio_seconds == 2.5
+    assert transcriber.real_time_factor >= 0
+
+
+def test_whisper_model_loads_on_first_transcription(tmp_path, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(whisper, "load_model",
+                        lambda name: loaded.append(name) or FakeWhisperModel())
+    benchmark = CallAudioBenchmark(model="tiny", chunk_seconds=30)
+    assert loaded == []
+
+    monkeypatch.setattr(ChunkedTranscriber, "decode_stream",
+                        staticmethod(lambda path: iter([np.zeros(16000, np.float32)])))
+    monkeypatch.setattr(benchmark, "media_file_path", lambda media_file: media_file)
+    benchmark.transcribe_file("1.mp3")
+    benchmark.transcribe_file("2.mp3")
+
+    assert loaded == ["tiny"]
+    assert benchmark.chunked_transcriber.model is benchmark.model
+
+
+def test_audio_cache_maps_decoded_audio(tmp_path):
+    decodes = []
+    samples = np.linspace(-1, 1, 3 * whisper.audio.SAMPLE_RATE, dtype=np.float32)
+    cache = AudioCache(str(tmp_path))
+    audio_file_path = os.path.join(CALL_AUDIO_DIR, "1.mp3")
+
+    first = cache.load(audio_file_path, lambda path: decodes.append(path) or samples)
+    second = cache.load(audio_file_path, lambda path: decodes.append(path) or samples)
+
+    # The second load maps the stored samples without decoding again.
+    assert decodes == [audio_file_path]
+    assert isinstance(second, np.memmap) and not second.flags.writeable
+    assert np.array_equal(first, samples) and np.array_equal(second, samples)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.bytes_mapped == 2 * samples.nbytes
+    assert cache.seconds_saved >= 0
+
+
+def test_audio_cache_streams_blocks_of_one_entry(tmp_path):
+    rate = whisper.audio.SAMPLE_RATE
+    samples = np.arange(12 * rate, dtype=np.float32)
+    cache = AudioCache(str(tmp_path))
+    audio_file_path = os.path.join(CALL_AUDIO_DIR, "1.mp3")
+
+    def decode_stream(path):
+        return iter(np.array_split(samples, 4))
+
+    decoded = list(cache.stream(audio_file_path, decode_stream))
+    mapped = list(cache.stream(audio_file_path, decode_stream, block_seconds=5))
+
+    assert np.array_equal(np.concatenate(decoded), samples)
+    assert [len(block) / rate for block in mapped] == [5, 5, 2]
+    assert np.array_equal(np.concatenate(mapped), samples)
+    # Both decode paths share the entry, so a whole-file load hits too.
+    assert np.array_equal(cache.load(audio_file_path, None), samples)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert sorted(os.listdir(tmp_path)) == [name + ext for name in [AudioCache.key(
+        file_hash(audio_file_path), rate)] for ext in (".json", ".npy")]
+
+
+def test_audio_cache_skips_audio_larger_than_the_cache(tmp_path):
+    samples = np.zeros(whisper.audio.SAMPLE_RATE, np.float32)
+    cache = AudioCache(str(tmp_path), max_bytes=1000)
+    audio_file_path = os.path.join(CALL_AUDIO_DIR, "1.mp3")
+
+    loaded = cache.load(audio_file_path, lambda path: samples)
+    streamed = list(cache.stream(audio_file_path, lambda path: iter([samples])))
+
+    # Decoded audio is still returned, just not stored.
+    assert np.array_equal(loaded, samples)
+    assert np.array_equal(np.concatenate(streamed), samples)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert os.listdir(tmp_path) == []
+
+
+# A randomly initialized Whisper model small enough to decode in tests
+# without downloading weights. Its decoder always predicts end of text, so
+# the temperature-0 decode is kept and no random fallback is sampled.
+@pytest.fixture(scope="module")
+def tiny_model():
+    torch = pytest.importorskip("torch")
+    torch.manual_seed(0)
+    dims = whisper.model.ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=64, n_text_state=64, n_text_head=2, n_text_layer=1)
+    model = whisper.model.Whisper(dims).eval()
+    eot = whisper.tokenizer.get_tokenizer(True, num_languages=model.num_languages).eot
+    with torch.no_grad():
+        # Allocated with torch.empty and only filled by load_model().
+        model.decoder.positional_embedding.normal_(std=0.02)
+        model.decoder.ln.weight.zero_()
+        model.decoder.ln.bias.fill_(1.0)
+        model.decoder.token_embedding.weight[eot].fill_(1.0)
+    return model
+
+
+def clips(count, seconds=3):
+    generator = np.random.default_rng(0)
+    return [generator.standard_normal(seconds * whisper.audio.SAMPLE_RATE).astype(np.float32)
+            * (0.1 * (index + 1)) for index in range(count)]
+
+
+def test_batched_log_mel_matches_each_clip(tiny_model):
+    batch = BatchTranscriber(tiny_model).log_mel_batch(clips(3))
+
+    for row, clip in enumerate(clips(3)):
+        mel = whisper.log_mel_spectrogram(
+            np.concatenate([clip, np.zeros(whisper.audio.N_SAMPLES, np.float32)]), 80)
+        assert np.allclose(batch[row].numpy(), mel[:, :whisper.audio.N_FRAMES].numpy(),
+                           atol=1e-4)
+
+
+def test_batched_transcripts_match_sequential(tiny_model):
+    sequential = [tiny_model.transcribe(whisper.pad_or_trim(clip), fp16=False)["text"]
+                  for clip in clips(4)]
+    transcriber = BatchTranscriber(tiny_model, batch_size=3)
+
+    assert transcriber.transcribe(clips(4)) == sequential
+    assert transcriber.fallbacks == 0
+
+
+@pytest.mark.parametrize("compression_ratio,avg_logprob,tokens,expected", [
+    (1.2, -0.3, [10, 20, 50365], False),
+    (2.6, -0.3, [10, 20, 50365], True),  # Repetitive, retried at a higher temperature.
+    (1.2, -1.4, [10, 20, 50365], True),  # Unlikely, retried or skipped as silence.
+    (1.2, -0.3, [50365, 10, 50370, 50370, 20], True),  # transcribe() decodes another window.
+    (1.2, -0.3, [50365, 10, 50370, 50370, 20, 50380], False),
+])
+def test_fallback_when_transcribe_would_differ(compression_ratio, avg_logprob, tokens, expected):
+    result = SimpleNamespace(compression_ratio=compression_ratio, avg_logprob=avg_logprob,
+                             tokens=tokens)
+
+    assert BatchTranscriber._transcribe_would_differ(result, timestamp_begin=50365) is expected
+
+
+def test_transcribe_files_batches_cache_misses(benchmark, monkeypatch):
+    batches = []
+    benchmark.batch_transcriber = BatchTranscriber(None, batch_size=2)
+    monkeypatch.setattr(benchmark.batch_transcriber, "transcribe",
+                        lambda clips: batches.append(clips) or [f"{clip} text" for clip in clips])
+    benchmark.transcribe_file("1.mp3")
+
+    transcripts = benchmark.transcribe_files(["1.mp3", "2.mp3", "3.mp3", "2.mp3"])
+
+    # 1.mp3 is answered from the cache, the others are transcribed together once.
+    assert transcripts == ["transcript 1", "2.mp3 text", "3.mp3 text", "2.mp3 text"]
+    assert batches == [["2.mp3", "3.mp3"]]
+    assert benchmark.transcript_cache.misses == 3
+
+
+def test_compare_to_sequential_reports_each_path(tiny_model):
+    timings = compare_to_sequential(tiny_model, clips(2), [2])
+
+    assert [timing.label for timing in timings] == ["sequential", "batch of 2"]
+    assert all(timing.files == 2 and timing.files_per_second > 0 for timing in timings)
+    # Each path is measured against the memory held just before it.
+    assert all(timing.rss_increase is None or timing.rss_increase >= 0 for timing in timings)
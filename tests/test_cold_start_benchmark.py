@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from benchmarks.cold_start_benchmark import ColdStartBenchmark
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from llava_benchmark import llava_benchmark
+from modules.ollama import Ollama, OllamaHTTPBackend, OllamaResult
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def make_result(load_duration, eval_duration, wall_time):
+    return OllamaResult(
+        model="llava:latest", response="CRAIG", wall_time=wall_time,
+        metrics={"load_duration": load_duration, "total_duration": load_duration + eval_duration,
+                 "eval_count": 4, "eval_duration": eval_duration})
+
+
+def test_cold_vs_warm_report(capsys):
+    benchmark = ColdStartBenchmark()
+    benchmark.store_cold_start("llava:latest", make_result(3000000000, 80000000, 3.2))
+    benchmark.store_timing("llava:latest", make_result(10000000, 80000000, 0.1))
+    benchmark.store_timing("llava:latest", make_result(20000000, 40000000, 0.2))
+
+    report = benchmark.cold_vs_warm()
+
+    assert report["cold_load"] == 3.0
+    assert report["cold_latency"] == 3.2
+    assert report["warm_load"] == pytest.approx(0.015)
+    assert report["warm_latency"] == pytest.approx(0.15)
+    assert report["steady_eval_rate"] == pytest.approx(75.0)
+    assert "Cold vs warm: llava:latest" in capsys.readouterr().out
+
+
+def test_llava_benchmark_excludes_warmup_and_cold_start(ollama_stub, tmp_path, monkeypatch):
+    config = tmp_path / "config.yml"
+    config.write_text("warmup: 2\nrepetitions: 3\nmodels:\n  - llava:latest\n"
+                      "prompts:\n  - 'Read the plate:'\nmedia:\n  - 1.jpg\n  - 2.jpg\n")
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    eval_rate, cold_start = EvalRateBenchmark(), ColdStartBenchmark()
+
+    llava_benchmark(str(config), [eval_rate, LicensePlateBenchmark(), cold_start],
+                    cold_start=True)
+
+    generate = [payload for path, payload in ollama_stub.requests if path == "/api/generate"]
+    # Unload, then the cold request, two warmups and 2 media × 3 repetitions.
+    assert generate[0] == {"model": "llava:latest", "keep_alive": 0}
+    assert len(generate) == 1 + 1 + 2 + 6
+    assert len(eval_rate.eval_rates) == 6
+    assert len(cold_start.warm_timings["llava:latest"]) == 6
+    assert "llava:latest" in cold_start.cold_starts
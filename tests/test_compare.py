@@ -0,0 +1,68 @@
+import pytest
+from modules.compare import compare_runs, print_comparison, resolve_run_id
+from modules.results_store import ResultsStore, RunMetadata
+from modules.stats import bootstrap_relative_difference, permutation_test
+
+
+# This fixture records a baseline run and a candidate run of two models in a
+# temporary results store. llava gets 20% slower in the candidate run while
+# bakllava stays the same apart from noise.
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    noise = [0.99, 1.01, 1.0, 0.98, 1.02, 1.0, 0.99, 1.01]
+    for started_at, run_id, slowdown in (("2024-01-01T00:00:00", "baseline0001", 1.0),
+                                         ("2024-01-02T00:00:00", "candidate001", 0.8)):
+        store.start_run(RunMetadata(run_id=run_id, started_at=started_at))
+        for factor in noise:
+            store.record(run_id, "llava:latest", "Read the plate:", "1.jpg",
+                         {"eval_rate": 60 * factor * slowdown, "wall_time": 1.0 * factor / slowdown})
+            store.record(run_id, "bakllava:latest", "Read the plate:", "1.jpg",
+                         {"eval_rate": 40 * factor, "wall_time": 1.5 * factor})
+    yield store
+    store.close()
+
+
+def test_bootstrap_interval_contains_true_difference():
+    baseline = [10.0, 10.5, 9.5, 10.2, 9.8] * 4
+    candidate = [value * 1.1 for value in baseline]
+
+    lower, upper = bootstrap_relative_difference(baseline, candidate)
+
+    assert lower < 0.1 < upper
+    assert lower > 0
+
+
+def test_permutation_test_separates_samples():
+    same = [10.0, 10.5, 9.5, 10.2, 9.8] * 4
+
+    assert permutation_test(same, same) > 0.5
+    assert permutation_test(same, [value + 2 for value in same]) < 0.01
+
+
+def test_resolve_run_aliases(store):
+    assert resolve_run_id(store, "latest") == "candidate001"
+    assert resolve_run_id(store, "previous") == "baseline0001"
+    assert resolve_run_id(store, "base") == "baseline0001"
+    with pytest.raises(ValueError):
+        resolve_run_id(store, "missing")
+
+
+def test_compare_flags_only_significant_regressions(store, capsys):
+    comparisons = compare_runs(store, "previous", "latest")
+
+    regressions = print_comparison(comparisons, threshold=0.05, alpha=0.05)
+
+    assert {(c.model, c.metric) for c in regressions} == {
+        ("llava:latest", "eval_rate"), ("llava:latest", "wall_time")}
+    eval_rate = next(c for c in regressions if c.metric == "eval_rate")
+    assert eval_rate.delta == pytest.approx(-0.2)
+    assert eval_rate.ci[0] < -0.2 < eval_rate.ci[1]
+    assert eval_rate.samples == (8, 8)
+    assert "2 regression(s)" in capsys.readouterr().out
+
+
+def test_compare_threshold_above_slowdown(store):
+    comparisons = compare_runs(store, "baseline0001", "candidate001")
+
+    assert print_comparison(comparisons, threshold=0.5, alpha=0.05) == []
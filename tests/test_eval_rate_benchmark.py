@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import Mock
-from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark, TimingMetrics
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+from benchmarks.eval_rate_benchmark.timing_metrics import parse_duration
 
 
 # This fixture creates an instance of the EvalRateBenchmark class
@@ -48,3 +50,67 @@ def test_eval_rate_benchmark_process(benchmark, benchmark_result, expected):
     # If the assertion fails, an AssertionError will be raised with a
     # message indicating the expected and actual results.
     assert benchmark.current_eval_rate == expected, f"Expected {expected}, but got {benchmark.current_eval_rate}"
+
+
+# The same timings as the stderr fixture, as nanosecond API fields.
+API_METRICS = {
+    "total_duration": 538551300,
+    "load_duration": 11508000,
+    "prompt_eval_count": 1,
+    "prompt_eval_duration": 459674000,
+    "eval_count": 4,
+    "eval_duration": 64913000,
+}
+
+
+def test_eval_rate_benchmark_stores_all_timings(benchmark, benchmark_result):
+    benchmark.process_eval_rate(benchmark_result)
+    benchmark.store_eval_rate("data/images/1.jpg")
+
+    metrics = benchmark.metrics[0]
+    assert metrics.total_duration == pytest.approx(0.5385513)
+    assert metrics.load_duration == pytest.approx(0.011508)
+    assert metrics.prompt_eval_count == 1
+    assert metrics.prompt_eval_rate == 2.18
+    assert metrics.eval_count == 4
+    assert metrics.eval_duration == pytest.approx(0.064913)
+
+
+def test_cli_and_api_timings_agree(benchmark_result):
+    cli = TimingMetrics.from_verbose(benchmark_result.stderr)
+    api = TimingMetrics.from_api(API_METRICS)
+    for name, value in cli.as_dict().items():
+        assert getattr(api, name) == pytest.approx(value, rel=1e-3), name
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("538.5513ms", 0.5385513), ("1m2.5s", 62.5), ("12µs", 12e-6), ("3s", 3.0),
+])
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == pytest.approx(expected)
+
+
+def test_average_metrics(benchmark):
+    benchmark.model_metrics = [TimingMetrics.from_api(API_METRICS),
+                               TimingMetrics(eval_rate=38.38, load_duration=None)]
+    average = benchmark.average_metrics()
+    assert average.eval_rate == 50.0
+    assert average.load_duration == pytest.approx(0.012)
+
+
+def test_average_metrics_per_model(benchmark, benchmark_result, monkeypatch):
+    parses = []
+    parse_metrics = EvalRateProcessor.parse_metrics
+    monkeypatch.setattr(EvalRateProcessor, "parse_metrics",
+                        lambda result: parses.append(result) or parse_metrics(result))
+
+    benchmark.process_eval_rate(benchmark_result)
+    benchmark.store_eval_rate("data/images/1.jpg")
+    assert len(parses) == 1
+    assert benchmark.average_metrics().eval_count == 4
+
+    # The next model's averages only cover its own results.
+    benchmark.current_metrics = TimingMetrics(eval_count=10)
+    benchmark.store_eval_rate("data/images/1.jpg")
+    assert benchmark.average_metrics().eval_count == 10
+    assert len(benchmark.metrics) == 2
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from modules.host_pool import HostPool
+from modules.ollama import OllamaError
+
+
+def test_pool_balances_least_outstanding(ollama_stubs, capsys):
+    for server in ollama_stubs:
+        server.response_delay = 0.05
+    pool = HostPool([server.url for server in ollama_stubs], timeout=5)
+    assert pool.is_available()
+
+    with ThreadPoolExecutor(6) as executor:
+        results = list(executor.map(
+            lambda index: pool.run("llava", "Read the plate:", "1.mp3"), range(12)))
+
+    # Six requests in flight at a time are spread two per host.
+    served = [sum(1 for path, _ in server.requests if path == "/api/generate")
+              for server in ollama_stubs]
+    assert served == [4, 4, 4]
+    assert sorted({result.host for result in results}) == sorted(pool.backends)
+    assert [stats.tokens for stats in pool.stats.values()] == [16, 16, 16]
+    assert pool.stats[ollama_stubs[0].url].eval_rate == pytest.approx(61.62, abs=0.01)
+
+    pool.print_report()
+    output = capsys.readouterr().out
+    assert "all hosts" in output and "Pool throughput" in output
+
+
+def test_pool_takes_failed_host_out_of_rotation(ollama_stubs, capsys):
+    pool = HostPool([server.url for server in ollama_stubs], timeout=5, retry_interval=0)
+    assert pool.is_available()
+    ollama_stubs[0].down = True
+
+    results = [pool.run("llava", "Read the plate:", "1.mp3") for _ in range(4)]
+
+    down = pool.stats[ollama_stubs[0].url]
+    assert (down.healthy, down.errors, down.requests) == (False, 1, 0)
+    assert {result.host for result in results} == {ollama_stubs[1].url, ollama_stubs[2].url}
+    assert "out of rotation" in capsys.readouterr().out
+
+    # Once the retry interval has passed, a healthy host is back in rotation.
+    ollama_stubs[0].down = False
+    assert ollama_stubs[0].url in pool.healthy_hosts()
+    assert "back in rotation" in capsys.readouterr().out
+
+
+def test_pool_routes_models_to_hosts_that_have_them(ollama_stubs):
+    ollama_stubs[0].models = ["llava:latest", "bakllava:latest"]
+    pool = HostPool([server.url for server in ollama_stubs], timeout=5)
+    assert pool.is_available()
+
+    assert sorted(pool.inventory()) == ["bakllava:latest", "llava:latest"]
+    assert {pool.run("bakllava", "Read:", "1.mp3").host for _ in range(3)} == {ollama_stubs[0].url}
+    with pytest.raises(OllamaError):
+        pool.run("moondream", "Read:", "1.mp3")
+    with pytest.raises(ValueError):
+        HostPool([])
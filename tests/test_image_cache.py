@@ -0,0 +1,84 @@
+import base64
+import os
+
+import pytest
+from PIL import Image
+from modules.image_cache import ImageCache
+from modules.ollama import OllamaHTTPBackend, encode_image
+from modules.results_store import ResultsStore, RunMetadata
+
+IMAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "images", "1.jpg")
+
+
+# This fixture creates an image cache in a temporary directory that
+# downsizes images to a 256 pixel longest edge.
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(str(tmp_path / "images"), max_edge=256, quality=80)
+
+
+def test_prepare_downsizes_and_caches(cache):
+    prepared = cache.prepare(IMAGE_PATH)
+
+    with Image.open(prepared) as image:
+        assert max(image.size) == 256
+    with open(prepared, "rb") as image_file:
+        assert encode_image(prepared) == base64.b64encode(image_file.read()).decode("ascii")
+
+    assert cache.prepare(IMAGE_PATH) == prepared
+    assert (cache.hits, cache.misses, cache.requests) == (1, 1, 2)
+    assert cache.sent_bytes < cache.raw_bytes
+
+
+def test_parameters_change_the_key(cache, tmp_path):
+    other = ImageCache(cache.cache_dir, max_edge=128, image_format="png")
+
+    assert other.prepare(IMAGE_PATH) != cache.prepare(IMAGE_PATH)
+    assert other.prepare(IMAGE_PATH).endswith(".png")
+
+
+def test_http_backend_sends_cached_encoding(cache, ollama_stub):
+    prepared = cache.prepare(IMAGE_PATH)
+    backend = OllamaHTTPBackend(host=ollama_stub.url, timeout=5)
+
+    backend.run("llava:latest", "Read the plate:", prepared)
+
+    with open(prepared + ".b64", "r") as sidecar_file:
+        assert ollama_stub.requests[-1][1]["images"] == [sidecar_file.read()]
+    backend.close()
+
+
+def test_unregistered_or_stale_encodings_are_ignored(cache, tmp_path):
+    image_path = tmp_path / "plate.jpg"
+    image_path.write_bytes(b"new image")
+    (tmp_path / "plate.jpg.b64").write_text(base64.b64encode(b"old image").decode("ascii"))
+    expected = base64.b64encode(b"new image").decode("ascii")
+
+    # A sidecar nobody handed over is not trusted.
+    assert encode_image(str(image_path)) == expected
+
+    # A prepared image replaced since it was prepared is encoded afresh.
+    prepared = cache.prepare(IMAGE_PATH)
+    with open(prepared, "ab") as image_file:
+        image_file.write(b"\0")
+    with open(prepared, "rb") as image_file:
+        assert encode_image(prepared) == base64.b64encode(image_file.read()).decode("ascii")
+
+
+def test_prompt_eval_saved_against_raw_run(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    for run_id, extra, prompt_eval_duration in (
+            ("raw", None, 0.9), ("resized", {"image_max_edge": 512}, 0.3)):
+        store.start_run(RunMetadata(run_id=run_id))
+        for media in ("1.jpg", "2.jpg"):
+            store.record(run_id, "llava:latest", "Read the plate:", media,
+                         {"prompt_eval_duration": prompt_eval_duration}, extra=extra)
+    # A call audio run of the same model does not count as a raw image run.
+    store.start_run(RunMetadata(run_id="audio"))
+    store.record("audio", "llava:latest", "Summarize:", "call.wav",
+                 {"prompt_eval_duration": 5.0})
+
+    saved = ImageCache.prompt_eval_saved(store, "resized")
+
+    assert saved == {"llava:latest": pytest.approx(0.6)}
+    store.close()
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+from benchmarks.image_sweep_benchmark import ImageSweepBenchmark, ImageVariant, normalize_plate
+from llava_benchmark import sweep_benchmark
+from modules.ollama import Ollama, OllamaHTTPBackend, OllamaResult
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+# This fixture creates a sweep over three sizes of JPEG at two qualities
+# and PNG, caching the variants in a temporary directory.
+@pytest.fixture
+def sweep(tmp_path, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    return ImageSweepBenchmark(sizes=(256, 512, 768), formats=("jpeg", "png"),
+                               qualities=(90, 50), cache_dir=str(tmp_path / "images"))
+
+
+def test_variants(sweep):
+    assert sweep.variants[0].label == "original"
+    assert [variant.label for variant in sweep.variants[1:4]] == [
+        "768px jpeg q90", "768px jpeg q50", "768px png"]
+    assert len(sweep.variants) == 1 + 3 * 3
+
+
+def test_normalize_plate():
+    assert normalize_plate("k5 210-v") == "K5210V"
+    assert normalize_plate(None) == ""
+
+
+def test_smallest_accurate_input(sweep):
+    # Plates stop reading correctly below 512 pixels.
+    for media in ("1.jpg", "3.jpg"):
+        for variant in sweep.variants:
+            image_path = sweep.variant_path(variant, media)
+            misread = variant.max_edge is not None and variant.max_edge < 512
+            result = OllamaResult(
+                model="llava:latest", response="WRONG" if misread else "CRAIG", wall_time=0.5,
+                metrics={"prompt_eval_duration": 1000000 * (variant.max_edge or 1024)})
+            sweep.store_sweep_result("llava:latest", variant, media, image_path, result)
+
+    summary = dict(sweep.summarize("llava:latest"))
+    assert summary[ImageVariant(256, "jpeg", 50)]["accuracy"] == 0
+    assert summary[ImageVariant(512, "png", None)]["accuracy"] == 1
+    assert sweep.smallest_accurate("llava:latest") == ImageVariant(512, "jpeg", 50)
+    assert sweep.smallest_accurate("llava:latest", tolerance=1.0).max_edge == 256
+    assert sweep.plot_sweep("llava:latest") == ImageVariant(512, "jpeg", 50)
+
+
+def test_sweep_benchmark_sends_every_variant(sweep, ollama_stub, tmp_path, monkeypatch):
+    config = tmp_path / "config.yml"
+    config.write_text("models:\n  - llava:latest\nprompts:\n  - 'Read the plate:'\n"
+                      "media:\n  - 4.jpg\n")
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    ollama_stub.response_text = "LYF 1ZGD"
+
+    sweep_benchmark(str(config), sweep)
+
+    generate = [payload for path, payload in ollama_stub.requests if path == "/api/generate"]
+    assert len(generate) == len(sweep.variants)
+    assert len({payload["images"][0] for payload in generate}) == len(sweep.variants)
+    # The stub always answers the ground truth of 4.jpg.
+    assert all(result.correct for result in sweep.model_results["llava:latest"])
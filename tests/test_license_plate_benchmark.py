@@ -1,6 +1,10 @@
+import os
+
 import pytest
 from unittest.mock import Mock
 from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from modules.ollama import OllamaResult
+from modules.stats import batch_edit_distance
 
 # This fixture creates an instance of the LicensePlateBenchmark class
 # from the 'benchmarks' module. The instance will be used in the test
@@ -43,3 +47,44 @@ def test_license_plate_benchmark_store(benchmark, benchmark_result, model, expec
     assert benchmark.current_license_plate_number == expected
     # assert benchmark.license_plate_numbers == expected
     # assert benchmark.model_license_plate_numbers[model] == expected
+
+
+# The ground truth manifest covers every image in data/images.
+def test_ground_truth_manifest_covers_images():
+    images_dir = os.path.join(os.path.dirname(__file__), "..", "data", "images")
+    ground_truth = LicensePlateBenchmark.load_ground_truth(
+        os.path.join(images_dir, "ground_truth.yml"))
+
+    assert set(ground_truth) == {name for name in os.listdir(images_dir) if name.endswith(".jpg")}
+    assert ground_truth["8.jpg"] == "CRAIG"
+
+
+def test_batch_edit_distance():
+    distances = batch_edit_distance(
+        ["CRAIG", "CRA1G", "", "PAX4", "XFC77R"], ["CRAIG", "CRAIG", "F1", "PAX44", "XFC77"])
+
+    assert distances.tolist() == [0, 1, 2, 1, 1]
+
+
+# Three models scored on two images: the fast model misreads a character,
+# the slow one reads every plate and the third is worse on both counts.
+def test_accuracy_report_marks_pareto_models(capsys):
+    benchmark = LicensePlateBenchmark(ground_truth={"2.jpg": "PAX 44", "8.jpg": "CRAIG"})
+    reads = {"fast:latest": (["PAX 44", "CRA1G"], 80000000, 0.5),
+             "slow:latest": (["PAX44", "craig"], 40000000, 1.0),
+             "worse:latest": (["PAX", "CRA1G"], 40000000, 1.5)}
+    for model, (plates, eval_duration, wall_time) in reads.items():
+        for media, plate in zip(("2.jpg", "8.jpg"), plates):
+            result = OllamaResult(model=model, response=plate, wall_time=wall_time,
+                                  metrics={"eval_count": 4, "eval_duration": eval_duration})
+            benchmark.store_license_plate(model, result, os.path.join("data", "images", media))
+
+    scores = {score.model: score for score in benchmark.print_accuracy_report()}
+
+    assert scores["slow:latest"].exact_match == 1.0
+    assert scores["fast:latest"].exact_match == 0.5
+    assert scores["fast:latest"].cer == pytest.approx(0.1)
+    assert scores["fast:latest"].eval_rate == 50.0
+    assert [model for model, score in scores.items() if score.pareto] == [
+        "fast:latest", "slow:latest"]
+    assert "Plate accuracy vs speed" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import pytest
+from llava_benchmark import parse_rates
+from modules.load_generator import LoadGenerator
+from modules.ollama import OllamaTimeoutError
+from modules.stats import percentile
+
+
+# This fixture creates a request function that takes 10ms, fails for the
+# "error" media file and times out for the "timeout" media file.
+@pytest.fixture
+def request_function():
+    def send(model, prompt, media_file_path):
+        time.sleep(0.01)
+        if media_file_path == "error":
+            raise RuntimeError("server error")
+        if media_file_path == "timeout":
+            raise OllamaTimeoutError("timed out")
+    return send
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2, 3, 4], 75) == pytest.approx(3.25)
+
+
+@pytest.mark.parametrize("arrival", ["constant", "poisson"])
+def test_arrival_times_match_rate(request_function, arrival):
+    load_generator = LoadGenerator(request_function, [("llava", "p", "1.jpg")],
+                                   arrival=arrival, step_duration=100, seed=1)
+    times = load_generator.arrival_times(rate=2)
+    assert times == sorted(times)
+    assert all(0 <= t < 100 for t in times)
+    assert len(times) == pytest.approx(200, rel=0.2)
+
+
+def test_rates_must_be_positive(request_function):
+    load_generator = LoadGenerator(request_function, [("llava", "p", "1.jpg")])
+    for rate in (0, -1):
+        with pytest.raises(ValueError):
+            load_generator.arrival_times(rate)
+    assert parse_rates("0.5,1,2") == [0.5, 1.0, 2.0]
+    for value in ("0", "1,-2", "fast"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_rates(value)
+
+
+def test_run_step_counts_outcomes(request_function):
+    requests = [("llava", "p", "1.jpg"), ("llava", "p", "error"),
+                ("llava", "p", "timeout"), ("llava", "p", "2.jpg")]
+    load_generator = LoadGenerator(request_function, requests, step_duration=0.4)
+    step = load_generator.run_step(rate=20)
+
+    assert step.sent == 8
+    assert (step.completed, step.errors, step.timeouts) == (4, 2, 2)
+    assert step.latency_percentile(50) >= 0.01
+
+
+def test_saturation_rate(request_function):
+    load_generator = LoadGenerator(request_function, [("llava", "p", "1.jpg")],
+                                   step_duration=0.2)
+    steps = [load_generator.run_step(rate) for rate in (10, 20)]
+    assert LoadGenerator.saturation_rate(steps) is None
+
+    # A step that only achieved half its target rate is saturated.
+    steps[1].latencies = steps[1].latencies[:2]
+    assert LoadGenerator.saturation_rate(steps) == 20
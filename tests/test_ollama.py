@@ -0,0 +1,178 @@
+import os
+import subprocess
+
+import pytest
+from modules.ollama import (Ollama, OllamaCLIBackend, OllamaError, OllamaHTTPBackend,
+                           OllamaResult, parse_parameter_count, parse_size)
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark, TimingMetrics
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from llava_benchmark import llava_benchmark
+from modules.adaptive import AdaptiveSampler
+from modules.residency import ResidencyPlanner
+from modules.results_store import ResultsStore
+
+IMAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "images", "1.jpg")
+
+
+# This fixture creates an HTTP backend pointed at the stub Ollama server.
+@pytest.fixture
+def backend(ollama_stub):
+    backend = OllamaHTTPBackend(host=ollama_stub.url, timeout=5)
+    yield backend
+    backend.close()
+
+
+def test_http_backend_generate_returns_structured_result(backend, ollama_stub):
+    result = backend.run("llava:latest", "Read the plate:", IMAGE_PATH)
+
+    assert isinstance(result, OllamaResult)
+    assert result.response == "CRAIG"
+    assert result.metrics["eval_count"] == 4
+    assert result.backend == "http"
+
+    # Images are attached as base64 instead of being appended to the prompt.
+    path, payload = ollama_stub.requests[0]
+    assert path == "/api/generate"
+    assert payload["prompt"] == "Read the plate:"
+    assert len(payload["images"]) == 1
+
+
+def test_http_backend_chat(backend):
+    result = backend.chat("llava:latest", [{"role": "user", "content": "Hi"}])
+    assert result.response == "CRAIG"
+
+
+def test_http_backend_reuses_connections(backend, ollama_stub):
+    # Every request should ride the same pooled keep-alive connection.
+    for _ in range(5):
+        backend.run("llava:latest", "Read the plate:", "")
+    assert len(ollama_stub.client_ports) == 1
+
+
+def test_http_backend_model_inventory(backend):
+    assert backend.is_available()
+    assert backend.is_model_installed("llava")
+    assert not backend.is_model_installed("llava-llama3:8b")
+
+
+def test_http_backend_unload(backend, ollama_stub):
+    backend.run("llava:latest", "Read the plate:", IMAGE_PATH)
+    assert backend.loaded_models() == ["llava:latest"]
+
+    backend.unload("llava")
+
+    assert backend.loaded_models() == []
+    assert ollama_stub.requests[-1] == ("/api/generate", {"model": "llava:latest", "keep_alive": 0})
+
+
+def test_http_backend_unreachable_server_raises():
+    backend = OllamaHTTPBackend(host="http://127.0.0.1:9", timeout=1)
+    assert not backend.is_available()
+    with pytest.raises(OllamaError):
+        backend.run("llava:latest", "Read the plate:", "")
+
+
+def test_structured_result_feeds_benchmarks(backend, monkeypatch):
+    # Results from the API path must land in the same benchmark slots as
+    # the CLI path: eval rate from the timing fields, plate from the text.
+    monkeypatch.setattr(Ollama, "backend", backend)
+    result = Ollama.run_benchmark("llava:latest", "Read the plate:", "")
+
+    eval_rate_benchmark = EvalRateBenchmark()
+    eval_rate_benchmark.process_eval_rate(result)
+    license_plate_benchmark = LicensePlateBenchmark()
+    license_plate_benchmark.store_license_plate("llava:latest", result)
+
+    assert eval_rate_benchmark.current_eval_rate == [61.62]
+    assert license_plate_benchmark.current_license_plate_number == "CRAIG"
+
+
+def test_http_backend_inventory_metadata(backend):
+    info = backend.inventory()["llava:latest"]
+
+    assert info.digest == f"sha256:{0:064x}"
+    assert (info.parameter_size, info.quantization_level) == ("7B", "Q4_0")
+    assert info.parameters_billions == 7.0
+    assert info.size_gb == pytest.approx(4.733, abs=1e-3)
+    assert info.normalized_throughput(70.0) == pytest.approx(
+        {"per_b_params": 10.0, "per_gb": 70.0 / 4.733363377})
+
+
+def test_inventory_is_fetched_once_per_run(backend, ollama_stub, monkeypatch):
+    monkeypatch.setattr(Ollama, "backend", backend)
+    Ollama.inventory(refresh=True)
+
+    assert Ollama.is_model_installed("llava")
+    assert not Ollama.is_model_installed("llava-llama3:8b")
+    assert Ollama.model_info("llava").quantization_level == "Q4_0"
+    assert ollama_stub.tag_requests == 1
+
+    # A re-pulled model gets a new digest.
+    ollama_stub.models = ["bakllava:latest", "llava:latest"]
+    assert Ollama.changed_models() == ["llava:latest"]
+    assert ollama_stub.tag_requests == 2
+
+
+@pytest.mark.parametrize("parse, size, expected", [
+    (parse_size, "4.7 GB", 4.7e9), (parse_size, "650 MB", 6.5e8), (parse_size, "", None),
+    (parse_parameter_count, "7B", 7e9), (parse_parameter_count, "8.0B", 8e9),
+    (parse_parameter_count, "270M", 2.7e8), (parse_parameter_count, "n/a", None)])
+def test_parse_sizes(parse, size, expected):
+    if expected is None:
+        assert parse(size) is None
+    else:
+        assert parse(size) == pytest.approx(expected)
+
+
+def test_cli_backend_inventory(monkeypatch):
+    listing = ("NAME            \tID          \tSIZE  \tMODIFIED\n"
+               "llava:latest    \t8dd30f6b0cb1\t4.7 GB\t2 weeks ago\n")
+    monkeypatch.setattr(subprocess, "run",
+                        lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, listing, ""))
+
+    inventory = OllamaCLIBackend().inventory()
+
+    assert list(inventory) == ["llava:latest"]
+    assert inventory["llava:latest"].digest == "8dd30f6b0cb1"
+    assert inventory["llava:latest"].size_bytes == 4700000000
+    assert inventory["llava:latest"].parameters_billions is None
+
+
+def test_cli_backend_runs_without_a_shell(monkeypatch):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs))
+        listing = "NAME\tID\tSIZE\tMODIFIED\nllava:latest\t8dd30f6b0cb1\t4.7 GB\tnow\n"
+        return subprocess.CompletedProcess(args, 0, listing if args[1] == "list" else "ABC", "")
+    monkeypatch.setattr(subprocess, "run", run)
+    backend = OllamaCLIBackend()
+
+    assert backend.is_model_installed("llava")
+    assert backend.run("llava", "Read the plate: ", "1.jpg").response == "ABC"
+    assert calls[-1][0] == ["ollama", "run", "llava", "Read the plate: 1.jpg", "--verbose"]
+    assert not any(kwargs.get("shell") for _, kwargs in calls)
+
+
+def test_result_timing_metrics_parsed_once(ollama_stub, tmp_path, monkeypatch):
+    parses = []
+    from_api = TimingMetrics.from_api.__func__
+    monkeypatch.setattr(TimingMetrics, "from_api", classmethod(
+        lambda cls, body: parses.append(body) or from_api(cls, body)))
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    config = tmp_path / "config.yml"
+    config.write_text("models:\n  - llava:latest\nprompts:\n  - 'Read the plate:'\n"
+                      "media:\n  - 1.jpg\n  - 2.jpg\n")
+
+    llava_benchmark(str(config), [EvalRateBenchmark(), LicensePlateBenchmark()],
+                    results_store=ResultsStore(str(tmp_path / "results.db")),
+                    residency=ResidencyPlanner(), adaptive=AdaptiveSampler(max_samples=3))
+
+    # Every consumer reads the TimingMetrics its result parsed once.
+    generated = [path for path, _ in ollama_stub.requests if path == "/api/generate"]
+    assert len(parses) == len(generated) == 6
+
+    result = OllamaResult(model="llava:latest", response="", metrics={"eval_count": 4})
+    assert EvalRateProcessor.parse_metrics(result) is result.timing_metrics
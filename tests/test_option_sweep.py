@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from llava_benchmark import llava_benchmark
+from modules.ollama import Ollama, OllamaHTTPBackend, OllamaResult
+from modules.option_sweep import OptionSweep, expand_options
+from modules.scheduler import COLD, WARMUP, JobScheduler
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def test_expand_options_and_jobs():
+    option_sets = expand_options({"num_thread": [4, 8], "num_ctx": 2048})
+    assert option_sets == [(("num_ctx", 2048), ("num_thread", 4)),
+                           (("num_ctx", 2048), ("num_thread", 8))]
+    assert expand_options(None) == [()]
+    with pytest.raises(ValueError):
+        expand_options({"num_thread": []})
+
+    jobs = JobScheduler.expand_jobs(["llava:latest"], ["Read the plate:"], ["1.jpg", "2.jpg"],
+                                    warmup=1, cold_start=True, option_sets=option_sets)
+
+    # One cold start per model, a warmup ahead of each combination.
+    assert [(job.phase, dict(job.options)["num_thread"]) for job in jobs] == [
+        (COLD, 4), (WARMUP, 4), ("measure", 4), ("measure", 4),
+        (WARMUP, 8), ("measure", 8), ("measure", 8)]
+
+
+def test_best_options_by_eval_rate(capsys):
+    sweep = OptionSweep()
+    for num_thread, eval_duration in ((4, 200000000), (8, 100000000), (16, 100000000)):
+        for wall_time in (1.0, 2.0 if num_thread == 16 else 1.0):
+            sweep.record_result("llava:latest", (("num_thread", num_thread),), OllamaResult(
+                model="llava:latest", response="ABC", wall_time=wall_time, metrics={
+                    "prompt_eval_count": 10, "prompt_eval_duration": 100000000,
+                    "eval_count": 20, "eval_duration": eval_duration}))
+
+    # 8 and 16 threads tie on eval rate; 8 threads answered faster.
+    assert sweep.best("llava:latest") == (("num_thread", 8),)
+    sweep.print_report()
+    output = capsys.readouterr().out
+    starred = [line.split() for line in output.splitlines() if line.endswith("⭐")]
+    assert starred[0] == ["num_thread=8", "100.00", "200.00", "1.000", "⭐"]
+    assert "Best options:\tnum_thread=8" in output
+
+
+def test_options_sent_with_each_request(ollama_stub, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(Ollama, "backend", OllamaHTTPBackend(host=ollama_stub.url, timeout=5))
+    config = tmp_path / "config.yml"
+    config.write_text("models:\n  - llava:latest\nprompts:\n  - 'Read the plate:'\n"
+                      "media:\n  - 1.jpg\noptions:\n  num_thread: [4, 8]\n  num_ctx: 2048\n")
+
+    llava_benchmark(str(config), [EvalRateBenchmark(), LicensePlateBenchmark()])
+
+    sent = [payload.get("options") for path, payload in ollama_stub.requests
+            if path == "/api/generate"]
+    assert sent == [{"num_ctx": 2048, "num_thread": 4}, {"num_ctx": 2048, "num_thread": 8}]
+    output = capsys.readouterr().out
+    assert "Options:\tnum_ctx=2048 num_thread=8" in output
+    assert "Option sweep" in output and "⭐" in output
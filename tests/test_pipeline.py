@@ -0,0 +1,48 @@
+import time
+
+import pytest
+from modules.pipeline import TwoStagePipeline
+
+
+def test_pipeline_overlaps_stages_and_keeps_order():
+    def prepare(job):
+        time.sleep(0.02)
+        return job * 10
+
+    def send(job, prepared):
+        time.sleep(0.02)
+        return prepared + 1
+
+    pipeline = TwoStagePipeline(maxsize=1)
+    start = time.perf_counter()
+    results = list(pipeline.run(list(range(10)), prepare, send))
+    elapsed = time.perf_counter() - start
+
+    assert results == [(job, job * 10 + 1) for job in range(10)]
+    # Strictly alternating stages would take 10 × (20ms + 20ms).
+    assert elapsed < 0.35
+    assert [stage.items for stage in pipeline.stages] == [10, 10]
+    assert all(stage.busy >= 0.2 for stage in pipeline.stages)
+
+
+def test_pipeline_reports_idle_bottleneck():
+    pipeline = TwoStagePipeline(maxsize=1)
+    list(pipeline.run(list(range(5)), lambda job: time.sleep(0.03), lambda job, _: job))
+
+    transcribe, ollama = pipeline.stages
+    # The fast second stage spends most of its time waiting for input.
+    assert ollama.idle > ollama.busy
+    assert transcribe.utilisation > ollama.utilisation
+
+
+@pytest.mark.parametrize("failing_stage", ["prepare", "send"])
+def test_pipeline_reraises_stage_errors(failing_stage):
+    def stage(job, *args):
+        if job == 2 and (failing_stage == "send") == bool(args):
+            raise RuntimeError("boom")
+        return job
+
+    results = TwoStagePipeline().run(list(range(5)), stage, stage)
+    assert [next(results)[0] for _ in range(2)] == [0, 1]
+    with pytest.raises(RuntimeError):
+        next(results)
@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from llava_benchmark import llava_benchmark
+from modules.ollama import Ollama, OllamaError, OllamaHTTPBackend
+from modules.replay import RecordingBackend, ReplayBackend, recording_key
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def run_license_plates(tmp_path):
+    config = tmp_path / "config.yml"
+    config.write_text("repetitions: 2\nmodels:\n  - llava:latest\n"
+                      "prompts:\n  - 'Read the plate:'\nmedia:\n  - 1.jpg\n  - 2.jpg\n")
+    eval_rate, license_plate = EvalRateBenchmark(), LicensePlateBenchmark()
+    llava_benchmark(str(config), [eval_rate, license_plate])
+    return eval_rate, license_plate
+
+
+def test_replay_reproduces_recorded_run(ollama_stub, tmp_path, monkeypatch, capsys):
+    archive = str(tmp_path / "run.jsonl")
+    monkeypatch.chdir(REPO_ROOT)
+    recorder = RecordingBackend(OllamaHTTPBackend(host=ollama_stub.url, timeout=5), archive)
+    monkeypatch.setattr(Ollama, "backend", recorder)
+    recorded_rates, recorded_plates = run_license_plates(tmp_path)
+    recorder.close()
+    recorded_output = capsys.readouterr().out
+
+    # Replay with the server gone: no request reaches it.
+    requests = len(ollama_stub.requests)
+    ollama_stub.shutdown()
+    replay = ReplayBackend(archive)
+    monkeypatch.setattr(Ollama, "backend", replay)
+    replayed_rates, replayed_plates = run_license_plates(tmp_path)
+
+    assert recorder.recorded == replay.requests == 4
+    assert len(ollama_stub.requests) == requests
+    assert replayed_rates.eval_rates == recorded_rates.eval_rates
+    assert replayed_plates.model_license_plate_numbers == recorded_plates.model_license_plate_numbers
+    assert capsys.readouterr().out == recorded_output
+
+
+def test_replay_cycles_recordings_and_rejects_unknown_requests(tmp_path):
+    archive = tmp_path / "run.jsonl"
+    results = [{"model": "llava:latest", "response": text, "wall_time": 0.5}
+               for text in ("ABC", "XYZ")]
+    archive.write_text("".join(json.dumps({
+        "type": "result", "key": recording_key("llava", "Read:", "1.jpg"),
+        "result": result}) + "\n" for result in results))
+    replay = ReplayBackend(str(archive))
+
+    responses = [replay.run("llava", "Read:", "/elsewhere/1.jpg").response for _ in range(3)]
+
+    assert responses == ["ABC", "XYZ", "ABC"]
+    with pytest.raises(OllamaError):
+        replay.run("llava", "Read:", "2.jpg")
+
+
+def test_replay_tokens_latency_and_overhead(tmp_path, capsys):
+    archive = tmp_path / "run.jsonl"
+    archive.write_text(json.dumps({
+        "type": "result", "key": recording_key("llava", "Read:", "1.jpg"),
+        "result": {"model": "llava:latest", "response": "ABC", "wall_time": 5.0,
+                   "metrics": {"eval_count": 4, "eval_duration": 64913000}}}) + "\n")
+    replay = ReplayBackend(str(archive), latency="tokens", tokens_per_second=200)
+
+    replay.run("llava:latest", "Read:", "1.jpg")
+    replay.print_overhead(0.5)
+
+    assert replay.latency_seconds == pytest.approx(0.02)
+    assert "Overhead/request:\t480.00ms" in capsys.readouterr().out
+    with pytest.raises(ValueError):
+        ReplayBackend(str(archive), latency="jittery")
@@ -0,0 +1,95 @@
+import subprocess
+import threading
+import time
+
+from benchmarks.eval_rate_benchmark.eval_rate_processor import EvalRateProcessor
+from modules.ollama import OllamaCLIBackend, OllamaHTTPBackend, OllamaResult
+from modules.residency import ResidencyPlanner
+from modules.scheduler import JobScheduler
+
+
+JOBS = JobScheduler.expand_jobs(
+    ["llava:latest", "bakllava:latest", "moondream:latest"], ["Read the plate:"],
+    ["1.jpg", "2.jpg"])
+
+
+def test_planner_counts_swaps_and_preloads_next_model():
+    preloaded = []
+
+    def preload(model):
+        preloaded.append(model)
+        return OllamaResult(model=model, response="", metrics={"load_duration": 2000000000})
+
+    planner = ResidencyPlanner(preload)
+    planner.plan(JOBS)
+    job_function = planner.wrap(lambda job: OllamaResult(
+        model=job.model, response="", metrics={"load_duration": 500000000}))
+
+    results = list(JobScheduler().run(JOBS, job_function))
+    for _, result in results:
+        planner.record_result(result)
+    planner.print_report()
+
+    assert preloaded == ["bakllava:latest", "moondream:latest"]
+    assert planner.swaps == 2
+    assert planner.loads == 3
+    # Six requests loading for 0.5s each, and two preloads of 2s.
+    assert planner.load_time == 7.0
+
+
+def test_planner_does_not_preload_ahead_of_cold_start():
+    preloaded = []
+    planner = ResidencyPlanner(preloaded.append)
+    jobs = JobScheduler.expand_jobs(
+        ["llava:latest", "bakllava:latest"], ["Read the plate:"], ["1.jpg"], cold_start=True)
+    planner.plan(jobs)
+
+    list(JobScheduler().run(jobs, planner.wrap(lambda job: None)))
+    planner.print_report()
+
+    assert preloaded == []
+
+
+def test_scheduler_limits_models_in_flight():
+    jobs = JobScheduler.expand_jobs(
+        ["llava:latest", "bakllava:latest", "moondream:latest"], ["Read the plate:"],
+        [f"{i}.jpg" for i in range(1, 5)])
+    lock = threading.Lock()
+    in_flight = {}
+    peak = []
+
+    def job_function(job):
+        with lock:
+            in_flight[job.model] = in_flight.get(job.model, 0) + 1
+            peak.append(sum(1 for count in in_flight.values() if count))
+        time.sleep(0.005)
+        with lock:
+            in_flight[job.model] -= 1
+
+    list(JobScheduler(4, max_models_in_flight=1).run(jobs, job_function))
+
+    assert max(peak) == 1
+
+
+def test_http_backend_preload(ollama_stub):
+    backend = OllamaHTTPBackend(host=ollama_stub.url, timeout=5)
+
+    result = backend.preload("llava")
+
+    assert backend.loaded_models() == ["llava:latest"]
+    assert EvalRateProcessor.parse_metrics(result).load_duration == 2.5
+    backend.close()
+
+
+def test_cli_backend_preload(monkeypatch):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, "", "load duration:      1.5s\n")
+    monkeypatch.setattr(subprocess, "run", run)
+
+    result = OllamaCLIBackend().preload("llava")
+
+    assert calls == [["ollama", "run", "llava", "", "--verbose"]]
+    assert EvalRateProcessor.parse_metrics(result).load_duration == 1.5
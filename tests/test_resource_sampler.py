@@ -0,0 +1,131 @@
+import os
+import time
+
+import pytest
+from modules.ollama import OllamaResult
+from modules.resource_sampler import ResourceSampler
+from modules.scheduler import COLD, WARMUP, BenchmarkJob
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def write_process(proc_root, pid, name, parent, majflt, utime, stime, rss_pages):
+    # Fields of proc(5) from state onwards, zero where unused.
+    fields = ["S", str(parent)] + ["0"] * 7 + [str(majflt), "0", str(utime), str(stime)]
+    fields += ["0"] * 8 + [str(rss_pages)] + ["0"] * 10
+    os.makedirs(proc_root / str(pid), exist_ok=True)
+    (proc_root / str(pid) / "comm").write_text(name + "\n")
+    (proc_root / str(pid) / "stat").write_text(f"{pid} ({name}) " + " ".join(fields) + "\n")
+
+
+def write_host(proc_root, busy, idle, load):
+    (proc_root / "stat").write_text(f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 0 0 0 0\n")
+    (proc_root / "loadavg").write_text(f"{load} 0.50 0.25 1/100 999\n")
+
+
+def test_samples_follow_server_process_tree(tmp_path):
+    # The server (100) starts a model runner (101), and 200 is unrelated.
+    write_process(tmp_path, 100, "ollama", 1, 0, 0, 0, 1000)
+    write_process(tmp_path, 101, "ollama_llama_se", 100, 5, 10, 0, 100000)
+    write_process(tmp_path, 200, "python", 1, 50, 500, 0, 500000)
+    write_host(tmp_path, 100, 900, 1.0)
+    sampler = ResourceSampler(proc_root=str(tmp_path))
+    assert sampler.pid == 100 and sampler.is_supported
+    sampler.sample()
+
+    def job_function(job):
+        # The runner generates for two CPU-seconds and faults weights in.
+        write_process(tmp_path, 101, "ollama_llama_se", 100, 25, 10 + CLOCK_TICKS,
+                      CLOCK_TICKS, 200000)
+        write_process(tmp_path, 200, "python", 1, 90, 900, 0, 500000)
+        write_host(tmp_path, 400, 1100, 3.5)
+        return sampler.sample()
+
+    job = BenchmarkJob(0, "llava:latest", "Read the plate:", "1.jpg")
+    sample = sampler.wrap(job_function)(job)
+    sampler.record_result("llava:latest", OllamaResult(
+        model="llava:latest", response="CRAIG", metrics={"eval_count": 50}))
+
+    assert sample.jobs == (("llava:latest", "Read the plate:", "1.jpg"),)
+    assert sample.process_cpu_seconds == pytest.approx(2.0)
+    assert sample.process_rss == (1000 + 200000) * PAGE_SIZE
+    assert sample.major_faults == 20
+    assert sample.host_cpu == pytest.approx(0.6)
+    assert sample.load_average == 3.5
+
+    resources = sampler.model_resources("llava:latest")
+    assert resources.samples == 1
+    assert resources.peak_rss == sample.process_rss
+    assert resources.tokens_per_cpu_second == pytest.approx(25.0)
+    assert sampler.print_report("llava:latest") == resources
+    assert sampler.model_resources("bakllava:latest").samples == 0
+
+
+def test_cpu_seconds_are_split_between_jobs_in_flight(tmp_path):
+    write_process(tmp_path, 100, "ollama", 1, 0, 0, 0, 1000)
+    write_host(tmp_path, 0, 100, 1.0)
+    sampler = ResourceSampler(proc_root=str(tmp_path))
+    sampler.sample()
+    write_process(tmp_path, 100, "ollama", 1, 0, 3 * CLOCK_TICKS, 0, 1000)
+    write_host(tmp_path, 300, 100, 1.0)
+
+    jobs = [BenchmarkJob(index, model, "Read the plate:", "1.jpg")
+            for index, model in enumerate(["llava:latest", "llava:latest", "bakllava:latest"])]
+
+    # Each job starts the next, so all three are in flight at the sample.
+    def start(remaining):
+        if not remaining:
+            return sampler.sample()
+        return sampler.wrap(lambda job: start(remaining[1:]))(remaining[0])
+
+    assert len(start(jobs).jobs) == 3
+
+    assert sampler.model_resources("llava:latest").cpu_seconds == pytest.approx(2.0)
+    assert sampler.model_resources("bakllava:latest").cpu_seconds == pytest.approx(1.0)
+
+
+def test_cold_and_warmup_jobs_are_not_sampled(tmp_path):
+    write_process(tmp_path, 100, "ollama", 1, 0, 0, 0, 1000)
+    write_host(tmp_path, 0, 100, 1.0)
+    sampler = ResourceSampler(proc_root=str(tmp_path))
+    sampler.sample()
+    write_process(tmp_path, 100, "ollama", 1, 0, 4 * CLOCK_TICKS, 0, 1000)
+    write_host(tmp_path, 400, 100, 1.0)
+
+    # The model load of a warmup is not charged against measured tokens.
+    for phase in (COLD, WARMUP):
+        job = BenchmarkJob(0, "llava:latest", "Read the plate:", "1.jpg", phase)
+        assert sampler.wrap(lambda job: sampler.sample())(job).jobs == ()
+
+    assert sampler.model_resources("llava:latest").cpu_seconds == 0
+
+
+def test_background_sampling_of_a_live_process():
+    sampler = ResourceSampler(pid=os.getpid(), interval=0.02)
+    job = BenchmarkJob(0, "llava:latest", "Read the plate:", "1.jpg")
+
+    def busy(job):
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            pass
+
+    sampler.start()
+    sampler.wrap(busy)(job)
+    sampler.stop()
+
+    resources = sampler.model_resources("llava:latest")
+    assert resources.samples >= 1
+    assert resources.cpu_seconds > 0
+    assert resources.peak_rss > 0
+
+
+def test_stop_survives_the_server_exiting(monkeypatch):
+    sampler = ResourceSampler(pid=os.getpid(), interval=0.02)
+    sampler.start()
+
+    def exited():
+        raise FileNotFoundError("/proc/1234/stat")
+    monkeypatch.setattr(sampler, "sample", exited)
+
+    sampler.stop()
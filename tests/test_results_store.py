@@ -0,0 +1,57 @@
+import pytest
+from modules.ollama import OllamaResult
+from modules.results_store import ResultsStore, RunMetadata
+
+
+# This fixture creates a results store in a temporary SQLite database with
+# two runs of the same cell, recorded before and after an Ollama upgrade.
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    for version, eval_duration in (("0.1.47", 80000000), ("0.1.48", 64913000)):
+        run_id = store.start_run(RunMetadata(ollama_version=version, config_hash="abc"))
+        for media in ("1.jpg", "2.jpg"):
+            result = OllamaResult(
+                model="llava:latest", response="CRAIG", wall_time=0.6,
+                metrics={"eval_count": 4, "eval_duration": eval_duration,
+                         "load_duration": 11508000})
+            store.record_result(run_id, "llava:latest", "Read the plate:", media,
+                                result, model_digest="sha256:1")
+    yield store
+    store.close()
+
+
+def test_runs_record_metadata(store):
+    runs = list(store.runs())
+    assert [run["ollama_version"] for run in runs] == ["0.1.47", "0.1.48"]
+    assert all(run["host"] and run["cpu"] and run["started_at"] for run in runs)
+
+
+def test_query_time_series(store):
+    series = list(store.query(model="llava:latest", media="1.jpg", metric="eval_rate"))
+
+    assert [row["eval_rate"] for row in series] == [50.0, 61.62]
+    assert [row["ollama_version"] for row in series] == ["0.1.47", "0.1.48"]
+    assert "load_duration" not in series[0]
+
+
+def test_query_by_run(store):
+    run_id = list(store.runs())[0]["run_id"]
+    rows = list(store.query(run_id=run_id))
+
+    assert [row["media"] for row in rows] == ["1.jpg", "2.jpg"]
+    assert rows[0]["load_duration"] == pytest.approx(0.011508)
+    assert rows[0]["wall_time"] == 0.6
+    assert rows[0]["model_digest"] == "sha256:1"
+    assert rows[0]["response"] == "CRAIG"
+
+
+def test_store_is_append_only_across_connections(store):
+    reopened = ResultsStore(store.path)
+    assert len(list(reopened.query())) == 4
+    reopened.close()
+
+
+def test_query_rejects_unknown_metric(store):
+    with pytest.raises(ValueError):
+        list(store.query(metric="response; DROP TABLE results"))
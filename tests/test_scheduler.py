@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+
+import pytest
+from modules.scheduler import COLD, MEASURE, WARMUP, JobScheduler
+
+
+# This fixture expands a 2-model × 1-prompt × 4-media matrix.
+@pytest.fixture
+def jobs():
+    return JobScheduler.expand_jobs(
+        ["llava:latest", "llava-llama3:8b"], ["Read the plate:"],
+        [f"{i}.jpg" for i in range(1, 5)])
+
+
+class ConcurrencyProbe:
+    """
+    Job function that sleeps for a random time and records the highest
+    number of jobs seen in flight, overall and per model.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.peak_total = 0
+        self.peak_per_model = {}
+
+    def __call__(self, job):
+        with self.lock:
+            self.in_flight[job.model] = self.in_flight.get(job.model, 0) + 1
+            self.peak_total = max(self.peak_total, sum(self.in_flight.values()))
+            self.peak_per_model[job.model] = max(
+                self.peak_per_model.get(job.model, 0), self.in_flight[job.model])
+        time.sleep(random.uniform(0.001, 0.02))
+        with self.lock:
+            self.in_flight[job.model] -= 1
+        return job.media
+
+
+def test_expand_jobs_order(jobs):
+    assert [job.index for job in jobs] == list(range(8))
+    assert [job.model for job in jobs[:4]] == ["llava:latest"] * 4
+    assert [job.media for job in jobs[:4]] == ["1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+
+
+@pytest.mark.parametrize("workers,per_model", [(1, None), (4, 2), (8, 1)])
+def test_scheduler_limits_and_order(jobs, workers, per_model):
+    probe = ConcurrencyProbe()
+    results = list(JobScheduler(workers, per_model).run(jobs, probe))
+
+    # Results come back in matrix order whatever order the jobs finished in.
+    assert [job.index for job, _ in results] == list(range(8))
+    assert [media for _, media in results] == [job.media for job in jobs]
+
+    assert probe.peak_total <= workers
+    assert max(probe.peak_per_model.values()) <= (per_model or workers)
+
+
+def test_scheduler_reraises_job_errors(jobs):
+    def failing_job(job):
+        if job.index == 2:
+            raise RuntimeError("boom")
+        return job.index
+
+    results = JobScheduler(2).run(jobs, failing_job)
+    assert next(results)[1] == 0
+    assert next(results)[1] == 1
+    with pytest.raises(RuntimeError):
+        next(results)
+
+
+def test_expand_jobs_warmup_and_repetitions():
+    jobs = JobScheduler.expand_jobs(
+        ["llava:latest", "llava-llama3:8b"], ["Read the plate:"], ["1.jpg", "2.jpg"],
+        repetitions=3, warmup=2, cold_start=True)
+
+    first_model = [job for job in jobs if job.model == "llava:latest"]
+    assert [job.phase for job in first_model[:3]] == [COLD, WARMUP, WARMUP]
+    assert all(job.media == "1.jpg" for job in first_model[:3])
+    measured = [(job.media, job.repetition) for job in first_model if job.phase == MEASURE]
+    assert measured == [("1.jpg", 0), ("1.jpg", 1), ("1.jpg", 2),
+                        ("2.jpg", 0), ("2.jpg", 1), ("2.jpg", 2)]
+    assert len(jobs) == 2 * (1 + 2 + 6)
+
+
+def test_warmup_jobs_run_alone():
+    jobs = JobScheduler.expand_jobs(
+        ["llava:latest", "llava-llama3:8b"], ["Read the plate:"],
+        [f"{i}.jpg" for i in range(1, 5)], warmup=1, cold_start=True)
+    lock = threading.Lock()
+    in_flight = []
+    overlaps = []
+
+    def job_function(job):
+        with lock:
+            same_model = [other for other in in_flight if other.model == job.model]
+            if same_model and (job.phase != MEASURE
+                               or any(other.phase != MEASURE for other in same_model)):
+                overlaps.append(job)
+            in_flight.append(job)
+        time.sleep(random.uniform(0.001, 0.01))
+        with lock:
+            in_flight.remove(job)
+
+    list(JobScheduler(8).run(jobs, job_function))
+
+    assert overlaps == []
+
+
+def test_option_sets_start_after_their_warmup():
+    option_sets = [(("num_thread", 4),), (("num_thread", 8),)]
+    jobs = JobScheduler.expand_jobs(["llava:latest"], ["Read the plate:"], ["a", "b", "c"],
+                                    repetitions=2, warmup=1, option_sets=option_sets)
+    lock = threading.Lock()
+    started = []
+    finished = set()
+    in_flight = []
+    mixed = []
+
+    def job_function(job):
+        with lock:
+            started.append((job.index, set(finished)))
+            if any(other.options != job.options for other in in_flight):
+                mixed.append(job)
+            in_flight.append(job)
+        time.sleep(random.uniform(0.001, 0.01))
+        with lock:
+            in_flight.remove(job)
+            finished.add(job.index)
+
+    list(JobScheduler(4).run(jobs, job_function))
+
+    # Jobs 0 and 7 warm up each combination; nothing overtakes them.
+    assert [index for index, _ in started] == list(range(14))
+    assert dict(started)[7] >= set(range(7))
+    assert all(dict(started)[index] >= {7} for index in range(8, 14))
+    assert mixed == []
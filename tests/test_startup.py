@@ -0,0 +1,23 @@
+from modules.startup import measure_startup
+
+# Peak RSS allowed when importing the entry point. Importing Whisper and
+# torch takes it past 500MB.
+MAX_STARTUP_RSS_MB = 200
+
+
+def test_entry_point_does_not_import_whisper():
+    timing = measure_startup("import llava_benchmark", repetitions=1)
+
+    assert timing.heavy_modules == []
+    assert timing.seconds > 0
+    if timing.peak_rss_mb is not None:
+        assert timing.peak_rss_mb < MAX_STARTUP_RSS_MB
+
+
+def test_license_plate_benchmark_does_not_import_whisper():
+    timing = measure_startup(
+        "from modules.llava_benchmark import LlavaBenchmark\n"
+        "from benchmarks import load_benchmark_class\n"
+        "LlavaBenchmark([load_benchmark_class('LicensePlateBenchmark')()])", repetitions=1)
+
+    assert timing.heavy_modules == []
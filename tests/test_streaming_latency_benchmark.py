@@ -0,0 +1,45 @@
+import pytest
+from benchmarks.streaming_latency_benchmark import StreamingLatencyBenchmark
+from modules.ollama import OllamaHTTPBackend
+
+
+# This fixture creates an instance of the StreamingLatencyBenchmark class.
+@pytest.fixture
+def benchmark():
+    return StreamingLatencyBenchmark()
+
+
+def test_measure_ttft_and_gaps():
+    latency = StreamingLatencyBenchmark.measure([0.5, 0.6, 0.7, 1.0])
+
+    assert latency.ttft == 0.5
+    assert latency.tokens == 4
+    assert latency.mean_gap == pytest.approx(0.5 / 3)
+    assert latency.p99_gap == pytest.approx(0.3, rel=0.05)
+    assert latency.jitter > 0
+
+
+def test_measure_without_tokens():
+    latency = StreamingLatencyBenchmark.measure([])
+    assert latency.ttft is None and latency.mean_gap is None
+
+
+def test_streamed_result_feeds_benchmark(benchmark, ollama_stub):
+    # The stub streams one word per chunk, 10ms apart.
+    ollama_stub.response_text = "K5 210V plate"
+    ollama_stub.stream_delay = 0.01
+    backend = OllamaHTTPBackend(host=ollama_stub.url, stream=True)
+    result = backend.run("llava:latest", "Read the plate:", "")
+    backend.close()
+
+    assert result.response == "K5 210V plate"
+    assert len(result.token_times) == 3
+    assert result.metrics["eval_count"] == 4
+
+    benchmark.store_latency("llava:latest", result)
+    benchmark.store_latency("llava:latest", result)
+    aggregate = benchmark.average_latency()
+
+    assert benchmark.current_latency.ttft >= 0.01
+    assert aggregate["gap_mean"] >= 0.005
+    assert aggregate["ttft_p50"] == benchmark.current_latency.ttft
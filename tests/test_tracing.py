@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+
+import pytest
+from benchmarks.eval_rate_benchmark import EvalRateBenchmark
+from benchmarks.license_plate_benchmark import LicensePlateBenchmark
+from modules.llava_benchmark import LlavaBenchmark
+from modules.ollama import Ollama, OllamaHTTPBackend
+from modules.tracing import Tracer, tracer
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+# This fixture records the spans of the shared tracer for one test.
+@pytest.fixture
+def enabled_tracer():
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+
+
+def test_disabled_tracer_records_nothing():
+    disabled = Tracer()
+
+    first, second = disabled.span("stage"), disabled.span("stage", media="1.jpg")
+    with first:
+        pass
+
+    # Disabled spans share one no-op context manager.
+    assert first is second
+    assert disabled.spans == []
+    assert disabled.summary() == {}
+
+
+def test_summary_counts_and_percentiles():
+    stages = Tracer(enabled=True)
+    for _ in range(20):
+        with stages.span("outer"):
+            with stages.span("inner"):
+                pass
+    stages.print_summary()
+
+    summary = stages.summary()
+    assert list(summary) == ["outer", "inner"]
+    assert summary["inner"]["count"] == summary["outer"]["count"] == 20
+    assert summary["outer"]["total"] >= summary["inner"]["total"]
+    assert summary["outer"]["p95"] >= summary["outer"]["mean"] > 0
+
+
+def test_chrome_trace_export(tmp_path):
+    stages = Tracer(enabled=True)
+
+    def prepare():
+        with stages.span("media.prepare_image"):
+            pass
+
+    with stages.span("ollama.run", model="llava:latest"):
+        thread = threading.Thread(target=prepare, name="prepare")
+        thread.start()
+        thread.join()
+    trace_file_path = str(tmp_path / "trace.json")
+    stages.export_chrome_trace(trace_file_path)
+
+    with open(trace_file_path, encoding="utf-8") as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in spans] == ["ollama.run", "media.prepare_image"]
+    assert spans[0]["cat"] == "ollama"
+    assert spans[0]["args"] == {"model": "llava:latest"}
+    assert spans[0]["tid"] != spans[1]["tid"]
+    assert spans[0]["ts"] <= spans[1]["ts"] <= spans[0]["ts"] + spans[0]["dur"]
+    assert {"name": "prepare"} in [event["args"] for event in events if event["ph"] == "M"]
+
+
+def test_benchmark_stages_are_traced(enabled_tracer, ollama_stub, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    backend = OllamaHTTPBackend(host=ollama_stub.url, timeout=5)
+    monkeypatch.setattr(Ollama, "backend", backend)
+    llava = LlavaBenchmark([EvalRateBenchmark(), LicensePlateBenchmark()])
+
+    _, media_file_path = llava.process_media("8.jpg")
+    result = Ollama.run_benchmark("llava:latest", "Read the plate:", media_file_path)
+    llava.store_results(result, "llava:latest", media_file_path)
+    backend.close()
+
+    summary = enabled_tracer.summary()
+    assert {"media.prepare_image", "ollama.run", "ollama.encode_image",
+            "store.EvalRateBenchmark", "store.LicensePlateBenchmark"} <= set(summary)
+    assert summary["ollama.run"]["total"] >= summary["ollama.encode_image"]["total"]